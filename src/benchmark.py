@@ -0,0 +1,229 @@
+import os
+import json
+import random
+import numpy as np
+from typing import List, Tuple, Dict, Callable, Any
+from src.utils.file_utils import load_tsplib, save_json
+from src.utils.benchmark import (
+    measure_ops_per_sec,
+    measure_peak_bytes,
+    find_regressions,
+    machine_info
+)
+from src.ga.fitness import compute_distance_matrix, fitness
+from src.ga.initialisation import greedy_heuristic, spatial_greedy_heuristic
+from src.ga.spatial import SpatialGrid
+from src.ga.crossover import order_crossover, partially_mapped_crossover
+from src.ga.mutation import inversion_mutation, relocation_mutation
+from src.ga.selection import elitism_indices, tournament_indices
+from src.ga.genetic_algorithm import GeneticAlgorithm
+
+
+def instance_cases(
+    coords: np.ndarray,
+    max_matrix_cities: int,
+    ga_generations: int
+) -> Dict[str, Callable[[], Any]]:
+    """
+    Builds the benchmark cases of a single instance. Cases that need a distance matrix are only
+    built for instances of up to `max_matrix_cities` cities, as the matrix grows quadratically.
+
+    Args:
+        coords: The coordinates of the cities.
+        max_matrix_cities: The largest instance for which a distance matrix is computed.
+        ga_generations: The number of generations of the end-to-end genetic algorithm case.
+
+    Returns:
+        A dictionary mapping each case's name to a function running one operation.
+    """
+    num_cities = len(coords)
+    tour1 = random.sample(range(num_cities), num_cities)
+    tour2 = random.sample(range(num_cities), num_cities)
+    grid = SpatialGrid(coords)
+
+    cases = {
+        "order_crossover": lambda: order_crossover(tour1, tour2),
+        "partially_mapped_crossover": lambda: partially_mapped_crossover(tour1, tour2),
+        "spatial_greedy_heuristic": lambda: spatial_greedy_heuristic(grid)
+    }
+    if num_cities > max_matrix_cities:
+        cases["inversion_mutation"] = _mutation_case(inversion_mutation, tour1)
+        cases["relocation_mutation"] = _mutation_case(relocation_mutation, tour1)
+        return cases
+
+    distance_matrix = compute_distance_matrix(coords)
+
+    def run_ga() -> None:
+        GeneticAlgorithm(
+            coords,
+            population_size=100,
+            crossover_rate=0.8,
+            crossover_func=order_crossover,
+            mutation_rate=0.2,
+            mutation_func=inversion_mutation,
+            generations=ga_generations,
+            elitism_rate=0.05,
+            tournament_size=3,
+            greedy_rate=0.05,
+            early_stop_threshold=ga_generations,
+            seed=0,
+            distance_matrix=distance_matrix
+        ).run()
+
+    cases.update({
+        "compute_distance_matrix": lambda: compute_distance_matrix(coords),
+        "fitness": lambda: fitness(tour1, distance_matrix),
+        "inversion_mutation": _mutation_case(inversion_mutation, tour1, distance_matrix),
+        "relocation_mutation": _mutation_case(relocation_mutation, tour1, distance_matrix),
+        "greedy_heuristic": lambda: greedy_heuristic(num_cities, distance_matrix),
+        f"genetic_algorithm_{ga_generations}_generations": run_ga
+    })
+    return cases
+
+
+def _mutation_case(
+    mutation_func: Callable[..., Any],
+    tour: List[int],
+    *args: Any
+) -> Callable[[], Any]:
+    """
+    Builds the benchmark case of a mutation operator on its own copy of a tour, so mutating it in
+    place leaves the tour shared by the other cases unchanged.
+
+    Args:
+        mutation_func: The mutation operator.
+        tour: The tour to copy.
+        *args: The further arguments of the operator.
+
+    Returns:
+        A function running one mutation.
+    """
+    individual = list(tour)
+    return lambda: mutation_func(individual, *args)
+
+
+def selection_cases(population_size: int) -> Dict[str, Callable[[], Any]]:
+    """
+    Builds the benchmark cases of selection, which only depend on the population size.
+
+    Args:
+        population_size: The number of individuals in the population.
+
+    Returns:
+        A dictionary mapping each case's name to a function running one operation.
+    """
+    rng = np.random.default_rng(0)
+    fitness_scores = rng.uniform(0, 1, population_size)
+    elitism_count = max(1, population_size // 20)
+
+    return {
+        "elitism": lambda: elitism_indices(fitness_scores, elitism_count),
+        "tournament_selection": lambda: tournament_indices(
+            fitness_scores,
+            3,
+            population_size - elitism_count,
+            rng
+        )
+    }
+
+
+def run_benchmarks(
+    curr_dir: str = "",
+    sizes: List[int] = [50, 200, 1000, 5000, 20000],
+    datasets: List[str] = ["berlin52", "kroA100", "pr1002"],
+    population_size: int = 400,
+    max_matrix_cities: int = 5000,
+    ga_generations: int = 50,
+    min_secs: float = 0.2,
+    baseline_path: str = "data/benchmarks/baseline.json",
+    save_baseline: bool = False,
+    tolerance: float = 0.2
+) -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+    """
+    Benchmarks the genetic algorithm's operators and end-to-end runs on synthetic instances with
+    uniformly random cities and on TSPLIB datasets, reporting the throughput and peak memory of
+    each case.
+
+    The results are saved to `data/benchmarks/latest.json`, and compared against the baseline
+    when one exists, or saved as the baseline when `save_baseline` is set.
+
+    Args:
+        curr_dir: The base directory where datasets and benchmarks are stored (default: "").
+        sizes: The numbers of cities of the synthetic instances (default: [50, 200, 1000, 5000,
+            20000]).
+        datasets: The names of the TSPLIB datasets, skipped if missing from `data/datasets`
+            (default: ["berlin52", "kroA100", "pr1002"]).
+        population_size: The population size of the selection cases (default: 400).
+        max_matrix_cities: The largest instance for which cases needing a distance matrix are run
+            (default: 5000).
+        ga_generations: The number of generations of the end-to-end genetic algorithm case
+            (default: 50).
+        min_secs: The minimum duration of each timed batch of calls (default: 0.2).
+        baseline_path: The path of the baseline results, relative to `curr_dir` (default:
+            "data/benchmarks/baseline.json").
+        save_baseline: Whether to save the results as the new baseline rather than comparing
+            against it (default: False).
+        tolerance: The allowed relative drop in throughput or growth in peak memory before a case
+            is flagged as a regression (default: 0.2).
+
+    Returns:
+        A tuple containing the `ops_per_sec` and `peak_bytes` of each case, and a description of
+        each regression against the baseline.
+    """
+    random.seed(0)
+    rng = np.random.default_rng(0)
+
+    instances = [(f"random{size}", rng.uniform(0, 1000, size=(size, 2))) for size in sizes]
+    for dataset in datasets:
+        path = os.path.join(curr_dir, f"data/datasets/{dataset}.tsp")
+        if os.path.exists(path):
+            instances.append((dataset, np.array(load_tsplib(path), dtype=np.float64)))
+        else:
+            print(f"Skipping {dataset}, {path} not found")
+
+    # Each instance's cases are built only once the previous instance's are measured, so at most
+    # one distance matrix is held at a time
+    suites = [(f"pop{population_size}", lambda: selection_cases(population_size))]
+    suites.extend(
+        (instance, lambda coords=coords: instance_cases(coords, max_matrix_cities, ga_generations))
+        for instance, coords in instances
+    )
+
+    results = {}
+    for suite, build_cases in suites:
+        for case, func in build_cases().items():
+            name = f"{case}/{suite}"
+            ops_per_sec = measure_ops_per_sec(func, min_secs)
+            # The memory of randomised operators depends on their random draws, e.g. the length of
+            # a relocated segment, so each case is measured from the same random state
+            random.seed(0)
+            results[name] = {"ops_per_sec": ops_per_sec, "peak_bytes": measure_peak_bytes(func)}
+            print(
+                f"{name:<60} {ops_per_sec:>14.2f} ops/sec "
+                f"{results[name]['peak_bytes'] / 1e6:>10.3f} MB"
+            )
+
+    report = {"machine": machine_info(), "results": results}
+    save_json(os.path.join(curr_dir, "data/benchmarks/latest.json"), report)
+
+    baseline_path = os.path.join(curr_dir, baseline_path)
+    regressions = []
+    if save_baseline:
+        save_json(baseline_path, report)
+        print(f"Saved baseline to {baseline_path}")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path, 'r') as file:
+            baseline = json.load(file)
+        if baseline["machine"] != report["machine"]:
+            print("Warning: the baseline was recorded on a different machine or software versions")
+
+        regressions = find_regressions(results, baseline["results"], tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        print(f"{len(regressions)} regressions against {baseline_path}")
+
+    return results, regressions
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -1,4 +1,6 @@
 import random
+import numpy as np
+from itertools import chain
 from typing import List, Tuple, Dict
 
 
@@ -28,16 +30,22 @@ def order_crossover(parent1: List[int], parent2: List[int]) -> Tuple[List[int],
     child1[start:end] = parent1[start:end]
     child2[start:end] = parent2[start:end]
 
+    # Boolean membership array indexed by gene, replacing a scan of the copied segment per gene
+    size = max(parent1) + 1
+
     def fill_child_pos(child: List[int], parent: List[int]) -> None:
-        curr_pos = end
+        in_segment = [False] * size
+        for gene in child[start:end]:
+            in_segment[gene] = True
 
+        # The unfilled positions run contiguously (wrapping around) from the end of the segment
+        curr_pos = end
         for i in range(end, end + n):
             gene = parent[i % n]
 
-            if gene not in child[start:end]:
-                while child[curr_pos % n] != -1:
-                    curr_pos += 1
+            if not in_segment[gene]:
                 child[curr_pos % n] = gene
+                curr_pos += 1
 
     fill_child_pos(child1, parent2)
     fill_child_pos(child2, parent1)
@@ -79,18 +87,148 @@ def partially_mapped_crossover(
     mapping1 = {parent1[i]: parent2[i] for i in range(start, end)}
     mapping2 = {parent2[i]: parent1[i] for i in range(start, end)}
 
+    size = max(parent1) + 1
+
     def fill_child_pos(child: List[int], parent: List[int], mapping: Dict[int, int]) -> None:
-        for i in range(len(parent)):
-            if child[i] == -1:
-                gene = parent[i]
-                if gene not in child[start:end]:
-                    child[i] = gene
-                else:
-                    # Handle conflicts
-                    while gene in child:
-                        gene = mapping[gene]
-                    child[i] = gene
+        in_segment = [False] * size
+        for gene in child[start:end]:
+            in_segment[gene] = True
+
+        for i in chain(range(start), range(end, n)):
+            gene = parent[i]
+            # Handle conflicts. A mapping chain can only end on a gene outside the copied segment,
+            # so checking segment membership is equivalent to checking the whole child
+            while in_segment[gene]:
+                gene = mapping[gene]
+            child[i] = gene
 
     fill_child_pos(child1, parent1, mapping2)
     fill_child_pos(child2, parent2, mapping1)
     return child1, child2
+
+
+def random_cut_points(
+    rng: np.random.Generator,
+    num_rows: int,
+    n: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draws a pair of distinct, sorted cut indices per row, matching `sorted(random.sample(range(n),
+    2))` for each row.
+
+    Args:
+        rng: The random number generator.
+        num_rows: The number of rows to draw cut indices for.
+        n: The number of cities in each individual.
+
+    Returns:
+        A tuple of arrays containing the start and end cut index of each row.
+    """
+    first = rng.integers(0, n, size=num_rows)
+    second = rng.integers(0, n - 1, size=num_rows)
+    second += second >= first
+    return np.minimum(first, second), np.maximum(first, second)
+
+
+def batch_order_crossover(
+    parents1: np.ndarray,
+    parents2: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Performs order crossover (OX) on every pair of rows in two parent arrays at once. Row i of the
+    children is identical to `order_crossover(parents1[i], parents2[i])` with cut indices
+    `starts[i]` and `ends[i]`.
+
+    Args:
+        parents1: A 2-D integer array where each row is a first parent.
+        parents2: A 2-D integer array where each row is a second parent.
+        starts: The start cut index of each row.
+        ends: The end cut index of each row.
+
+    Returns:
+        A tuple containing the two arrays of child individuals.
+    """
+    m, n = parents1.shape
+    rows = np.arange(m)[:, None]
+    positions = np.arange(n)
+    in_segment = (positions >= starts[:, None]) & (positions < ends[:, None])
+    fill_order = (ends[:, None] + positions) % n
+
+    def fill_children(segment_parents: np.ndarray, fill_parents: np.ndarray) -> np.ndarray:
+        gene_in_segment = np.zeros((m, n), dtype=bool)
+        gene_in_segment[rows, segment_parents] = in_segment
+
+        # Walk the fill parent from the end of the segment, placing the k-th kept gene in the k-th
+        # free position after the segment
+        genes = fill_parents[rows, fill_order]
+        keep = ~gene_in_segment[rows, genes]
+        targets = (ends[:, None] + np.cumsum(keep, axis=1) - 1) % n
+
+        children = segment_parents.copy()
+        keep_rows, keep_cols = np.nonzero(keep)
+        children[keep_rows, targets[keep_rows, keep_cols]] = genes[keep_rows, keep_cols]
+        return children
+
+    return fill_children(parents1, parents2), fill_children(parents2, parents1)
+
+
+def batch_partially_mapped_crossover(
+    parents1: np.ndarray,
+    parents2: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Performs partially mapped crossover (PMX) on every pair of rows in two parent arrays at once.
+    Row i of the children is identical to `partially_mapped_crossover(parents1[i], parents2[i])`
+    with cut indices `starts[i]` and `ends[i]`.
+
+    Conflicts are resolved for all rows together by following the mappings with pointer jumping,
+    so the number of array passes grows with the logarithm of the longest mapping chain.
+
+    Args:
+        parents1: A 2-D integer array where each row is a first parent.
+        parents2: A 2-D integer array where each row is a second parent.
+        starts: The start cut index of each row.
+        ends: The end cut index of each row.
+
+    Returns:
+        A tuple containing the two arrays of child individuals.
+    """
+    m, n = parents1.shape
+    rows = np.arange(m)[:, None]
+    positions = np.arange(n)
+    in_segment = (positions >= starts[:, None]) & (positions < ends[:, None])
+    segment_rows, segment_cols = np.nonzero(in_segment)
+
+    def fill_children(segment_parents: np.ndarray, fill_parents: np.ndarray) -> np.ndarray:
+        gene_in_segment = np.zeros((m, n), dtype=bool)
+        gene_in_segment[rows, segment_parents] = in_segment
+
+        mapping = np.tile(positions, (m, 1))
+        mapping[segment_rows, segment_parents[segment_rows, segment_cols]] = (
+            fill_parents[segment_rows, segment_cols]
+        )
+
+        # Every chain ends on a gene outside the segment, which maps to itself
+        genes = fill_parents.copy()
+        while True:
+            pending = ~in_segment & gene_in_segment[rows, genes]
+            if not pending.any():
+                break
+            genes = np.where(pending, mapping[rows, genes], genes)
+            mapping = mapping[rows, mapping]
+
+        return np.where(in_segment, segment_parents, genes)
+
+    return fill_children(parents2, parents1), fill_children(parents1, parents2)
+
+
+# Batch equivalents of the crossover functions and the samplers for their random cut indices, used
+# by the genetic algorithm when available
+BATCH_CROSSOVER_FUNCS = {
+    order_crossover: (batch_order_crossover, random_cut_points),
+    partially_mapped_crossover: (batch_partially_mapped_crossover, random_cut_points)
+}
@@ -0,0 +1,100 @@
+import math
+import numpy as np
+from typing import List, Tuple, Union, Any
+from src.ga.spatial import SpatialGrid
+
+
+class CoordinateDistances:
+    """
+    A distance provider that computes Euclidean distances between cities on demand from their
+    coordinates, instead of storing every pair in an n x n matrix. Memory grows linearly with the
+    number of cities, so instances far too large for a distance matrix fit in a few hundred MB.
+
+    It supports the same indexing as a distance matrix: `distances[rows, cols]` gathers the
+    distances between pairs of cities, `distances[i]` and `distances[start:end]` compute rows,
+    `distances.item(i, j)` returns a single distance as a float, and `len(distances)` is the number
+    of cities. The K nearest neighbours of every city, and their distances, are also kept for
+    local search and the greedy heuristic.
+    """
+    def __init__(
+        self,
+        coords: Union[List[Tuple[float, float]], np.ndarray],
+        num_neighbours: int = 10
+    ):
+        """
+        Initialises the provider and finds the nearest neighbours of every city.
+
+        Args:
+            coords: The coordinates of each city.
+            num_neighbours: The number of nearest neighbours kept per city, or 0 to keep none
+                (default: 10).
+        """
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        self.x = np.ascontiguousarray(coords[:, 0])
+        self.y = np.ascontiguousarray(coords[:, 1])
+        self._xs = self.x.tolist()
+        self._ys = self.y.tolist()
+        self.shape = (len(coords), len(coords))
+        self.dtype = np.dtype(np.float64)
+
+        self.neighbours = None
+        self.neighbour_distances = None
+        num_neighbours = min(num_neighbours, len(coords) - 1)
+        if num_neighbours > 0:
+            # A spatial index finds the neighbours in close to O(n * K) time rather than
+            # computing every pair of distances
+            grid = SpatialGrid(coords)
+            self.neighbours = np.array(
+                [grid.k_nearest(city, num_neighbours) for city in range(len(coords))],
+                dtype=np.int32
+            )
+            self.neighbour_distances = self[np.arange(len(coords))[:, None], self.neighbours]
+
+    def __len__(self) -> int:
+        """
+        Counts the cities.
+
+        Returns:
+            The number of cities.
+        """
+        return self.shape[0]
+
+    def __getitem__(self, key: Any) -> Union[np.ndarray, np.float64]:
+        """
+        Computes distances with the same indexing as a distance matrix.
+
+        Args:
+            key: A pair of broadcastable city indices or index arrays, selecting the distance
+                between each pair, or a city index, index array or slice, selecting whole rows.
+
+        Returns:
+            The selected distances.
+        """
+        if isinstance(key, tuple):
+            rows, cols = key
+            dx = self.x[rows] - self.x[cols]
+            dy = self.y[rows] - self.y[cols]
+        else:
+            dx = np.subtract.outer(self.x[key], self.x)
+            dy = np.subtract.outer(self.y[key], self.y)
+        return np.sqrt(dx * dx + dy * dy)
+
+    def item(self, city1: int, city2: int) -> float:
+        """
+        Computes the distance between two cities as a Python float, which is much faster than
+        indexing for single pairs.
+
+        Args:
+            city1: The first city.
+            city2: The second city.
+
+        Returns:
+            The distance between the two cities.
+        """
+        dx = self._xs[city1] - self._xs[city2]
+        dy = self._ys[city1] - self._ys[city2]
+        return math.sqrt(dx * dx + dy * dy)
+
+
+# Either a distance matrix or a provider computing distances on demand
+DistanceProvider = Union[np.ndarray, CoordinateDistances]
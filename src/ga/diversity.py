@@ -0,0 +1,202 @@
+import numpy as np
+from typing import Dict, Optional, Union
+from src.ga.initialisation import population_dtype
+from src.ga.fitness_cache import FitnessCache
+
+
+class DiversityTracker:
+    """
+    Measures the diversity of a population each generation by the fraction of distinct tours and
+    the entropy of its edge frequencies.
+
+    Tours are told apart by the edge hash of `FitnessCache.hash_tours`, so rotated or reversed
+    copies of a tour count once.
+
+    Edge entropy is measured over the edges of a fixed random sample of cities: for each sampled
+    city, the entropy of how often each other city is its neighbour across the population. It is
+    normalised so that 0 means every tour shares the same edges at those cities, and 1 means no
+    two edges are shared.
+
+    The hash and sampled edges of each individual are kept between generations and follow it
+    through selection, so only the individuals changed by crossover, mutation, local search,
+    migration or restarts are measured again.
+    """
+    def __init__(
+        self,
+        num_cities: int,
+        population_size: int,
+        sample_size: int = 100,
+        seed: int = 0,
+        hasher: Optional[FitnessCache] = None
+    ):
+        """
+        Initialises the tracker, with every individual still to be measured.
+
+        Args:
+            num_cities: The total number of cities.
+            population_size: The number of individuals in the population.
+            sample_size: The number of cities whose edges are sampled for the edge entropy, capped
+                at the number of cities (default: 100).
+            seed: The seed of the city sample (default: 0).
+            hasher: The fitness cache whose hash tells tours apart, so that hashes it computes
+                can be shared with `store_hashes` (default: None, uses an empty cache).
+        """
+        rng = np.random.default_rng(seed)
+        self.num_cities = num_cities
+        self.sample = np.sort(rng.choice(num_cities, min(sample_size, num_cities), replace=False))
+
+        # The two neighbours of each sampled city in each individual, and whether they need
+        # measuring again, double-buffered like the population itself. Neighbours are laid out by
+        # sampled city, so each city's neighbours across the population are one row
+        self.neighbours = np.zeros(
+            (len(self.sample), 2, population_size),
+            dtype=population_dtype(num_cities)
+        )
+        self.stale = np.ones(population_size, dtype=bool)
+        self._next_neighbours = np.empty_like(self.neighbours)
+        self._next_stale = np.empty_like(self.stale)
+
+        # The hash of each individual's tour and whether it needs hashing again, kept apart from
+        # the edges as hashes can also be stored by evaluation
+        self.hasher = hasher if hasher is not None else FitnessCache(num_cities, 0)
+        self.hashes = np.zeros(population_size, dtype=np.uint64)
+        self.unhashed = np.ones(population_size, dtype=bool)
+        self._next_hashes = np.empty_like(self.hashes)
+        self._next_unhashed = np.empty_like(self.unhashed)
+
+        # The maximum entropy of the neighbours of a city, where every neighbour is distinct, and
+        # the minimum, where every tour has the same two neighbours
+        self._max_entropy = np.log(min(2 * population_size, num_cities - 1)) if num_cities > 1 \
+            else 0.0
+        self._min_entropy = np.log(2)
+        counts = np.arange(2 * population_size + 1)
+        self._count_entropy = counts * np.log(np.maximum(counts, 1))
+        self.counts = {"measured": 0, "carried": 0, "hashed": 0}
+
+    def select(self, indices: np.ndarray) -> None:
+        """
+        Reorders the measurements to follow the individuals selected into the next generation.
+
+        Args:
+            indices: The index, in the current population, of each individual of the next
+                generation.
+        """
+        np.take(self.neighbours, indices, axis=2, out=self._next_neighbours)
+        np.take(self.stale, indices, out=self._next_stale)
+        np.take(self.hashes, indices, out=self._next_hashes)
+        np.take(self.unhashed, indices, out=self._next_unhashed)
+        self.neighbours, self._next_neighbours = self._next_neighbours, self.neighbours
+        self.stale, self._next_stale = self._next_stale, self.stale
+        self.hashes, self._next_hashes = self._next_hashes, self.hashes
+        self.unhashed, self._next_unhashed = self._next_unhashed, self.unhashed
+
+    def invalidate(self, rows: Union[np.ndarray, slice]) -> None:
+        """
+        Marks individuals that have changed, to be measured again.
+
+        Args:
+            rows: The rows of the individuals in the population.
+        """
+        self.stale[rows] = True
+        self.unhashed[rows] = True
+
+    def store_hashes(self, rows: np.ndarray, hashes: np.ndarray) -> None:
+        """
+        Stores the hashes of individuals already hashed by `hasher`, e.g. when their fitness was
+        looked up, so they are not hashed again.
+
+        Args:
+            rows: The rows of the individuals in the population.
+            hashes: The hash of each individual.
+        """
+        self.hashes[rows] = hashes
+        self.unhashed[rows] = False
+
+    def distinct_tours(self, population: np.ndarray) -> float:
+        """
+        Measures the fraction of distinct tours in the population, first hashing the individuals
+        that have changed.
+
+        Args:
+            population: A 2-D integer array of individuals, one per row.
+
+        Returns:
+            The number of distinct tours divided by the population size.
+        """
+        rows = np.flatnonzero(self.unhashed)
+        self.counts["hashed"] += len(rows)
+        if len(rows) > 0:
+            self.hashes[rows] = self.hasher.hash_tours(population[rows])
+            self.unhashed[rows] = False
+        return len(np.unique(self.hashes)) / len(self.hashes)
+
+    def measure(self, population: np.ndarray) -> float:
+        """
+        Measures the edge entropy of the population, first finding the sampled edges of the
+        individuals that have changed.
+
+        Args:
+            population: A 2-D integer array of individuals, one per row.
+
+        Returns:
+            The normalised edge entropy.
+        """
+        rows = np.flatnonzero(self.stale)
+        self.counts["measured"] += len(rows)
+        self.counts["carried"] += len(population) - len(rows)
+        if len(rows) > 0:
+            self._measure_rows(population, rows)
+            self.stale[rows] = False
+        return self._edge_entropy()
+
+    def _measure_rows(self, population: np.ndarray, rows: np.ndarray) -> None:
+        """
+        Finds the neighbours of each sampled city in the tours of individuals.
+
+        Args:
+            population: A 2-D integer array of individuals, one per row.
+            rows: The rows of the individuals to measure.
+        """
+        tours = population[rows]
+
+        # Scattering each tour's positions inverts it, so each sampled city is found in one step
+        positions = np.empty(tours.shape, dtype=np.intp)
+        tour_rows = np.arange(len(rows))[:, None]
+        positions[tour_rows, tours] = np.arange(self.num_cities)
+        sample_positions = positions[:, self.sample]
+        self.neighbours[:, 0, rows] = tours[tour_rows, (sample_positions + 1) % self.num_cities].T
+        self.neighbours[:, 1, rows] = tours[tour_rows, sample_positions - 1].T
+
+    def _edge_entropy(self) -> float:
+        """
+        Computes the normalised entropy of the neighbours of the sampled cities across the
+        population.
+
+        Returns:
+            The mean entropy over the sampled cities, scaled to between 0 and 1.
+        """
+        if len(self.sample) == 0 or self._max_entropy <= self._min_entropy:
+            return 0.0
+
+        # One row of neighbours per sampled city, sorted so that equal neighbours are adjacent
+        table = np.sort(self.neighbours.reshape(len(self.sample), -1), axis=1)
+        starts = np.ones(table.shape, dtype=bool)
+        starts[:, 1:] = table[:, 1:] != table[:, :-1]
+        counts = np.diff(np.append(np.flatnonzero(starts), table.size))
+
+        # The entropy of each city's neighbours is log(n) - sum(k log k) / n over the count k of
+        # each neighbour, where n is the number of neighbours per city, with k log k looked up
+        num_neighbours = table.shape[1]
+        entropy = np.log(num_neighbours) - self._count_entropy[counts].sum() / table.size
+        scaled = (entropy - self._min_entropy) / (self._max_entropy - self._min_entropy)
+        return float(np.clip(scaled, 0.0, 1.0))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Summarises how many measurements were reused.
+
+        Returns:
+            The number of individuals whose edges were measured, the number whose edges were
+            carried over from an earlier generation, and the number of tours hashed.
+        """
+        return dict(self.counts)
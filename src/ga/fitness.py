@@ -1,4 +1,10 @@
-from typing import List, Tuple
+import numpy as np
+from typing import List, Tuple, Sequence, Callable, Union
+
+# Upper bound on the number of elements in the temporary blocks used when building distance
+# matrices, evaluating a population or finding neighbour lists, keeping peak memory close to the
+# size of the result.
+BLOCK_ELEMENTS = 1 << 22
 
 
 def euclidean_distance(city1: Tuple[float, float], city2: Tuple[float, float]) -> float:
@@ -15,41 +21,102 @@ def euclidean_distance(city1: Tuple[float, float], city2: Tuple[float, float]) -
     return ((city1[0] - city2[0]) ** 2 + (city1[1] - city2[1]) ** 2) ** 0.5
 
 
-def compute_distance_matrix(coords: List[Tuple[float, float]]) -> List[List[float]]:
+def compute_distance_matrix(
+    coords: Union[List[Tuple[float, float]], np.ndarray],
+    dtype: np.dtype = np.float64
+) -> np.ndarray:
     """
     Computes a matrix representing the distance between each pair of cities.
 
+    The matrix is built in blocks of rows with vectorised operations, so the cost is dominated by
+    writing the matrix to memory rather than by per-pair Python calls.
+
     Args:
         coords: The coordinates of each city.
+        dtype: The floating point type of the matrix, e.g. `np.float32` to halve its memory
+            footprint (default: `np.float64`).
 
     Returns:
-        A square matrix where each element (i, j) represents the Euclidean distance between city i
-        and city j.
+        A contiguous, symmetric square matrix where each element (i, j) represents the Euclidean
+        distance between city i and city j.
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    x, y = coords[:, 0], coords[:, 1]
+
+    def block_distances(start: int, end: int) -> np.ndarray:
+        dx = x[start:end, None] - x[None, :]
+        dy = y[start:end, None] - y[None, :]
+        return np.sqrt(dx * dx + dy * dy)
+
+    return blocked_distance_matrix(len(coords), block_distances, dtype)
+
+
+def blocked_distance_matrix(
+    num_cities: int,
+    block_distances: Callable[[int, int], np.ndarray],
+    dtype: np.dtype = np.float64
+) -> np.ndarray:
     """
-    num_cities = len(coords)
-    distance_matrix = [[0.0] * num_cities for _ in range(num_cities)]
+    Builds a square distance matrix in blocks of rows, keeping the temporary arrays of each block
+    small.
 
-    for i in range(num_cities):
-        for j in range(num_cities):
-            if i != j:
-                distance_matrix[i][j] = euclidean_distance(coords[i], coords[j])
+    Args:
+        num_cities: The number of cities.
+        block_distances: A function computing the rows of the matrix from `start` to `end`
+            (exclusive).
+        dtype: The floating point type of the matrix (default: `np.float64`).
+
+    Returns:
+        The matrix.
+    """
+    distance_matrix = np.empty((num_cities, num_cities), dtype=dtype)
+    block_rows = max(1, BLOCK_ELEMENTS // max(num_cities, 1))
+    for start in range(0, num_cities, block_rows):
+        end = min(start + block_rows, num_cities)
+        distance_matrix[start:end] = block_distances(start, end)
     return distance_matrix
 
 
-def fitness(individual: List[int], distance_matrix: List[List[float]]) -> float:
+def fitness(individual: Sequence[int], distance_matrix: np.ndarray) -> float:
     """
     Calculates the total distance of a tour, including the return to the starting city.
 
     Args:
-        individual: A list of city indicies representing an individual.
-        distance_matrix: A square matrix representing the distances between each pair of cities.
+        individual: A sequence of city indicies representing an individual.
+        distance_matrix: A square matrix representing the distances between each pair of cities,
+            or a distance provider with the same indexing.
 
     Returns:
         The total distance tour.
     """
-    total_distance = 0.0
-    for i in range(len(individual)):
-        city1 = individual[i]
-        city2 = individual[(i + 1) % len(individual)]
-        total_distance += distance_matrix[city1][city2]
-    return total_distance
+    individual = np.asarray(individual)
+    return float(distance_matrix[individual, np.roll(individual, -1)].sum(dtype=np.float64))
+
+
+def evaluate_population(population: np.ndarray, distance_matrix: np.ndarray) -> np.ndarray:
+    """
+    Calculates the total distance of every tour in a population with vectorised gathers and sums
+    over blocks of rows, including the return to each tour's starting city.
+
+    Args:
+        population: A 2-D integer array of shape (population_size, num_cities), where each row is
+            an individual.
+        distance_matrix: A square matrix representing the distances between each pair of cities,
+            or a distance provider with the same indexing.
+
+    Returns:
+        A 1-D array of the total distance of each tour.
+    """
+    population = np.asarray(population)
+    num_rows, num_cities = population.shape
+    block_rows = max(1, BLOCK_ELEMENTS // max(num_cities, 1))
+
+    scores = np.empty(num_rows, dtype=np.float64)
+    for start in range(0, num_rows, block_rows):
+        block = population[start:start + block_rows]
+        next_cities = np.roll(block, -1, axis=1)
+        scores[start:start + block_rows] = distance_matrix[block, next_cities].sum(
+            axis=1,
+            dtype=np.float64
+        )
+    return scores
@@ -0,0 +1,99 @@
+import numpy as np
+from collections import OrderedDict
+from typing import Dict
+
+
+class FitnessCache:
+    """
+    A bounded cache of the fitness of tours, evicting the least recently used tour when full.
+
+    Tours are keyed by a hash of their set of edges, so a tour has the same key whatever city it
+    starts from and whichever direction it is traversed in. This assumes symmetric distances.
+    """
+    def __init__(self, num_cities: int, max_size: int, seed: int = 0):
+        """
+        Initialises an empty cache.
+
+        Args:
+            num_cities: The total number of cities.
+            max_size: The maximum number of tours in the cache.
+            seed: The seed of the random weights of the tour hash (default: 0).
+        """
+        # Odd 64-bit weights keep the products of edge weights from losing their low bits
+        rng = np.random.default_rng(seed)
+        self.weights = (rng.integers(0, 1 << 63, num_cities, dtype=np.uint64) << np.uint64(1)) \
+            | np.uint64(1)
+        self.max_size = max_size
+        self.scores: "OrderedDict[int, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def hash_tours(self, population: np.ndarray) -> np.ndarray:
+        """
+        Hashes tours by the sum, with 64-bit wraparound, of the products of the random weights of
+        the two cities of each edge. Rotating or reversing a tour keeps its edges, and so its hash.
+
+        Args:
+            population: A 2-D integer array of individuals, one per row.
+
+        Returns:
+            The hash of each individual.
+        """
+        weights = self.weights[population]
+        edge_hashes = weights[:, :-1] * weights[:, 1:]
+        return edge_hashes.sum(axis=1, dtype=np.uint64) + weights[:, -1] * weights[:, 0]
+
+    def lookup(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Looks up the fitness of tours, marking the tours found as recently used.
+
+        Args:
+            hashes: The hash of each tour.
+
+        Returns:
+            The cached fitness of each tour, or NaN for tours not in the cache.
+        """
+        scores = np.full(len(hashes), np.nan)
+        for i, key in enumerate(hashes.tolist()):
+            score = self.scores.get(key)
+            if score is None:
+                self.misses += 1
+            else:
+                self.scores.move_to_end(key)
+                scores[i] = score
+                self.hits += 1
+        return scores
+
+    def store(self, hashes: np.ndarray, scores: np.ndarray) -> None:
+        """
+        Adds the fitness of tours to the cache, evicting the least recently used tours if it is
+        full.
+
+        Args:
+            hashes: The hash of each tour.
+            scores: The fitness of each tour.
+        """
+        for key, score in zip(hashes.tolist(), scores.tolist()):
+            self.scores[key] = score
+            self.scores.move_to_end(key)
+            if len(self.scores) > self.max_size:
+                self.scores.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Summarises how effective the cache has been.
+
+        Returns:
+            The number of hits, misses and evictions, the hit rate, and the number of tours in the
+            cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self.scores)
+        }
@@ -1,12 +1,64 @@
 import time
 import random
-import copy
+import inspect
+import warnings
 import os
 import json
-from typing import List, Tuple, Callable
-from src.ga.fitness import compute_distance_matrix, fitness
-from src.ga.initialisation import init_population
-from src.ga.selection import elitism, tournament_selection
+import numpy as np
+from contextlib import contextmanager
+from typing import List, Tuple, Dict, Callable, Iterator, NamedTuple, Optional, Any
+from src.ga.fitness import compute_distance_matrix, evaluate_population
+from src.ga.fitness_cache import FitnessCache
+from src.ga.diversity import DiversityTracker
+from src.ga.population_cache import PopulationCache
+from src.ga.distances import CoordinateDistances, DistanceProvider
+from src.ga.initialisation import init_population, population_dtype
+from src.ga.selection import elitism_indices, tournament_indices
+from src.ga.crossover import BATCH_CROSSOVER_FUNCS
+from src.ga.mutation import BATCH_MUTATION_FUNCS, inversion_mutation
+from src.ga.local_search import neighbour_lists, local_search
+from src.utils.file_utils import save_json
+from src.utils.profiling import Profiler
+
+LOCAL_SEARCH_MODES = (None, "offspring", "elite")
+
+PROFILE_MODES = (None, "phases", "operators")
+
+DISTANCE_MODES = ("matrix", "on_demand")
+BACKENDS = ("python", "numba")
+
+CONVERGENCE_ACTIONS = (None, "monitor", "stop", "restart")
+
+# The phases of a generation that are timed in its statistics. The crossover and mutation phases
+# include sampling the operators' random parameters, which profiling also records on its own
+PHASES = (
+    "evaluation",
+    "elitism",
+    "tournament",
+    "replacement",
+    "crossover",
+    "mutation",
+    "local_search",
+    "diversity",
+    "restart"
+)
+
+
+class GenerationStats(NamedTuple):
+    """
+    The statistics of a single generation, as yielded by `GeneticAlgorithm.iter_run`. Diversity
+    is the fraction of distinct tours in the population, up to rotation and direction, or None
+    when it is not measured, and `phase_secs` holds the time spent in each of `PHASES`. When
+    diversity is tracked, `edge_entropy` is the normalised edge entropy measured by
+    `DiversityTracker`, and otherwise None.
+    """
+    generation: int
+    best_fitness: float
+    avg_fitness: float
+    std_fitness: float
+    diversity: Optional[float]
+    phase_secs: Dict[str, float]
+    edge_entropy: Optional[float] = None
 
 
 class GeneticAlgorithm:
@@ -15,61 +67,333 @@ class GeneticAlgorithm:
     """
     def __init__(
         self,
-        coords: List[Tuple[float, float]],
+        coords: Optional[List[Tuple[float, float]]],
         population_size: int,
         crossover_rate: float,
         crossover_func: Callable[[List[int], List[int]], Tuple[List[int], List[int]]],
         mutation_rate: float,
-        mutation_func: Callable[[List[int]], None],
+        mutation_func: Callable[[List[int], Optional[np.ndarray]], Optional[float]],
         generations: int,
         elitism_rate: float,
         tournament_size: int,
         greedy_rate: float,
-        early_stop_threshold: int
+        early_stop_threshold: int,
+        distance_dtype: np.dtype = np.float64,
+        seed: Optional[int] = None,
+        distance_matrix: Optional[DistanceProvider] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: int = 100,
+        local_search_mode: Optional[str] = None,
+        local_search_neighbours: int = 10,
+        spatial_greedy: bool = False,
+        telemetry_path: Optional[str] = None,
+        keep_history: bool = True,
+        profile: Optional[str] = None,
+        fitness_cache_size: int = 0,
+        distance_mode: str = "matrix",
+        population_cache: Optional[PopulationCache] = None,
+        backend: str = "python",
+        convergence_action: Optional[str] = None,
+        convergence_entropy: float = 0.01,
+        convergence_distinct: float = 0.1,
+        convergence_patience: int = 100,
+        restart_fraction: float = 1.0,
+        restart_inversions: int = 10,
+        diversity_sample: int = 50
     ):
         """
         Initialises the genetic algorithm.
 
         Args:
-            coords: The coordinates of the cities to be visited.
+            coords: The coordinates of the cities to be visited, or None for instances that only
+                have a `distance_matrix`.
             population_size: The number of individuals in the population.
             crossover_rate: The probability of performing crossover.
             crossover_func: The function that performs crossover on two parent individuals.
             mutation_rate: The probability of performing mutation.
-            mutation_func: The function that performs mutation on an individual.
+            mutation_func: The function that performs mutation on an individual in-place. When
+                it accepts the distance matrix as a second argument and returns the resulting
+                change in tour length, the fitness of mutated individuals is updated without
+                evaluating them. Functions taking only the individual, or returning None, leave
+                mutated individuals to be evaluated again.
             generations: The number of generations to run the algorithm for.
-            elitism_rate: The proportion of individuals to retain through elitism.
+            elitism_rate: The proportion of individuals to retain through elitism, at least 0 and
+                less than 1 so that some individuals are selected by tournament.
             tournament_size: The size of the tournament for selection.
             greedy_rate: The probability of initialising an individual with a greedy heuristic.
             early_stop_threshold: The number of generations without improvement before stopping.
+            distance_dtype: The floating point type of the distance matrix (default: `np.float64`).
+            seed: The seed for the run's random number generators, or None for a random seed.
+                The global `random` module is never reseeded (default: None).
+            distance_matrix: A precomputed distance matrix, or a distance provider with the same
+                indexing, to use instead of building one from `coords`, e.g. one shared between
+                runs (default: None).
+            checkpoint_path: The file path where the state of the run is periodically saved, or
+                None to disable checkpointing (default: None).
+            checkpoint_interval: The number of generations between checkpoints (default: 100).
+            local_search_mode: Which individuals are improved with 2-opt and Or-opt local search
+                each generation: "offspring" for every new individual, "elite" for the elite only,
+                or None to disable local search (default: None).
+            local_search_neighbours: The number of nearest neighbours per city considered as
+                candidate moves in local search (default: 10).
+            spatial_greedy: Whether greedy individuals are built with a spatial index over
+                `coords` rather than by scanning the distance matrix, which is much faster on
+                large instances with Euclidean distances (default: False).
+            telemetry_path: The file path where the statistics of each generation are appended as
+                lines of JSON while the run progresses, or None to disable telemetry (default:
+                None).
+            keep_history: Whether the average and best fitness of each generation are kept in
+                memory for `save_results`. Disabling it keeps memory constant on long runs, with
+                the history streamed to `telemetry_path` instead (default: True).
+            profile: What is profiled over the run and saved with the results: "phases" for the
+                total time and number of calls of each of `PHASES`, and of the samplers of the
+                batch operators' random parameters, "operators" to also time each call to the
+                crossover and mutation operators, or None to disable profiling (default: None).
+            fitness_cache_size: The number of tours whose fitness is remembered, so that new
+                individuals identical to a recent tour (up to rotation and direction) are not
+                evaluated again, or 0 to disable the cache. Offspring that are unchanged copies of
+                their parents keep their fitness regardless, so the cache pays off when evaluating
+                a tour costs much more than hashing it (default: 0).
+            distance_mode: How distances are built from `coords` when no distance matrix is
+                given: "matrix" to compute every pair up front, or "on_demand" to compute them
+                when needed with a `CoordinateDistances`, which keeps the `local_search_neighbours`
+                nearest neighbours of each city and needs memory linear rather than quadratic in
+                the number of cities (default: "matrix").
+            population_cache: A cache of initial populations shared between runs on the same
+                instance, so that runs with the same population size, greedy rate, seed and backend
+                start from the same population without building it again. Only seeded runs use the
+                cache (default: None).
+            backend: The implementation of evaluation, the greedy heuristic and the batch
+                crossover and mutation kernels: "python" for the vectorised NumPy kernels, or
+                "numba" for kernels compiled with Numba, cached on disk after the first
+                compilation. Falls back to "python", with a warning, if Numba is not installed,
+                and for distance providers other than a distance matrix (default: "python").
+            convergence_action: What is done once the population has converged and stagnated, as
+                measured by a `DiversityTracker` each generation: "monitor" to only report the
+                diversity in each generation's statistics, "stop" to stop the run, "restart" to
+                replace `restart_fraction` of the non-elite population with perturbed copies of
+                the elite, or None to not track convergence (default: None).
+            convergence_entropy: The normalised edge entropy at or below which the population has
+                converged (default: 0.01).
+            convergence_distinct: The fraction of distinct tours, as reported in each generation's
+                statistics, at or below which the population has converged (default: 0.1).
+            convergence_patience: The number of consecutive generations the population must stay
+                converged without improving before the convergence action is taken. Mutation keeps
+                improving converged populations for a while, so acting on convergence alone would
+                cut short runs that still pay off (default: 100).
+            restart_fraction: The fraction of the non-elite population replaced on a restart
+                (default: 1.0).
+            restart_inversions: The number of random inversions applied to each copy of the elite
+                that re-seeds the population on a restart. Copies keep most of the elite's edges,
+                so unlike new random individuals they survive selection long enough to be
+                recombined (default: 10).
+            diversity_sample: The number of cities whose edges are sampled to measure the edge
+                entropy (default: 50).
+
+        Raises:
+            ValueError: If the local search mode, profile mode, distance mode, backend or
+                convergence action is unknown, or the elitism rate is not in [0, 1).
         """
+        if local_search_mode not in LOCAL_SEARCH_MODES:
+            raise ValueError(
+                f"Unknown local search mode '{local_search_mode}', expected one of "
+                f"{LOCAL_SEARCH_MODES}"
+            )
+        if profile not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{profile}', expected one of {PROFILE_MODES}")
+        if distance_mode not in DISTANCE_MODES:
+            raise ValueError(
+                f"Unknown distance mode '{distance_mode}', expected one of {DISTANCE_MODES}"
+            )
+        if not 0 <= elitism_rate < 1:
+            raise ValueError(f"Elitism rate {elitism_rate} must be at least 0 and less than 1")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+        if convergence_action not in CONVERGENCE_ACTIONS:
+            raise ValueError(
+                f"Unknown convergence action '{convergence_action}', expected one of "
+                f"{CONVERGENCE_ACTIONS}"
+            )
+        if backend == "numba":
+            # Imported only when requested, as importing Numba takes a noticeable fraction of a
+            # second
+            from src.ga import jit
+            if not jit.JIT_AVAILABLE:
+                warnings.warn("Numba is not installed, falling back to the python backend")
+                backend = "python"
+
         self.crossover_rate = crossover_rate
         self.crossover_func = crossover_func
         self.mutation_rate = mutation_rate
         self.mutation_func = mutation_func
+        self._mutation_takes_distances = _accepts_distances(mutation_func)
+
+        if distance_matrix is None and distance_mode == "on_demand":
+            distance_matrix = CoordinateDistances(coords, local_search_neighbours)
+        elif distance_matrix is None:
+            distance_matrix = compute_distance_matrix(coords, distance_dtype)
+        self.distance_matrix = distance_matrix
+
+        # Compiled kernels index the distance matrix directly, so other distance providers keep
+        # the NumPy kernels
+        if backend == "numba" and not isinstance(distance_matrix, np.ndarray):
+            provider = type(distance_matrix).__name__
+            warnings.warn(
+                f"The numba backend needs a distance matrix rather than a {provider}, falling back "
+                "to the python backend"
+            )
+            backend = "python"
+        self.backend = backend
+        self._evaluate_population = evaluate_population
+        self._greedy_func = None
+        batch_crossover_funcs, batch_mutation_funcs = BATCH_CROSSOVER_FUNCS, BATCH_MUTATION_FUNCS
+        if self.backend == "numba":
+            self._evaluate_population = jit.jit_evaluate_population
+            self._greedy_func = jit.jit_greedy_heuristic
+            batch_crossover_funcs = jit.JIT_BATCH_CROSSOVER_FUNCS
+            batch_mutation_funcs = jit.JIT_BATCH_MUTATION_FUNCS
+
+        # Batch kernels operate on the whole mating pool at once. Operators without one fall back
+        # to being applied per individual
+        self.batch_crossover = batch_crossover_funcs.get(crossover_func)
+        self.batch_mutation = batch_mutation_funcs.get(mutation_func)
+
+        # Operators are only wrapped with timers when profiled, so profiling costs nothing when
+        # disabled. Samplers are timed in either profile mode, as their time is otherwise hidden in
+        # the crossover and mutation phases
+        self.profiler = Profiler() if profile is not None else None
+        if self.profiler is not None:
+            operators = profile == "operators"
+            if operators:
+                self.crossover_func = self.profiler.timed(crossover_func, "crossover:")
+                self.mutation_func = self.profiler.timed(mutation_func, "mutation:")
+            if self.batch_crossover is not None:
+                batch_func, sampler = self.batch_crossover
+                self.batch_crossover = (
+                    self.profiler.timed(batch_func, "crossover:") if operators else batch_func,
+                    self.profiler.timed(sampler, "crossover:")
+                )
+            if self.batch_mutation is not None:
+                batch_func, sampler = self.batch_mutation
+                self.batch_mutation = (
+                    self.profiler.timed(batch_func, "mutation:") if operators else batch_func,
+                    self.profiler.timed(sampler, "mutation:")
+                )
+
+        # Initialisation and operators without batch kernels draw from the random module. The run
+        # keeps its own state for it, swapped in only around them, so seeding a run leaves the
+        # caller's random module untouched
+        self._random_state = random.Random(seed).getstate()
+        self.rng = np.random.default_rng(seed)
 
         self.generations = generations
         self.elitism_count = int(elitism_rate * population_size)
         self.tournament_size = tournament_size
         self.early_stop_threshold = early_stop_threshold
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.telemetry_path = telemetry_path
+        self.keep_history = keep_history
 
         # Initialisation
-        self.distance_matrix = compute_distance_matrix(coords)
-        self.population = init_population(
-            population_size,
-            len(coords),
-            self.distance_matrix,
-            greedy_rate
+        num_cities = len(self.distance_matrix)
+        # The backend picks the greedy heuristic, whose tours can differ between implementations
+        population_key = (population_size, greedy_rate, seed, spatial_greedy, self.backend)
+        cached = None
+        if population_cache is not None and seed is not None:
+            cached = population_cache.get(population_key)
+        if cached is not None:
+            # Restoring the random state leaves the run as if it had built the population itself
+            self.population, self._random_state = cached
+        else:
+            with self._random_module():
+                individuals = init_population(
+                    population_size,
+                    num_cities,
+                    self.distance_matrix,
+                    greedy_rate,
+                    coords if spatial_greedy else None,
+                    self._greedy_func
+                )
+            self.population = np.array(individuals, dtype=population_dtype(num_cities))
+            if population_cache is not None and seed is not None:
+                population_cache.put(population_key, self.population, self._random_state)
+        # Cached fitness per individual, where NaN marks individuals that need evaluating. Clean
+        # individuals carry their fitness over, and the rest are looked up in the fitness cache
+        # before being evaluated
+        self.fitness_scores = np.full(len(self.population), np.nan)
+        self.fitness_cache = None
+        if fitness_cache_size > 0:
+            self.fitness_cache = FitnessCache(num_cities, fitness_cache_size)
+        self.evaluation_counts = {"carried": 0, "cached": 0, "evaluated": 0}
+
+        # Local search candidates, and which individuals are already locally optimal
+        self.local_search_mode = local_search_mode
+        self.neighbours = None
+        if local_search_mode is not None:
+            self.neighbours = neighbour_lists(
+                self.distance_matrix,
+                local_search_neighbours
+            ).tolist()
+        self.optimised = np.zeros(len(self.population), dtype=bool)
+
+        # Diversity is only measured when it is reported or acted on, and edges are only sampled
+        # when convergence is tracked. Tours are hashed with the fitness cache's hash, so tours
+        # hashed to look up their fitness are not hashed again
+        self.convergence_action = convergence_action
+        self.convergence_entropy = convergence_entropy
+        self.convergence_distinct = convergence_distinct
+        self.convergence_patience = convergence_patience
+        self.restart_fraction = restart_fraction
+        self.restart_inversions = restart_inversions
+        self._restart_mutation = batch_mutation_funcs[inversion_mutation]
+        self.stagnant_count = 0
+        self.diversity = DiversityTracker(
+            num_cities,
+            len(self.population),
+            diversity_sample if convergence_action is not None else 0,
+            0 if seed is None else seed,
+            self.fitness_cache
         )
+        self.restarts = []
+        self.converged_generation = None
+
+        # Each generation is built in the second of a pair of preallocated buffers, which are then
+        # swapped, so the population's memory is fixed for the whole run
+        self._next_population = np.empty_like(self.population)
+        self._next_scores = np.empty_like(self.fitness_scores)
+        self._next_optimised = np.empty_like(self.optimised)
 
         self.avg_fitness_per_gen = []
         self.best_fitness_per_gen = []
         self.best_distance = float("inf")
         self.best_solution = None
         self.no_improvement_count = 0
+        self.generation = 0
+        self.stopped_early = False
         self.computational_secs = None
 
-    def run(self) -> None:
+        # The settings that determine how a run continues, which a checkpoint must match to be
+        # resumed by this run. The generation budget may differ, so a run can be extended
+        self.settings = {
+            "num_cities": num_cities,
+            "population_size": len(self.population),
+            "crossover_func": getattr(crossover_func, "__name__", repr(crossover_func)),
+            "crossover_rate": crossover_rate,
+            "mutation_func": getattr(mutation_func, "__name__", repr(mutation_func)),
+            "mutation_rate": mutation_rate,
+            "elitism_count": self.elitism_count,
+            "tournament_size": tournament_size,
+            "early_stop_threshold": early_stop_threshold,
+            "local_search_mode": local_search_mode,
+            "convergence_action": convergence_action
+        }
+
+    def run(
+        self,
+        until: Optional[int] = None,
+        callback: Optional[Callable[[GenerationStats], Optional[bool]]] = None
+    ) -> None:
         """
         Runs the genetic algorithm.
 
@@ -77,87 +401,639 @@ class GeneticAlgorithm:
         best individuals, selection occurs using tournament selection, crossover and mutation are
         performed to generate the next population, and early stopping is checked based on no
         improvement.
+
+        A run continues from its current generation, so it can be advanced in stages (e.g. between
+        migrations) or resumed after `load_checkpoint`.
+
+        Args:
+            until: The generation to stop at, capped at `generations` (default: None, runs to
+                `generations`).
+            callback: A function called with the statistics of each generation, which can return
+                True to stop the run after that generation (default: None).
+        """
+        # Without a callback, the statistics are only needed for telemetry and convergence
+        stats_iter = self.iter_run(until, measure_diversity=callback is not None)
+        try:
+            for stats in stats_iter:
+                if callback is not None and callback(stats):
+                    break
+        finally:
+            stats_iter.close()
+
+    def iter_run(
+        self,
+        until: Optional[int] = None,
+        measure_diversity: bool = True
+    ) -> Iterator[GenerationStats]:
         """
-        start_time = time.time()
+        Runs the genetic algorithm as a generator, yielding the statistics of each generation as
+        soon as it completes. The run can be stopped by no longer iterating, after which it can be
+        continued by calling `run` or `iter_run` again.
 
-        for gen in range(self.generations):
-            # Evaluate fitness
-            fitness_scores = [
-                fitness(individual, self.distance_matrix) for individual in self.population
-            ]
+        When `telemetry_path` is set, each generation's statistics are also appended to it as a
+        line of JSON. A run resumed from a checkpoint appends the generations after the checkpoint
+        again, so readers should keep the last line of each generation.
+
+        Args:
+            until: The generation to stop at, capped at `generations` (default: None, runs to
+                `generations`).
+            measure_diversity: Whether the fraction of distinct tours is measured in each
+                generation's statistics. It is always measured when written to `telemetry_path`
+                or used to detect convergence, and is otherwise None when disabled (default:
+                True).
+
+        Yields:
+            The statistics of each generation.
+        """
+        self._start_time = time.time() - (self.computational_secs or 0.0)
+        until = self.generations if until is None else min(until, self.generations)
+        telemetry = None
+        if self.telemetry_path:
+            os.makedirs(os.path.dirname(self.telemetry_path) or ".", exist_ok=True)
+            telemetry = open(self.telemetry_path, 'a')
+        measure_diversity = measure_diversity or telemetry is not None \
+            or self.convergence_action is not None
 
-            self.avg_fitness_per_gen.append(sum(fitness_scores) / len(fitness_scores))
-            gen_best_fitness = min(fitness_scores)
-            self.best_fitness_per_gen.append(gen_best_fitness)
+        try:
+            while self.generation < until and not self.stopped_early:
+                generation = self.generation
+                phase_secs = dict.fromkeys(PHASES, 0.0)
 
-            if gen_best_fitness < self.best_distance:
-                self.best_distance = gen_best_fitness
-                self.best_solution = copy.deepcopy(
-                    self.population[fitness_scores.index(gen_best_fitness)]
+                # Evaluate fitness
+                start = time.perf_counter()
+                fitness_scores = self.evaluate()
+                self._lap(phase_secs, "evaluation", start)
+
+                avg_fitness = float(fitness_scores.mean())
+                std_fitness = float(fitness_scores.std())
+                gen_best_idx = int(np.argmin(fitness_scores))
+                gen_best_fitness = float(fitness_scores[gen_best_idx])
+                if self.keep_history:
+                    self.avg_fitness_per_gen.append(avg_fitness)
+                    self.best_fitness_per_gen.append(gen_best_fitness)
+
+                diversity = None
+                edge_entropy = None
+                if measure_diversity:
+                    # Tours are counted by a hash of their edges, as different tours can share a
+                    # length, especially with integer distances
+                    start = time.perf_counter()
+                    diversity = self.diversity.distinct_tours(self.population)
+                    if self.convergence_action is not None:
+                        edge_entropy = self.diversity.measure(self.population)
+                    self._lap(phase_secs, "diversity", start)
+
+                if gen_best_fitness < self.best_distance:
+                    self.best_distance = gen_best_fitness
+                    self.best_solution = self.population[gen_best_idx].tolist()
+                    self.no_improvement_count = 0
+                else:
+                    self.no_improvement_count += 1
+
+                # Count the generations for which the population has stayed converged without
+                # improving
+                if self.convergence_action is not None and self.no_improvement_count > 0 and (
+                    edge_entropy <= self.convergence_entropy
+                    or diversity <= self.convergence_distinct
+                ):
+                    self.stagnant_count += 1
+                else:
+                    self.stagnant_count = 0
+                stagnated = self.convergence_action in ("stop", "restart") \
+                    and self.stagnant_count >= self.convergence_patience
+
+                # Check for early stopping, or for convergence when it stops the run
+                if self.no_improvement_count >= self.early_stop_threshold:
+                    self.stopped_early = True
+                elif stagnated and self.convergence_action == "stop":
+                    self.stopped_early = True
+                    self.converged_generation = generation
+                else:
+                    # Breeding overwrites the evaluated generation, so its best individual is kept
+                    # to seed a restart
+                    best = self.population[gen_best_idx].copy() if stagnated else None
+                    self._breed(fitness_scores, phase_secs)
+                    if stagnated:
+                        start = time.perf_counter()
+                        self._restart(generation, best, gen_best_fitness)
+                        self._lap(phase_secs, "restart", start)
+                    self.generation += 1
+
+                    if self.checkpoint_path and self.generation % self.checkpoint_interval == 0:
+                        self.save_checkpoint(self.checkpoint_path)
+
+                stats = GenerationStats(
+                    generation,
+                    gen_best_fitness,
+                    avg_fitness,
+                    std_fitness,
+                    diversity,
+                    phase_secs,
+                    edge_entropy
                 )
-                self.no_improvement_count = 0
-            else:
-                self.no_improvement_count += 1
-
-            # Check for early stopping
-            if self.no_improvement_count >= self.early_stop_threshold:
-                break
-
-            # Elitism
-            elite_individuals = elitism(self.population, fitness_scores, self.elitism_count)
-
-            # Selection
-            parents = tournament_selection(
-                self.population,
-                fitness_scores,
-                self.tournament_size,
-                len(self.population) - self.elitism_count
+                if telemetry is not None:
+                    telemetry.write(json.dumps(stats._asdict()) + "\n")
+                    telemetry.flush()
+                yield stats
+        finally:
+            if telemetry is not None:
+                telemetry.close()
+            self.computational_secs = time.time() - self._start_time
+
+    def _breed(self, fitness_scores: np.ndarray, phase_secs: Dict[str, float]) -> None:
+        """
+        Builds the next generation from the evaluated population and makes it current.
+
+        Args:
+            fitness_scores: The fitness of each individual in the population.
+            phase_secs: The time spent in each phase of the generation, updated in-place.
+        """
+        start = time.perf_counter()
+
+        # Elitism and selection operate on indices, so individuals are only copied once, into
+        # the next generation's buffer, and cached fitness follows them
+        elite_indices = elitism_indices(fitness_scores, self.elitism_count)
+        start = self._lap(phase_secs, "elitism", start)
+
+        # Selection
+        parent_indices = tournament_indices(
+            fitness_scores,
+            self.tournament_size,
+            len(self.population) - self.elitism_count,
+            self.rng
+        )
+        start = self._lap(phase_secs, "tournament", start)
+
+        # Replacement
+        num_elites = len(elite_indices)
+        for indices, rows in ((elite_indices, slice(0, num_elites)),
+                              (parent_indices, slice(num_elites, None))):
+            np.take(self.population, indices, axis=0, out=self._next_population[rows])
+            np.take(fitness_scores, indices, out=self._next_scores[rows])
+            np.take(self.optimised, indices, out=self._next_optimised[rows])
+
+        self._swap_buffers()
+        self.diversity.select(np.concatenate([elite_indices, parent_indices]))
+        offspring_rows = slice(num_elites, None)
+        offspring = self.population[offspring_rows]
+        offspring_scores = self.fitness_scores[offspring_rows]
+        offspring_optimised = self.optimised[offspring_rows]
+        start = self._lap(phase_secs, "replacement", start)
+
+        # Crossover and mutation. Changed offspring are no longer locally optimal, and their
+        # diversity is measured again
+        crossed = self._crossover(offspring, offspring_scores)
+        offspring_optimised[crossed] = False
+        start = self._lap(phase_secs, "crossover", start)
+
+        mutated = self._mutate(offspring, offspring_scores)
+        offspring_optimised[mutated] = False
+        start = self._lap(phase_secs, "mutation", start)
+
+        self.diversity.invalidate(num_elites + crossed)
+        self.diversity.invalidate(num_elites + mutated)
+
+        # Local search
+        if self.local_search_mode == "offspring":
+            improved = self._improve(offspring, offspring_scores, offspring_optimised)
+            self.diversity.invalidate(num_elites + improved)
+            self._lap(phase_secs, "local_search", start)
+        elif self.local_search_mode == "elite":
+            elite_rows = slice(0, num_elites)
+            improved = self._improve(
+                self.population[elite_rows],
+                self.fitness_scores[elite_rows],
+                self.optimised[elite_rows]
             )
+            self.diversity.invalidate(improved)
+            self._lap(phase_secs, "local_search", start)
 
-            # Crossover
-            next_population = []
-            for i in range(0, len(parents) - 1, 2):
-                parent1, parent2 = parents[i], parents[i+1]
+    def _restart(self, generation: int, best: np.ndarray, best_fitness: float) -> None:
+        """
+        Replaces `restart_fraction` of the non-elite population with copies of random elite
+        individuals, each perturbed by `restart_inversions` random inversions. Without elitism,
+        the best individual of the converged generation is kept in the first row and copied
+        instead. Fitness follows from the change in tour length of each inversion, so the new
+        individuals need no evaluation. The count of generations without improvement carries on,
+        so a run whose restarts stop paying off still stops early at `early_stop_threshold`.
 
-                if random.random() < self.crossover_rate:
-                    child1, child2 = self.crossover_func(parent1, parent2)
-                else:
-                    child1, child2 = parent1, parent2
+        Args:
+            generation: The generation at which the population converged and stagnated.
+            best: The best individual of that generation.
+            best_fitness: The fitness of the best individual.
+        """
+        num_elites = self.elitism_count
+        if num_elites == 0:
+            self.population[0] = best
+            self.fitness_scores[0] = best_fitness
+            self.optimised[0] = False
+            self.diversity.invalidate(slice(0, 1))
+            num_elites = 1
+        count = int(self.restart_fraction * (len(self.population) - num_elites))
+        rows = slice(num_elites, num_elites + count)
+        sources = self.rng.integers(0, num_elites, count)
+        np.take(self.population, sources, axis=0, out=self.population[rows])
+        np.take(self.fitness_scores, sources, out=self.fitness_scores[rows])
 
-                next_population.extend([child1, child2])
+        batch_func, sampler = self._restart_mutation
+        individuals = self.population[rows]
+        for _ in range(self.restart_inversions):
+            params = sampler(self.rng, len(individuals), individuals.shape[1])
+            self.fitness_scores[rows] += batch_func(individuals, *params, self.distance_matrix)
+        self.optimised[rows] = False
+        self.diversity.invalidate(rows)
+        self.restarts.append(generation)
+        self.stagnant_count = 0
 
-            # Handle odd-lengths
-            if len(parents) % 2 == 1:
-                next_population.append(parents[-1])
+    @contextmanager
+    def _random_module(self) -> Iterator[None]:
+        """
+        Swaps the run's own state into the random module for the duration of a block, restoring
+        the caller's state afterwards.
 
-            # Mutation
-            for i in range(len(next_population)):
-                if random.random() < self.mutation_rate:
-                    self.mutation_func(next_population[i])
+        Yields:
+            None, once the run's state is in place.
+        """
+        outer_state = random.getstate()
+        random.setstate(self._random_state)
+        try:
+            yield
+        finally:
+            self._random_state = random.getstate()
+            random.setstate(outer_state)
 
-            # Replacement
-            self.population = elite_individuals + next_population
+    def _lap(self, phase_secs: Dict[str, float], phase: str, start: float) -> float:
+        """
+        Records the time spent in a phase since it started, in the generation's statistics and in
+        the profile when profiling is enabled.
 
-        self.computational_secs = time.time() - start_time
+        Args:
+            phase_secs: The time spent in each phase of the generation, updated in-place.
+            phase: The phase that has finished.
+            start: The `time.perf_counter` time at which the phase started.
 
-    def save_results(self, path: str) -> None:
+        Returns:
+            The time at which the phase finished, from which the next phase starts.
         """
-        Saves the results of the genetic algorithm to a JSON file.
+        now = time.perf_counter()
+        phase_secs[phase] = now - start
+        if self.profiler is not None:
+            self.profiler.record(phase, now - start)
+        return now
 
-        The results include computational time, best distance found, best solution, and average and
-        best fitness scores per generation.
+    def _swap_buffers(self) -> None:
+        """
+        Makes the next generation's buffers current, leaving the previous generation's buffers to
+        be overwritten by the following generation.
+        """
+        self.population, self._next_population = self._next_population, self.population
+        self.fitness_scores, self._next_scores = self._next_scores, self.fitness_scores
+        self.optimised, self._next_optimised = self._next_optimised, self.optimised
+
+    def evaluate(self) -> np.ndarray:
+        """
+        Evaluates the fitness of the population, skipping individuals whose cached fitness is still
+        valid.
+
+        Returns:
+            The fitness of each individual in the population.
+        """
+        unscored = np.flatnonzero(np.isnan(self.fitness_scores))
+        self.evaluation_counts["carried"] += len(self.fitness_scores) - len(unscored)
+        if len(unscored) == 0:
+            return self.fitness_scores
+
+        if self.fitness_cache is not None:
+            hashes = self.fitness_cache.hash_tours(self.population[unscored])
+            self.diversity.store_hashes(unscored, hashes)
+            scores = self.fitness_cache.lookup(hashes)
+            misses = np.flatnonzero(np.isnan(scores))
+            if len(misses) > 0:
+                scores[misses] = self._evaluate_population(
+                    self.population[unscored[misses]],
+                    self.distance_matrix
+                )
+                self.fitness_cache.store(hashes[misses], scores[misses])
+            self.fitness_scores[unscored] = scores
+            self.evaluation_counts["cached"] += len(unscored) - len(misses)
+            self.evaluation_counts["evaluated"] += len(misses)
+        else:
+            self.fitness_scores[unscored] = self._evaluate_population(
+                self.population[unscored],
+                self.distance_matrix
+            )
+            self.evaluation_counts["evaluated"] += len(unscored)
+        return self.fitness_scores
+
+    def emigrants(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Selects copies of the best individuals to migrate to another population.
 
         Args:
-            path: The file path where the results will be saved.
+            count: The number of individuals to select.
+
+        Returns:
+            A tuple containing the selected individuals, in the population's compact integer type,
+            and their fitness scores, best first.
+        """
+        fitness_scores = self.evaluate()
+        best = elitism_indices(fitness_scores, count)
+        return self.population[best], fitness_scores[best]
+
+    def immigrate(self, individuals: np.ndarray, scores: np.ndarray) -> None:
+        """
+        Replaces the worst individuals in the population with migrants. At most the non-elite part
+        of the population is replaced.
+
+        Args:
+            individuals: A 2-D integer array of migrants, best first.
+            scores: The fitness scores of the migrants.
+        """
+        count = min(len(individuals), len(self.population) - self.elitism_count)
+        if count <= 0:
+            return
+
+        worst = np.argpartition(self.evaluate(), len(self.population) - count)[-count:]
+        self.population[worst] = individuals[:count]
+        self.fitness_scores[worst] = scores[:count]
+        self.optimised[worst] = False
+        self.diversity.invalidate(worst)
+
+    def _crossover(self, parents: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """
+        Performs crossover in-place on consecutive pairs of parents, each with probability
+        `crossover_rate`. The cached fitness of offspring is invalidated, except where a batch
+        kernel is given identical parents, whose offspring are unchanged copies.
+
+        Args:
+            parents: A 2-D integer array of the selected parents, one per row.
+            scores: The cached fitness of each parent.
+
+        Returns:
+            The rows replaced by offspring.
+        """
+        num_pairs = len(parents) // 2
+        rows1 = 2 * np.flatnonzero(self.rng.random(num_pairs) < self.crossover_rate)
+        rows2 = rows1 + 1
+        if len(rows1) == 0:
+            return rows1
+
+        if self.batch_crossover is not None:
+            batch_func, sampler = self.batch_crossover
+            cut_points = sampler(self.rng, len(rows1), parents.shape[1])
+
+            # The batch kernels reproduce identical parents unchanged, which is common once the
+            # population converges, so those pairs are skipped and keep their fitness
+            differ = (parents[rows1] != parents[rows2]).any(axis=1)
+            rows1, rows2 = rows1[differ], rows2[differ]
+            cut_points = tuple(points[differ] for points in cut_points)
+            parents[rows1], parents[rows2] = batch_func(parents[rows1], parents[rows2], *cut_points)
+        else:
+            with self._random_module():
+                for row1, row2 in zip(rows1, rows2):
+                    parents[row1], parents[row2] = self.crossover_func(
+                        parents[row1].tolist(),
+                        parents[row2].tolist()
+                    )
+
+        scores[rows1] = np.nan
+        scores[rows2] = np.nan
+        return np.concatenate([rows1, rows2])
+
+    def _mutate(self, offspring: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """
+        Performs mutation in-place on each offspring with probability `mutation_rate`. Cached
+        fitness is updated from the change in tour length, and stays invalid for offspring that
+        still need evaluating.
+
+        Args:
+            offspring: A 2-D integer array of offspring, one per row.
+            scores: The cached fitness of each offspring, where NaN marks unevaluated offspring.
+
+        Returns:
+            The rows that were mutated.
+        """
+        rows = np.flatnonzero(self.rng.random(len(offspring)) < self.mutation_rate)
+        if len(rows) == 0:
+            return rows
+
+        if self.batch_mutation is not None:
+            batch_func, sampler = self.batch_mutation
+            mutated = offspring[rows]
+            params = sampler(self.rng, len(rows), offspring.shape[1])
+            scores[rows] += batch_func(mutated, *params, self.distance_matrix)
+            offspring[rows] = mutated
+        else:
+            with self._random_module():
+                for row in rows:
+                    individual = offspring[row].tolist()
+                    if self._mutation_takes_distances:
+                        delta = self.mutation_func(individual, self.distance_matrix)
+                    else:
+                        delta = self.mutation_func(individual)
+                    scores[row] = np.nan if delta is None else scores[row] + delta
+                    offspring[row] = individual
+        return rows
+
+    def _improve(
+        self,
+        individuals: np.ndarray,
+        scores: np.ndarray,
+        optimised: np.ndarray
+    ) -> np.ndarray:
+        """
+        Applies local search in-place to the individuals that are not yet locally optimal, updating
+        their cached fitness from the change in tour length.
+
+        Args:
+            individuals: A 2-D integer array of individuals, one per row.
+            scores: The cached fitness of each individual, where NaN marks unevaluated individuals.
+            optimised: Whether each individual is already locally optimal, updated in-place.
+
+        Returns:
+            The rows that local search was applied to.
+        """
+        rows = np.flatnonzero(~optimised)
+        for row in rows:
+            tour = individuals[row].tolist()
+            scores[row] += local_search(tour, self.distance_matrix, self.neighbours)
+            individuals[row] = tour
+            optimised[row] = True
+        return rows
+
+    def results(self) -> Dict[str, Any]:
+        """
+        Collects the results of the genetic algorithm.
+
+        The results include computational time, best distance found, best solution, and average and
+        best fitness scores per generation, how many fitness scores were carried over, found in
+        the fitness cache or evaluated, the profile of the run when profiling is enabled, and when
+        convergence is tracked, the generations at which the population converged and how many
+        diversity measurements were carried over.
+
+        Returns:
+            The results, in a JSON serialisable dictionary.
         """
         results = {
             "computational_secs": round(self.computational_secs, 4),
             "best_distance": round(self.best_distance, 4),
             "best_solution": self.best_solution,
             "avg_fitness_per_gen": [round(fitness, 4) for fitness in self.avg_fitness_per_gen],
-            "best_fitness_per_gen": [round(fitness, 4) for fitness in self.best_fitness_per_gen]
+            "best_fitness_per_gen": [round(fitness, 4) for fitness in self.best_fitness_per_gen],
+            "evaluations": self.evaluation_counts
+        }
+        if self.fitness_cache is not None:
+            results["fitness_cache"] = self.fitness_cache.stats()
+        if self.profiler is not None:
+            results["profile"] = self.profiler.summary()
+        if self.convergence_action is not None:
+            results["diversity"] = {
+                "converged_generation": self.converged_generation,
+                "restarts": self.restarts,
+                **self.diversity.stats()
+            }
+        return results
+
+    def save_results(self, path: str) -> None:
+        """
+        Saves the results of the genetic algorithm, as returned by `results`, to a JSON file.
+
+        Args:
+            path: The file path where the results will be saved.
+        """
+        save_json(path, self.results())
+
+    def save_checkpoint(self, path: str) -> None:
+        """
+        Saves the state of a run to a compressed binary file, from which `load_checkpoint` can
+        resume it.
+
+        The state includes the population and its cached fitness, the states of the random number
+        generators, the generation, no-improvement and convergence counters, the evaluation
+        counts, the fitness history and the generations of restarts, along with the run's
+        `settings`.
+
+        Args:
+            path: The file path where the checkpoint will be saved.
+        """
+        rng_states = {
+            "random": self._random_state,
+            "numpy": self.rng.bit_generator.state
         }
 
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'w') as file:
-            json.dump(results, file, indent=4)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as file:
+            np.savez_compressed(
+                file,
+                population=self.population,
+                fitness_scores=self.fitness_scores,
+                avg_fitness_per_gen=np.array(self.avg_fitness_per_gen, dtype=np.float64),
+                best_fitness_per_gen=np.array(self.best_fitness_per_gen, dtype=np.float64),
+                best_solution=np.array(self.best_solution or [], dtype=self.population.dtype),
+                counters=np.array(
+                    [
+                        self.generation,
+                        self.no_improvement_count,
+                        self.stopped_early,
+                        self.stagnant_count,
+                        -1 if self.converged_generation is None else self.converged_generation
+                    ],
+                    dtype=np.int64
+                ),
+                evaluation_counts=np.array(
+                    [self.evaluation_counts[key] for key in ("carried", "cached", "evaluated")],
+                    dtype=np.int64
+                ),
+                restarts=np.array(self.restarts, dtype=np.int64),
+                best_distance=np.float64(self.best_distance),
+                computational_secs=np.float64(time.time() - self._start_time),
+                rng_states=np.array(json.dumps(rng_states)),
+                settings=np.array(json.dumps(self.settings))
+            )
+        os.replace(tmp_path, path)
+
+    def load_checkpoint(self, path: str) -> None:
+        """
+        Restores the state of a run saved by `save_checkpoint`. The run is left unchanged if the
+        checkpoint cannot be resumed by it.
+
+        Args:
+            path: The file path of the checkpoint.
+
+        Raises:
+            ValueError: If the checkpoint's population does not match the shape of this run's, the
+                checkpoint was saved by a run with different `settings`, or it is already past
+                this run's `generations`.
+        """
+        with np.load(path) as checkpoint:
+            if checkpoint["population"].shape != self.population.shape:
+                raise ValueError(
+                    f"Checkpoint population shape {checkpoint['population'].shape} does not match "
+                    f"{self.population.shape}"
+                )
+            settings = json.loads(str(checkpoint["settings"])) if "settings" in checkpoint \
+                else None
+            if settings != self.settings:
+                raise ValueError(
+                    f"Checkpoint settings {settings} do not match the run's settings "
+                    f"{self.settings}"
+                )
+            if checkpoint["counters"][0] > self.generations:
+                raise ValueError(
+                    f"Checkpoint generation {checkpoint['counters'][0]} is past the run's "
+                    f"{self.generations} generations"
+                )
+
+            self.population[...] = checkpoint["population"]
+            self.fitness_scores[...] = checkpoint["fitness_scores"]
+            self.avg_fitness_per_gen = checkpoint["avg_fitness_per_gen"].tolist()
+            self.best_fitness_per_gen = checkpoint["best_fitness_per_gen"].tolist()
+            self.best_solution = checkpoint["best_solution"].tolist() or None
+            (
+                self.generation,
+                self.no_improvement_count,
+                stopped_early,
+                self.stagnant_count,
+                converged_generation
+            ) = checkpoint["counters"].tolist()
+            self.stopped_early = bool(stopped_early)
+            self.converged_generation = None if converged_generation < 0 else converged_generation
+            self.evaluation_counts = dict(zip(
+                ("carried", "cached", "evaluated"),
+                checkpoint["evaluation_counts"].tolist()
+            ))
+            self.optimised[...] = False
+            self.restarts = checkpoint["restarts"].tolist()
+            self.best_distance = float(checkpoint["best_distance"])
+            self.computational_secs = float(checkpoint["computational_secs"])
+            rng_states = json.loads(str(checkpoint["rng_states"]))
+
+        version, state, gauss = rng_states["random"]
+        self._random_state = (version, tuple(state), gauss)
+        self.rng.bit_generator.state = rng_states["numpy"]
+        self.diversity.invalidate(slice(None))
+
+
+def _accepts_distances(func: Callable[..., Any]) -> bool:
+    """
+    Checks whether a mutation function accepts the distance matrix as a second argument, as
+    functions written for the original one-argument contract do not.
+
+    Args:
+        func: The mutation function.
+
+    Returns:
+        True if the function accepts a second positional argument, otherwise False.
+    """
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    positional = [
+        parameter for parameter in parameters
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)
+    ]
+    return len(positional) >= 2 or any(
+        parameter.kind == parameter.VAR_POSITIONAL for parameter in parameters
+    )
@@ -1,12 +1,30 @@
 import random
-from typing import List
+import numpy as np
+from typing import List, Tuple, Callable, Optional, Union
+from src.ga.spatial import SpatialGrid
+
+
+def population_dtype(num_cities: int) -> np.dtype:
+    """
+    Chooses the smallest integer type that can hold every city index, used to store populations
+    compactly.
+
+    Args:
+        num_cities: The total number of cities.
+
+    Returns:
+        `np.int16` if every city index fits in 16 bits, otherwise `np.int32`.
+    """
+    return np.dtype(np.int16 if num_cities <= np.iinfo(np.int16).max + 1 else np.int32)
 
 
 def init_population(
     population_size: int,
     num_cities: int,
-    distance_matrix: List[List[float]],
-    greedy_rate: float
+    distance_matrix: np.ndarray,
+    greedy_rate: float,
+    coords: Optional[Union[List[Tuple[float, float]], np.ndarray]] = None,
+    greedy_func: Optional[Callable[[int, np.ndarray], List[int]]] = None
 ) -> List[List[int]]:
     """
     Initialises a population of individuals (solutions) for a genetic algorithm. Each individual
@@ -18,15 +36,24 @@ def init_population(
         num_cities: The total number of cities.
         distance_matrix: A square matrix representing the distances between each pair of cities.
         greedy_rate: The probability of initialising an individual with a greedy heuristic.
+        coords: The coordinates of each city. When given, greedy individuals are built with
+            `spatial_greedy_heuristic` instead of scanning the distance matrix (default: None).
+        greedy_func: The function building greedy individuals from the distance matrix, or None
+            for `greedy_heuristic` (default: None).
 
     Returns:
         A list of individuals, where each individual is a list of city indices.
     """
+    greedy_func = greedy_func or greedy_heuristic
     population = []
+    grid = SpatialGrid(coords) if coords is not None and greedy_rate > 0 else None
 
     for _ in range(population_size):
         if random.random() < greedy_rate:
-            individual = greedy_heuristic(num_cities, distance_matrix)
+            if grid is not None:
+                individual = spatial_greedy_heuristic(grid)
+            else:
+                individual = greedy_func(num_cities, distance_matrix)
         else:
             individual = random.sample(range(num_cities), num_cities)
 
@@ -34,27 +61,72 @@ def init_population(
     return population
 
 
-def greedy_heuristic(num_cities: int, distance_matrix: List[List[float]]) -> List[int]:
+def greedy_heuristic(num_cities: int, distance_matrix: np.ndarray) -> List[int]:
     """
     Generates a solution to the Traveling Salesman Problem (TSP) using a greedy heuristic. The
     heuristic selects the nearest unvisited city at each step, starting from a random city.
 
+    When the distance provider keeps each city's nearest neighbours, the nearest unvisited city is
+    taken from them where possible, and a whole row of distances is only scanned once every
+    neighbour has been visited.
+
     Args:
         num_cities: The total number of cities.
-        distance_matrix: A square matrix representing the distances between each pair of cities.
+        distance_matrix: A square matrix representing the distances between each pair of cities,
+            or a distance provider with the same indexing.
+
+    Returns:
+        A list of city indicies representing an individual.
+    """
+    neighbours = getattr(distance_matrix, "neighbours", None)
+    visited = np.zeros(num_cities, dtype=bool)
+    start_city = random.randrange(num_cities)
+    path = [start_city]
+    visited[start_city] = True
+
+    curr_city = start_city
+    for _ in range(num_cities - 1):
+        if neighbours is not None:
+            candidates = neighbours[curr_city]
+            candidates = candidates[~visited[candidates]]
+            if len(candidates) > 0:
+                next_city = int(candidates[0])
+                path.append(next_city)
+                visited[next_city] = True
+                curr_city = next_city
+                continue
+
+        distances = np.where(visited, np.inf, distance_matrix[curr_city])
+        next_city = int(np.argmin(distances))
+        path.append(next_city)
+        visited[next_city] = True
+        curr_city = next_city
+    return path
+
+
+def spatial_greedy_heuristic(grid: SpatialGrid) -> List[int]:
+    """
+    Generates a solution to the Traveling Salesman Problem (TSP) using the same nearest-neighbour
+    heuristic as `greedy_heuristic`, but finds each nearest unvisited city with a spatial index
+    over the coordinates, so a tour costs close to O(n) rather than O(n^2) operations.
+
+    Distances are Euclidean distances between the coordinates.
+
+    Args:
+        grid: A spatial index over the coordinates of every city, which is left unchanged.
 
     Returns:
         A list of city indicies representing an individual.
     """
-    cities = set(range(num_cities))
-    start_city = random.choice(list(cities))
+    unvisited = grid.copy()
+    start_city = random.randrange(unvisited.size)
     path = [start_city]
-    cities.remove(start_city)
+    unvisited.remove(start_city)
 
     curr_city = start_city
-    while cities:
-        next_city = min(cities, key=lambda city: distance_matrix[curr_city][city])
+    while unvisited.size > 0:
+        next_city = unvisited.nearest(curr_city)
         path.append(next_city)
-        cities.remove(next_city)
+        unvisited.remove(next_city)
         curr_city = next_city
     return path
@@ -0,0 +1,292 @@
+import time
+import numpy as np
+import multiprocessing as mp
+from multiprocessing.connection import Connection
+from typing import List, Tuple, Dict, Any, Optional
+from src.ga.fitness import compute_distance_matrix
+from src.ga.genetic_algorithm import GeneticAlgorithm
+from src.utils.file_utils import save_json
+from src.utils.shared_memory import SharedArraySpec, share_array, attach_array
+
+
+def ring_topology(num_islands: int) -> List[List[int]]:
+    """
+    Builds a ring migration topology, where each island sends migrants to the next island.
+
+    Args:
+        num_islands: The number of islands.
+
+    Returns:
+        A list containing the destination islands of each island.
+    """
+    return [[(i + 1) % num_islands] for i in range(num_islands)] if num_islands > 1 else [[]]
+
+
+def fully_connected_topology(num_islands: int) -> List[List[int]]:
+    """
+    Builds a fully connected migration topology, where each island sends migrants to every other
+    island.
+
+    Args:
+        num_islands: The number of islands.
+
+    Returns:
+        A list containing the destination islands of each island.
+    """
+    return [[j for j in range(num_islands) if j != i] for i in range(num_islands)]
+
+
+TOPOLOGIES = {
+    "ring": ring_topology,
+    "fully_connected": fully_connected_topology
+}
+
+
+class IslandModel:
+    """
+    An island-model genetic algorithm, where several populations evolve independently in their own
+    processes and periodically exchange their best individuals.
+
+    The island model is used directly as a library, for a single configuration, rather than
+    through `run_ga` or its sweeps, which already spread configurations across processes.
+    """
+    def __init__(
+        self,
+        coords: List[Tuple[float, float]],
+        num_islands: int,
+        migration_interval: int,
+        migration_size: int,
+        ga_kwargs: Dict[str, Any],
+        topology: str = "ring",
+        seed: Optional[int] = None,
+        distance_matrix: Optional[np.ndarray] = None
+    ):
+        """
+        Initialises the island model.
+
+        Args:
+            coords: The coordinates of the cities to be visited.
+            num_islands: The number of islands (populations), each evolved in its own process.
+            migration_interval: The number of generations between migrations.
+            migration_size: The number of best individuals each island sends per migration.
+            ga_kwargs: The keyword arguments of the `GeneticAlgorithm` evolving each island, e.g.
+                `population_size`, `crossover_func` and `generations`.
+            topology: The migration topology, one of `TOPOLOGIES` (default: "ring").
+            seed: The seed from which each island's seed is derived, or None for a random seed
+                (default: None).
+            distance_matrix: A precomputed distance matrix to use instead of computing one from
+                `coords` (default: None).
+
+        Raises:
+            ValueError: If the topology is unknown.
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology '{topology}', expected one of {list(TOPOLOGIES)}")
+
+        self.coords = coords
+        self.num_islands = num_islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.ga_kwargs = ga_kwargs
+        self.destinations = TOPOLOGIES[topology](num_islands)
+        self.generations = ga_kwargs["generations"]
+
+        # Distinct seeds per island, as forked processes would otherwise share random state
+        self.island_seeds = np.random.SeedSequence(seed).generate_state(num_islands).tolist()
+
+        if distance_matrix is None:
+            distance_matrix = compute_distance_matrix(coords)
+        self.distance_matrix = distance_matrix
+
+        self.avg_fitness_per_gen = []
+        self.best_fitness_per_gen = []
+        self.best_distance = float("inf")
+        self.best_solution = None
+        self.island_best_distances = []
+        self.computational_secs = None
+
+    def run(self) -> None:
+        """
+        Runs the island model.
+
+        Each island evolves for `migration_interval` generations, then sends copies of its best
+        individuals to its destination islands as integer arrays, where they replace the worst
+        individuals. This repeats until every island has reached `generations` or stopped early.
+        Islands that have stopped early still send migrants, but no longer receive them.
+        """
+        start_time = time.time()
+        shm, matrix_spec = share_array(self.distance_matrix)
+        processes, connections = [], []
+
+        try:
+            for island_seed in self.island_seeds:
+                parent_conn, child_conn = mp.Pipe()
+                process = mp.Process(
+                    target=_island_worker,
+                    args=(
+                        child_conn,
+                        self.coords,
+                        matrix_spec,
+                        self.ga_kwargs,
+                        island_seed,
+                        self.migration_size
+                    ),
+                    daemon=True
+                )
+                process.start()
+                child_conn.close()
+                processes.append(process)
+                connections.append(parent_conn)
+
+            generation = 0
+            while True:
+                generation = min(generation + self.migration_interval, self.generations)
+                for conn in connections:
+                    conn.send(("evolve", generation))
+                replies = [conn.recv() for conn in connections]
+
+                if generation >= self.generations or all(done for _, _, done in replies):
+                    break
+                self._migrate(connections, replies)
+
+            for conn in connections:
+                conn.send(("results",))
+            self._collect_results([conn.recv() for conn in connections])
+        finally:
+            for conn in connections:
+                try:
+                    conn.send(("stop",))
+                except (BrokenPipeError, OSError):
+                    pass
+                conn.close()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            shm.close()
+            shm.unlink()
+
+        self.computational_secs = time.time() - start_time
+
+    def _migrate(
+        self,
+        connections: List[Connection],
+        replies: List[Tuple[np.ndarray, np.ndarray, bool]]
+    ) -> None:
+        """
+        Sends each island's emigrants to its destination islands along the topology, skipping
+        destinations that are done, as they would never evolve the migrants.
+
+        Args:
+            connections: The connection to each island's process.
+            replies: The emigrants, their fitness scores and whether the island is done, per
+                island.
+        """
+        incoming = [[] for _ in connections]
+        for source, destinations in enumerate(self.destinations):
+            for destination in destinations:
+                incoming[destination].append(source)
+
+        for destination, sources in enumerate(incoming):
+            if not sources or replies[destination][2]:
+                continue
+
+            individuals = np.concatenate([replies[source][0] for source in sources])
+            scores = np.concatenate([replies[source][1] for source in sources])
+            order = np.argsort(scores, kind="stable")
+            connections[destination].send(("immigrate", individuals[order], scores[order]))
+
+    def _collect_results(self, island_results: List[Dict[str, Any]]) -> None:
+        """
+        Combines the results of every island, taking the best fitness across islands and the mean
+        of the islands' average fitness in each generation.
+
+        Args:
+            island_results: The results of each island.
+        """
+        num_gens = max(len(results["best_fitness_per_gen"]) for results in island_results)
+        for gen in range(num_gens):
+            gen_results = [
+                results for results in island_results
+                if gen < len(results["best_fitness_per_gen"])
+            ]
+            self.best_fitness_per_gen.append(
+                min(results["best_fitness_per_gen"][gen] for results in gen_results)
+            )
+            self.avg_fitness_per_gen.append(
+                sum(results["avg_fitness_per_gen"][gen] for results in gen_results)
+                / len(gen_results)
+            )
+
+        self.island_best_distances = [results["best_distance"] for results in island_results]
+        best = min(island_results, key=lambda results: results["best_distance"])
+        self.best_distance = best["best_distance"]
+        self.best_solution = best["best_solution"]
+
+    def save_results(self, path: str) -> None:
+        """
+        Saves the combined results of the island model to a JSON file, in the same format as
+        `GeneticAlgorithm.save_results` plus the best distance of each island.
+
+        Args:
+            path: The file path where the results will be saved.
+        """
+        results = {
+            "computational_secs": round(self.computational_secs, 4),
+            "best_distance": round(self.best_distance, 4),
+            "best_solution": self.best_solution,
+            "island_best_distances": [round(dist, 4) for dist in self.island_best_distances],
+            "avg_fitness_per_gen": [round(fitness, 4) for fitness in self.avg_fitness_per_gen],
+            "best_fitness_per_gen": [round(fitness, 4) for fitness in self.best_fitness_per_gen]
+        }
+        save_json(path, results)
+
+
+def _island_worker(
+    conn: Connection,
+    coords: List[Tuple[float, float]],
+    matrix_spec: SharedArraySpec,
+    ga_kwargs: Dict[str, Any],
+    seed: int,
+    migration_size: int
+) -> None:
+    """
+    Evolves a single island in a worker process, following commands from the island model.
+
+    Args:
+        conn: The connection to the island model.
+        coords: The coordinates of the cities to be visited.
+        matrix_spec: The description of the shared distance matrix.
+        ga_kwargs: The keyword arguments of the island's `GeneticAlgorithm`.
+        seed: The seed of the island.
+        migration_size: The number of best individuals sent per migration.
+    """
+    shm, distance_matrix = attach_array(matrix_spec)
+    ga = GeneticAlgorithm(coords, distance_matrix=distance_matrix, seed=seed, **ga_kwargs)
+
+    try:
+        while True:
+            command, *args = conn.recv()
+
+            if command == "evolve":
+                ga.run(until=args[0])
+                individuals, scores = ga.emigrants(migration_size)
+                done = ga.stopped_early or ga.generation >= ga.generations
+                conn.send((individuals, scores, done))
+            elif command == "immigrate":
+                ga.immigrate(*args)
+            elif command == "results":
+                conn.send({
+                    "best_distance": ga.best_distance,
+                    "best_solution": ga.best_solution,
+                    "avg_fitness_per_gen": ga.avg_fitness_per_gen,
+                    "best_fitness_per_gen": ga.best_fitness_per_gen
+                })
+            elif command == "stop":
+                break
+    except EOFError:
+        pass
+    finally:
+        del ga, distance_matrix
+        conn.close()
+        shm.close()
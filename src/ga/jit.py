@@ -0,0 +1,426 @@
+import random
+import numpy as np
+from typing import List, Tuple, Callable, Optional
+from src.ga.crossover import order_crossover, partially_mapped_crossover, random_cut_points
+from src.ga.mutation import inversion_mutation, relocation_mutation, random_relocations
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Whether the kernels below are compiled. Without Numba they remain plain Python functions, which
+# are correct but far slower than the vectorised NumPy kernels, so they are only used when compiled
+JIT_AVAILABLE = numba is not None
+
+
+def jit(func: Callable) -> Callable:
+    """
+    Compiles a function to machine code with Numba if it is installed, caching the compiled code
+    on disk so that later processes, e.g. sweep workers, load it instead of compiling it again.
+
+    Args:
+        func: The function to compile, restricted to the subset of Python and NumPy Numba supports.
+
+    Returns:
+        The compiled function, or the function unchanged if Numba is not installed.
+    """
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+@jit
+def _tour_lengths(population: np.ndarray, distance_matrix: np.ndarray) -> np.ndarray:
+    """
+    Sums the distances along each tour, including the return to its starting city.
+    """
+    num_rows, num_cities = population.shape
+    scores = np.empty(num_rows, dtype=np.float64)
+    for row in range(num_rows):
+        total = 0.0
+        for i in range(num_cities - 1):
+            total += distance_matrix[population[row, i], population[row, i + 1]]
+        scores[row] = total + distance_matrix[population[row, num_cities - 1], population[row, 0]]
+    return scores
+
+
+@jit
+def _fill_order_child(
+    child: np.ndarray,
+    segment_parent: np.ndarray,
+    fill_parent: np.ndarray,
+    start: int,
+    end: int,
+    in_segment: np.ndarray
+) -> None:
+    """
+    Fills one order crossover child, with `in_segment` as scratch space.
+    """
+    n = len(child)
+    in_segment[:] = False
+    for i in range(start, end):
+        child[i] = segment_parent[i]
+        in_segment[segment_parent[i]] = True
+
+    position = end
+    for i in range(end, end + n):
+        gene = fill_parent[i % n]
+        if not in_segment[gene]:
+            child[position % n] = gene
+            position += 1
+
+
+@jit
+def _order_crossover_rows(
+    parents1: np.ndarray,
+    parents2: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Performs order crossover on each pair of rows.
+    """
+    children1 = np.empty_like(parents1)
+    children2 = np.empty_like(parents2)
+    in_segment = np.zeros(parents1.shape[1], dtype=np.bool_)
+    for row in range(parents1.shape[0]):
+        start, end = starts[row], ends[row]
+        _fill_order_child(children1[row], parents1[row], parents2[row], start, end, in_segment)
+        _fill_order_child(children2[row], parents2[row], parents1[row], start, end, in_segment)
+    return children1, children2
+
+
+@jit
+def _fill_pmx_child(
+    child: np.ndarray,
+    segment_parent: np.ndarray,
+    fill_parent: np.ndarray,
+    start: int,
+    end: int,
+    in_segment: np.ndarray,
+    mapping: np.ndarray
+) -> None:
+    """
+    Fills one partially mapped crossover child, with `in_segment` and `mapping` as scratch space.
+    """
+    n = len(child)
+    in_segment[:] = False
+    for i in range(start, end):
+        gene = segment_parent[i]
+        in_segment[gene] = True
+        mapping[gene] = fill_parent[i]
+
+    for i in range(n):
+        if start <= i < end:
+            child[i] = segment_parent[i]
+        else:
+            gene = fill_parent[i]
+            while in_segment[gene]:
+                gene = mapping[gene]
+            child[i] = gene
+
+
+@jit
+def _partially_mapped_crossover_rows(
+    parents1: np.ndarray,
+    parents2: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Performs partially mapped crossover on each pair of rows.
+    """
+    children1 = np.empty_like(parents1)
+    children2 = np.empty_like(parents2)
+    n = parents1.shape[1]
+    in_segment = np.zeros(n, dtype=np.bool_)
+    mapping = np.zeros(n, dtype=np.int64)
+    for row in range(parents1.shape[0]):
+        start, end = starts[row], ends[row]
+        _fill_pmx_child(
+            children1[row], parents2[row], parents1[row], start, end, in_segment, mapping
+        )
+        _fill_pmx_child(
+            children2[row], parents1[row], parents2[row], start, end, in_segment, mapping
+        )
+    return children1, children2
+
+
+@jit
+def _inversion_rows(
+    population: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    distance_matrix: np.ndarray,
+    deltas: np.ndarray
+) -> None:
+    """
+    Reverses a subpath of each row, writing the changes in tour length to `deltas` unless it
+    is empty.
+    """
+    n = population.shape[1]
+    for row in range(population.shape[0]):
+        start, end = starts[row], ends[row]
+        tour = population[row]
+        if len(deltas) > 0:
+            if end - start + 1 >= n:
+                deltas[row] = 0.0
+            else:
+                prev_city, next_city = tour[(start - 1) % n], tour[(end + 1) % n]
+                deltas[row] = (
+                    distance_matrix[prev_city, tour[end]] + distance_matrix[tour[start], next_city]
+                    - distance_matrix[prev_city, tour[start]]
+                    - distance_matrix[tour[end], next_city]
+                )
+
+        i, j = start, end
+        while i < j:
+            tour[i], tour[j] = tour[j], tour[i]
+            i += 1
+            j -= 1
+
+
+@jit
+def _relocation_rows(
+    population: np.ndarray,
+    starts: np.ndarray,
+    lengths: np.ndarray,
+    insert_positions: np.ndarray,
+    distance_matrix: np.ndarray,
+    deltas: np.ndarray
+) -> None:
+    """
+    Relocates a subpath of each row, writing the changes in tour length to `deltas` unless it
+    is empty.
+    """
+    n = population.shape[1]
+    original = np.empty(n, dtype=population.dtype)
+    for row in range(population.shape[0]):
+        start, length, insert_position = starts[row], lengths[row], insert_positions[row]
+        tour = population[row]
+        original[:] = tour
+
+        # Maps an index in the partial tour without the subpath to an index in the original, as
+        # in `batch_relocation_mutation`
+        remaining = max(n - length, 1)
+        before_index = (insert_position - 1) % remaining
+        after_index = insert_position % remaining
+        before_index = before_index if before_index < start else (before_index + length) % n
+        after_index = after_index if after_index < start else (after_index + length) % n
+
+        if len(deltas) > 0:
+            if length >= n:
+                deltas[row] = 0.0
+            else:
+                prev_city = original[(start - 1) % n]
+                next_city = original[(start + length) % n]
+                first, last = original[start], original[start + length - 1]
+                before, after = original[before_index], original[after_index]
+                deltas[row] = (
+                    distance_matrix[prev_city, next_city]
+                    - distance_matrix[prev_city, first] - distance_matrix[last, next_city]
+                    + distance_matrix[before, first] + distance_matrix[last, after]
+                    - distance_matrix[before, after]
+                )
+
+        for position in range(n):
+            if position < insert_position:
+                source = position if position < start else (position + length) % n
+            elif position < insert_position + length:
+                source = start + position - insert_position
+            else:
+                source = position - length
+                source = source if source < start else (source + length) % n
+            tour[position] = original[source]
+
+
+@jit
+def _greedy_path(start_city: int, distance_matrix: np.ndarray) -> np.ndarray:
+    """
+    Builds a nearest neighbour tour from a starting city.
+    """
+    num_cities = distance_matrix.shape[0]
+    visited = np.zeros(num_cities, dtype=np.bool_)
+    path = np.empty(num_cities, dtype=np.int64)
+    path[0] = start_city
+    visited[start_city] = True
+
+    curr_city = start_city
+    for step in range(1, num_cities):
+        next_city = -1
+        best_distance = np.inf
+        for city in range(num_cities):
+            if visited[city]:
+                continue
+            if next_city < 0 or distance_matrix[curr_city, city] < best_distance:
+                next_city = city
+                best_distance = distance_matrix[curr_city, city]
+        path[step] = next_city
+        visited[next_city] = True
+        curr_city = next_city
+    return path
+
+
+def jit_evaluate_population(population: np.ndarray, distance_matrix: np.ndarray) -> np.ndarray:
+    """
+    Compiled equivalent of `evaluate_population`, calculating the total distance of every tour in
+    a population.
+
+    Args:
+        population: A 2-D integer array where each row is an individual.
+        distance_matrix: A square matrix representing the distances between each pair of cities.
+
+    Returns:
+        A 1-D array of the total distance of each tour.
+    """
+    return _tour_lengths(np.asarray(population), np.asarray(distance_matrix))
+
+
+def jit_batch_order_crossover(
+    parents1: np.ndarray,
+    parents2: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compiled equivalent of `batch_order_crossover`, performing order crossover (OX) on every pair
+    of rows in two parent arrays.
+
+    Args:
+        parents1: A 2-D integer array where each row is a first parent.
+        parents2: A 2-D integer array where each row is a second parent.
+        starts: The start cut index of each row.
+        ends: The end cut index of each row.
+
+    Returns:
+        A tuple containing the two arrays of child individuals.
+    """
+    return _order_crossover_rows(parents1, parents2, starts, ends)
+
+
+def jit_batch_partially_mapped_crossover(
+    parents1: np.ndarray,
+    parents2: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compiled equivalent of `batch_partially_mapped_crossover`, performing partially mapped
+    crossover (PMX) on every pair of rows in two parent arrays.
+
+    Args:
+        parents1: A 2-D integer array where each row is a first parent.
+        parents2: A 2-D integer array where each row is a second parent.
+        starts: The start cut index of each row.
+        ends: The end cut index of each row.
+
+    Returns:
+        A tuple containing the two arrays of child individuals.
+    """
+    return _partially_mapped_crossover_rows(parents1, parents2, starts, ends)
+
+
+def jit_batch_inversion_mutation(
+    population: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    distance_matrix: Optional[np.ndarray] = None
+) -> Optional[np.ndarray]:
+    """
+    Compiled equivalent of `batch_inversion_mutation`, reversing the subpath from `starts[i]` to
+    `ends[i]` (inclusive) of each row i.
+
+    Args:
+        population: A 2-D integer array where each row is an individual.
+        starts: The index of the first city in each reversed subpath.
+        ends: The index of the last city in each reversed subpath.
+        distance_matrix: A square matrix representing the distances between each pair of cities
+            (default: None).
+
+    Returns:
+        The change in tour length of each row if `distance_matrix` is given, otherwise None. The
+        mutation is applied in-place.
+    """
+    matrix, deltas = _delta_buffers(len(population), distance_matrix)
+    _inversion_rows(population, starts, ends, matrix, deltas)
+    return deltas if distance_matrix is not None else None
+
+
+def jit_batch_relocation_mutation(
+    population: np.ndarray,
+    starts: np.ndarray,
+    lengths: np.ndarray,
+    insert_positions: np.ndarray,
+    distance_matrix: Optional[np.ndarray] = None
+) -> Optional[np.ndarray]:
+    """
+    Compiled equivalent of `batch_relocation_mutation`, removing the subpath of `lengths[i]`
+    cities at `starts[i]` of each row i and reinserting it before `insert_positions[i]` of the
+    remaining cities.
+
+    Args:
+        population: A 2-D integer array where each row is an individual.
+        starts: The index of the first city in each relocated subpath.
+        lengths: The number of cities in each relocated subpath.
+        insert_positions: The index in each remaining partial tour the subpath is inserted before.
+        distance_matrix: A square matrix representing the distances between each pair of cities
+            (default: None).
+
+    Returns:
+        The change in tour length of each row if `distance_matrix` is given, otherwise None. The
+        mutation is applied in-place.
+    """
+    matrix, deltas = _delta_buffers(len(population), distance_matrix)
+    _relocation_rows(population, starts, lengths, insert_positions, matrix, deltas)
+    return deltas if distance_matrix is not None else None
+
+
+def jit_greedy_heuristic(num_cities: int, distance_matrix: np.ndarray) -> List[int]:
+    """
+    Compiled equivalent of `greedy_heuristic`, building a tour by moving to the nearest unvisited
+    city at each step from a random starting city.
+
+    Args:
+        num_cities: The total number of cities.
+        distance_matrix: A square matrix representing the distances between each pair of cities.
+
+    Returns:
+        A list of city indicies representing an individual.
+    """
+    start_city = random.randrange(num_cities)
+    return _greedy_path(start_city, np.asarray(distance_matrix)).tolist()
+
+
+def _delta_buffers(
+    num_rows: int,
+    distance_matrix: Optional[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Prepares the distance matrix and the array of tour length changes passed to a mutation kernel,
+    with empty placeholders when no distance matrix is given, as compiled kernels take no None
+    arguments.
+
+    Args:
+        num_rows: The number of rows being mutated.
+        distance_matrix: The distance matrix, or None.
+
+    Returns:
+        A tuple containing the distance matrix and the array the changes are written to.
+    """
+    if distance_matrix is None:
+        return np.zeros((1, 1)), np.empty(0)
+    return np.asarray(distance_matrix), np.empty(num_rows)
+
+
+# Compiled equivalents of the batch crossover and mutation kernels, with the same samplers, used by
+# the genetic algorithm with the "numba" backend
+JIT_BATCH_CROSSOVER_FUNCS = {
+    order_crossover: (jit_batch_order_crossover, random_cut_points),
+    partially_mapped_crossover: (jit_batch_partially_mapped_crossover, random_cut_points)
+}
+
+JIT_BATCH_MUTATION_FUNCS = {
+    inversion_mutation: (jit_batch_inversion_mutation, random_cut_points),
+    relocation_mutation: (jit_batch_relocation_mutation, random_relocations)
+}
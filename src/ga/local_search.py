@@ -0,0 +1,297 @@
+import numpy as np
+from collections import deque
+from typing import List
+from src.ga.fitness import BLOCK_ELEMENTS
+
+# Minimum improvement for a move to be applied, guarding against cycling on rounding errors
+_EPSILON = 1e-9
+
+
+def neighbour_lists(distance_matrix: np.ndarray, k: int) -> np.ndarray:
+    """
+    Finds the K nearest neighbours of every city, used as the candidate moves of local search.
+    Neighbours already kept by a distance provider are reused when there are enough of them.
+
+    Args:
+        distance_matrix: A square matrix representing the distances between each pair of cities,
+            or a distance provider with the same indexing.
+        k: The number of neighbours per city, capped at the number of other cities.
+
+    Returns:
+        A 2-D integer array where row i holds the neighbours of city i, nearest first.
+    """
+    num_cities = len(distance_matrix)
+    k = min(k, num_cities - 1)
+    cached = getattr(distance_matrix, "neighbours", None)
+    if cached is not None and cached.shape[1] >= k:
+        return cached[:, :k]
+
+    neighbours = np.empty((num_cities, k), dtype=np.int32)
+    if k <= 0:
+        return neighbours
+
+    block_rows = max(1, BLOCK_ELEMENTS // num_cities)
+    for start in range(0, num_cities, block_rows):
+        end = min(start + block_rows, num_cities)
+        rows = np.arange(start, end)
+
+        distances = np.array(distance_matrix[start:end], dtype=np.float64)
+        distances[rows - start, rows] = np.inf
+
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1, kind="stable")
+        neighbours[start:end] = np.take_along_axis(nearest, order, axis=1)
+    return neighbours
+
+
+def two_opt(tour: List[int], distance_matrix: np.ndarray, neighbours: List[List[int]]) -> float:
+    """
+    Improves a tour in-place with 2-opt moves until no improving move remains.
+
+    Only moves that connect a city to one of its candidate neighbours are tried, and don't-look
+    bits skip cities whose surroundings have not changed since they last failed to improve, so a
+    pass costs close to O(n * K) rather than O(n^2).
+
+    Args:
+        tour: A list of city indicies representing an individual.
+        distance_matrix: A square matrix representing the distances between each pair of cities.
+        neighbours: The candidate neighbours of each city, nearest first.
+
+    Returns:
+        The change in tour length.
+    """
+    n = len(tour)
+    if n < 4:
+        return 0.0
+
+    dist = distance_matrix.item
+    pos = [0] * n
+    for i, city in enumerate(tour):
+        pos[city] = i
+
+    queue = deque(tour)
+    queued = [True] * n
+    total_delta = 0.0
+
+    while queue:
+        a = queue.popleft()
+        queued[a] = False
+
+        for forward in (True, False):
+            i = pos[a]
+            b = tour[(i + 1) % n] if forward else tour[i - 1]
+            d_ab = dist(a, b)
+            move = None
+
+            for c in neighbours[a]:
+                d_ac = dist(a, c)
+                if d_ac >= d_ab:
+                    break
+
+                j = pos[c]
+                d = tour[(j + 1) % n] if forward else tour[j - 1]
+                if c == b or d == a:
+                    continue
+
+                delta = d_ac + dist(b, d) - d_ab - dist(c, d)
+                if delta < -_EPSILON:
+                    move = (c, d, delta)
+                    break
+
+            if move is None:
+                continue
+
+            c, d, delta = move
+            # Replace edges (a, b) and (c, d) with (a, c) and (b, d) by reversing b..c (forward)
+            # or a..d (backward)
+            if forward:
+                _reverse(tour, pos, pos[b], pos[c])
+            else:
+                _reverse(tour, pos, pos[a], pos[d])
+            total_delta += delta
+
+            for city in (a, b, c, d):
+                if not queued[city]:
+                    queued[city] = True
+                    queue.append(city)
+            break
+
+    return total_delta
+
+
+def or_opt(tour: List[int], distance_matrix: np.ndarray, neighbours: List[List[int]]) -> float:
+    """
+    Improves a tour in-place with Or-opt moves, relocating segments of one to three cities next to
+    one of their candidate neighbours (in either orientation), until no improving move remains.
+    Don't-look bits skip cities whose surroundings have not changed.
+
+    Args:
+        tour: A list of city indicies representing an individual.
+        distance_matrix: A square matrix representing the distances between each pair of cities.
+        neighbours: The candidate neighbours of each city, nearest first.
+
+    Returns:
+        The change in tour length.
+    """
+    n = len(tour)
+    if n < 5:
+        return 0.0
+
+    dist = distance_matrix.item
+    pos = [0] * n
+    for i, city in enumerate(tour):
+        pos[city] = i
+
+    queue = deque(tour)
+    queued = [True] * n
+    total_delta = 0.0
+
+    while queue:
+        a = queue.popleft()
+        queued[a] = False
+        move = None
+
+        for segment_length in (1, 2, 3):
+            i = pos[a]
+            segment = [tour[(i + t) % n] for t in range(segment_length)]
+            last = segment[-1]
+            prev_city, next_city = tour[i - 1], tour[(i + segment_length) % n]
+            removal_gain = dist(prev_city, a) + dist(last, next_city) - dist(prev_city, next_city)
+
+            for c in neighbours[a]:
+                d_ac = dist(a, c)
+                if d_ac >= removal_gain:
+                    break
+                if c in segment:
+                    continue
+
+                j = pos[c]
+                # Insert as e, last..a, c (reversed) or as c, a..last, f, keeping a next to c
+                e, f = tour[j - 1], tour[(j + 1) % n]
+                if e not in segment:
+                    delta = dist(e, last) + d_ac - dist(e, c) - removal_gain
+                    if delta < -_EPSILON:
+                        move = (segment, e, segment[::-1], delta)
+                        break
+                if f not in segment:
+                    delta = d_ac + dist(last, f) - dist(c, f) - removal_gain
+                    if delta < -_EPSILON:
+                        move = (segment, c, segment, delta)
+                        break
+
+            if move is not None:
+                break
+
+        if move is None:
+            continue
+
+        segment, after, inserted, delta = move
+        touched = (
+            tour[pos[a] - 1],
+            tour[(pos[a] + len(segment)) % n],
+            after,
+            tour[(pos[after] + 1) % n]
+        )
+        _relocate(tour, pos, segment, after, inserted)
+        total_delta += delta
+
+        for city in (*segment, *touched):
+            if not queued[city]:
+                queued[city] = True
+                queue.append(city)
+
+    return total_delta
+
+
+def local_search(
+    tour: List[int],
+    distance_matrix: np.ndarray,
+    neighbours: List[List[int]]
+) -> float:
+    """
+    Improves a tour in-place by alternating 2-opt and Or-opt until neither finds an improving move.
+
+    Args:
+        tour: A list of city indicies representing an individual.
+        distance_matrix: A square matrix representing the distances between each pair of cities.
+        neighbours: The candidate neighbours of each city, nearest first.
+
+    Returns:
+        The change in tour length.
+    """
+    total_delta = two_opt(tour, distance_matrix, neighbours)
+    while True:
+        delta = or_opt(tour, distance_matrix, neighbours)
+        if delta == 0.0:
+            return total_delta
+        total_delta += delta + two_opt(tour, distance_matrix, neighbours)
+
+
+def _reverse(tour: List[int], pos: List[int], i: int, j: int) -> None:
+    """
+    Reverses the cyclic subpath of a tour from position i to position j (inclusive). If the
+    complement of the subpath is shorter, it is reversed instead, which gives the same cycle
+    traversed in the opposite direction, so a move costs at most n / 2 swaps.
+
+    Args:
+        tour: A list of city indicies representing an individual.
+        pos: The position of each city in the tour, updated in-place.
+        i: The position of the first city in the subpath.
+        j: The position of the last city in the subpath.
+    """
+    n = len(tour)
+    length = (j - i) % n + 1
+    if 2 * length > n:
+        i, j, length = (j + 1) % n, (i - 1) % n, n - length
+    for _ in range(length // 2):
+        city_i, city_j = tour[i], tour[j]
+        tour[i], tour[j] = city_j, city_i
+        pos[city_j], pos[city_i] = i, j
+        i = i + 1 if i < n - 1 else 0
+        j = j - 1 if j > 0 else n - 1
+
+
+def _relocate(
+    tour: List[int],
+    pos: List[int],
+    segment: List[int],
+    after: int,
+    inserted: List[int]
+) -> None:
+    """
+    Removes a segment from a tour and reinserts it, in the given orientation, after a city. Only
+    the cities between the segment and its new place are shifted over it, on whichever side of the
+    segment there are fewer of them.
+
+    Args:
+        tour: A list of city indicies representing an individual.
+        pos: The position of each city in the tour, updated in-place.
+        segment: The cities of the segment, in tour order.
+        after: The city the segment is inserted after.
+        inserted: The cities of the segment in the order they are inserted.
+    """
+    n = len(tour)
+    m = len(segment)
+    start = pos[segment[0]]
+    after_pos = pos[after]
+    forward = (after_pos - start - m) % n + 1
+    backward = n - m - forward
+
+    if forward <= backward:
+        # The cities from the end of the segment up to `after` move back over it
+        for k in range(start, start + forward):
+            city = tour[(k + m) % n]
+            tour[k % n] = city
+            pos[city] = k % n
+        first = start + forward
+    else:
+        # The cities between `after` and the segment move forward over it, last first
+        for k in range(after_pos + backward, after_pos, -1):
+            city = tour[k % n]
+            tour[(k + m) % n] = city
+            pos[city] = (k + m) % n
+        first = after_pos + 1
+
+    for k, city in enumerate(inserted, first):
+        tour[k % n] = city
+        pos[city] = k % n
@@ -1,37 +1,314 @@
 import random
-from typing import List
+import numpy as np
+from typing import List, Optional, Tuple
+from src.ga.crossover import random_cut_points
 
 
-def inversion_mutation(individual: List[int]) -> None:
+def inversion_mutation(
+    individual: List[int],
+    distance_matrix: Optional[np.ndarray] = None
+) -> Optional[float]:
     """
     Applies inversion mutation to an individual by reversing a randomly selected subpath.
 
+    Reversing a subpath only breaks the two edges at its ends and creates two new ones, so the
+    change in tour length is found in constant time when a distance matrix is given.
+
     Args:
         individual: A list of city indicies representing an individual.
+        distance_matrix: A square matrix representing the distances between each pair of cities
+            (default: None).
 
     Returns:
-        None. The mutation is applied in-place.
+        The change in tour length if `distance_matrix` is given, otherwise None. The mutation is
+        applied in-place.
     """
     start, end = sorted(random.sample(range(len(individual)), 2))
+
+    delta = None
+    if distance_matrix is not None:
+        delta = inversion_delta(individual, start, end, distance_matrix)
+
     individual[start:end+1] = reversed(individual[start:end+1])
+    return delta
 
 
-def relocation_mutation(individual: List[int]) -> None:
+def relocation_mutation(
+    individual: List[int],
+    distance_matrix: Optional[np.ndarray] = None
+) -> Optional[float]:
     """
     Applies relocation mutation to an individual by relocating a randomly selected subpath to a new
     position.
 
+    Relocating a subpath only breaks and creates three edges, so the change in tour length is found
+    in constant time when a distance matrix is given.
+
     Args:
         individual: A list of city indicies representing an individual.
+        distance_matrix: A square matrix representing the distances between each pair of cities
+            (default: None).
 
     Returns:
-        None. The mutation is applied in-place.
+        The change in tour length if `distance_matrix` is given, otherwise None. The mutation is
+        applied in-place.
     """
     subpath_length = random.randint(1, len(individual))
     start = random.randint(0, len(individual) - subpath_length)
 
+    delta = None
+    if distance_matrix is not None:
+        delta = removal_delta(individual, start, subpath_length, distance_matrix)
+
     subpath = individual[start:start + subpath_length]
     del individual[start:start + subpath_length]
 
     insert_pos = random.randint(0, len(individual))
+
+    if distance_matrix is not None:
+        delta += insertion_delta(individual, subpath, insert_pos, distance_matrix)
+
     individual[insert_pos:insert_pos] = subpath
+    return delta
+
+
+def inversion_delta(
+    individual: List[int],
+    start: int,
+    end: int,
+    distance_matrix: np.ndarray
+) -> float:
+    """
+    Computes the change in tour length caused by reversing the subpath `individual[start:end+1]`.
+
+    Args:
+        individual: A list of city indicies representing an individual.
+        start: The index of the first city in the subpath.
+        end: The index of the last city in the subpath.
+        distance_matrix: A square matrix representing the distances between each pair of cities.
+
+    Returns:
+        The tour length after the reversal minus the tour length before it.
+    """
+    n = len(individual)
+    if end - start + 1 >= n:
+        # Reversing the whole tour traverses the same edges in the opposite direction
+        return 0.0
+
+    prev_city = individual[start - 1]
+    next_city = individual[(end + 1) % n]
+    first, last = individual[start], individual[end]
+
+    return float(
+        distance_matrix[prev_city, last] + distance_matrix[first, next_city]
+        - distance_matrix[prev_city, first] - distance_matrix[last, next_city]
+    )
+
+
+def removal_delta(
+    individual: List[int],
+    start: int,
+    subpath_length: int,
+    distance_matrix: np.ndarray
+) -> float:
+    """
+    Computes the change in tour length caused by removing a subpath and joining its neighbours.
+
+    Args:
+        individual: A list of city indicies representing an individual.
+        start: The index of the first city in the subpath.
+        subpath_length: The number of cities in the subpath.
+        distance_matrix: A square matrix representing the distances between each pair of cities.
+
+    Returns:
+        The length of the remaining tour minus the length of the full tour, excluding the internal
+        edges of the subpath.
+    """
+    n = len(individual)
+    if subpath_length >= n:
+        return 0.0
+
+    prev_city = individual[start - 1]
+    next_city = individual[(start + subpath_length) % n]
+    first, last = individual[start], individual[start + subpath_length - 1]
+
+    return float(
+        distance_matrix[prev_city, next_city]
+        - distance_matrix[prev_city, first] - distance_matrix[last, next_city]
+    )
+
+
+def insertion_delta(
+    individual: List[int],
+    subpath: List[int],
+    insert_pos: int,
+    distance_matrix: np.ndarray
+) -> float:
+    """
+    Computes the change in tour length caused by inserting a subpath before `insert_pos`.
+
+    Args:
+        individual: A list of city indicies representing a partial tour without the subpath.
+        subpath: The list of city indicies to insert.
+        insert_pos: The index in `individual` the subpath is inserted before.
+        distance_matrix: A square matrix representing the distances between each pair of cities.
+
+    Returns:
+        The length of the tour after the insertion minus the length of the partial tour, excluding
+        the internal edges of the subpath.
+    """
+    n = len(individual)
+    if n == 0:
+        return 0.0
+
+    prev_city = individual[insert_pos - 1]
+    next_city = individual[insert_pos % n]
+
+    return float(
+        distance_matrix[prev_city, subpath[0]] + distance_matrix[subpath[-1], next_city]
+        - distance_matrix[prev_city, next_city]
+    )
+
+
+def random_relocations(
+    rng: np.random.Generator,
+    num_rows: int,
+    n: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Draws the subpath start, subpath length and insertion position of a relocation per row, with
+    the same distribution as `relocation_mutation`.
+
+    Args:
+        rng: The random number generator.
+        num_rows: The number of rows to draw relocations for.
+        n: The number of cities in each individual.
+
+    Returns:
+        A tuple of arrays containing the start, length and insertion position of each row.
+    """
+    lengths = rng.integers(1, n + 1, size=num_rows)
+    starts = rng.integers(0, n - lengths + 1)
+    insert_positions = rng.integers(0, n - lengths + 1)
+    return starts, lengths, insert_positions
+
+
+def batch_inversion_mutation(
+    population: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    distance_matrix: Optional[np.ndarray] = None
+) -> Optional[np.ndarray]:
+    """
+    Applies inversion mutation to every row of a population at once, reversing the subpath from
+    `starts[i]` to `ends[i]` (inclusive) of row i.
+
+    Args:
+        population: A 2-D integer array where each row is an individual.
+        starts: The index of the first city in each reversed subpath.
+        ends: The index of the last city in each reversed subpath.
+        distance_matrix: A square matrix representing the distances between each pair of cities
+            (default: None).
+
+    Returns:
+        The change in tour length of each row if `distance_matrix` is given, otherwise None. The
+        mutation is applied in-place.
+    """
+    m, n = population.shape
+    rows = np.arange(m)
+
+    deltas = None
+    if distance_matrix is not None:
+        prev_cities = population[rows, starts - 1]
+        next_cities = population[rows, (ends + 1) % n]
+        first, last = population[rows, starts], population[rows, ends]
+
+        deltas = (
+            distance_matrix[prev_cities, last] + distance_matrix[first, next_cities]
+            - distance_matrix[prev_cities, first] - distance_matrix[last, next_cities]
+        ).astype(np.float64)
+        deltas[ends - starts + 1 >= n] = 0.0
+
+    positions = np.arange(n)
+    in_subpath = (positions >= starts[:, None]) & (positions <= ends[:, None])
+    source = np.where(in_subpath, starts[:, None] + ends[:, None] - positions, positions)
+    population[:] = population[rows[:, None], source]
+    return deltas
+
+
+def batch_relocation_mutation(
+    population: np.ndarray,
+    starts: np.ndarray,
+    lengths: np.ndarray,
+    insert_positions: np.ndarray,
+    distance_matrix: Optional[np.ndarray] = None
+) -> Optional[np.ndarray]:
+    """
+    Applies relocation mutation to every row of a population at once. Row i has its subpath of
+    `lengths[i]` cities at `starts[i]` removed and reinserted before `insert_positions[i]` of the
+    remaining cities.
+
+    Args:
+        population: A 2-D integer array where each row is an individual.
+        starts: The index of the first city in each relocated subpath.
+        lengths: The number of cities in each relocated subpath.
+        insert_positions: The index in each remaining partial tour the subpath is inserted before.
+        distance_matrix: A square matrix representing the distances between each pair of cities
+            (default: None).
+
+    Returns:
+        The change in tour length of each row if `distance_matrix` is given, otherwise None. The
+        mutation is applied in-place.
+    """
+    m, n = population.shape
+    rows = np.arange(m)
+
+    def remaining_to_source(k: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        # Maps an index in the partial tour without the subpath to an index in the original
+        return np.where(k < starts, k, k + lengths) % n
+
+    deltas = None
+    if distance_matrix is not None:
+        prev_cities = population[rows, starts - 1]
+        next_cities = population[rows, (starts + lengths) % n]
+        first, last = population[rows, starts], population[rows, starts + lengths - 1]
+
+        remaining = np.maximum(n - lengths, 1)
+        before = population[rows, remaining_to_source(
+            (insert_positions - 1) % remaining, starts, lengths
+        )]
+        after = population[rows, remaining_to_source(
+            insert_positions % remaining, starts, lengths
+        )]
+
+        deltas = (
+            distance_matrix[prev_cities, next_cities]
+            - distance_matrix[prev_cities, first] - distance_matrix[last, next_cities]
+            + distance_matrix[before, first] + distance_matrix[last, after]
+            - distance_matrix[before, after]
+        ).astype(np.float64)
+        deltas[lengths >= n] = 0.0
+
+    positions = np.arange(n)
+    starts, lengths = starts[:, None], lengths[:, None]
+    insert_positions = insert_positions[:, None]
+
+    source = np.where(
+        positions < insert_positions,
+        remaining_to_source(positions, starts, lengths),
+        np.where(
+            positions < insert_positions + lengths,
+            starts + positions - insert_positions,
+            remaining_to_source(positions - lengths, starts, lengths)
+        )
+    )
+    population[:] = population[rows[:, None], source]
+    return deltas
+
+
+# Batch equivalents of the mutation functions and the samplers for their random parameters, used
+# by the genetic algorithm when available
+BATCH_MUTATION_FUNCS = {
+    inversion_mutation: (batch_inversion_mutation, random_cut_points),
+    relocation_mutation: (batch_relocation_mutation, random_relocations)
+}
@@ -0,0 +1,69 @@
+import numpy as np
+from collections import OrderedDict
+from typing import Tuple, Dict, Hashable, Any, Optional
+
+
+class PopulationCache:
+    """
+    A bounded cache of initial populations, evicting the least recently used population when full.
+
+    Populations are keyed by everything that determines them for a given instance: the population
+    size, greedy rate, seed and whether greedy individuals are built spatially. The state of the
+    `random` module after building each population is kept alongside it, so a run starting from
+    a cached population continues exactly as if it had built the population itself. A cache must
+    only be shared between runs on the same instance.
+    """
+    def __init__(self, max_size: int = 8):
+        """
+        Initialises an empty cache.
+
+        Args:
+            max_size: The maximum number of populations in the cache (default: 8).
+        """
+        self.max_size = max_size
+        self.populations: "OrderedDict[Hashable, Tuple[np.ndarray, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[np.ndarray, Any]]:
+        """
+        Looks up a population, marking it as recently used.
+
+        Args:
+            key: The key of the population.
+
+        Returns:
+            A tuple containing a copy of the population and the state of the `random` module
+            after it was built, or None if it is not in the cache.
+        """
+        entry = self.populations.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.populations.move_to_end(key)
+        self.hits += 1
+        population, random_state = entry
+        return population.copy(), random_state
+
+    def put(self, key: Hashable, population: np.ndarray, random_state: Any) -> None:
+        """
+        Adds a population to the cache, evicting the least recently used population if it is full.
+
+        Args:
+            key: The key of the population.
+            population: The population.
+            random_state: The state of the `random` module after the population was built.
+        """
+        self.populations[key] = (population.copy(), random_state)
+        self.populations.move_to_end(key)
+        if len(self.populations) > self.max_size:
+            self.populations.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Summarises how effective the cache has been.
+
+        Returns:
+            The number of hits and misses, and the number of populations in the cache.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.populations)}
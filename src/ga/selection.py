@@ -1,6 +1,7 @@
-import random
 import copy
-from typing import List
+import random
+import numpy as np
+from typing import List, Optional
 
 
 def elitism(
@@ -17,13 +18,11 @@ def elitism(
         elitism_count: The number of individuals to select.
 
     Returns:
-        A list of the top `elitism_count` individuals.
+        A list of copies of the top `elitism_count` individuals.
     """
     return [
-        copy.deepcopy(population[i]) for i in sorted(
-            range(len(fitness_scores)),
-            key=lambda j: fitness_scores[j]
-        )[:elitism_count]
+        copy.deepcopy(population[i])
+        for i in elitism_indices(np.asarray(fitness_scores), elitism_count).tolist()
     ]
 
 
@@ -38,6 +37,8 @@ def tournament_selection(
     a winner among a random sample of individuals based on their fitness scores. This is repeated
     for a specified number of rounds.
 
+    Tournaments are drawn from the `random` module's state, so seeding it reproduces them.
+
     Args:
         population: A list of individuals.
         fitness_scores: A list of fitness scores associated with each individual in the population.
@@ -46,10 +47,86 @@ def tournament_selection(
 
     Returns:
         A list of individuals selected through tournament selection.
+
+    Raises:
+        ValueError: If the tournament size is larger than the population.
+    """
+    rng = np.random.default_rng(random.getrandbits(64))
+    winners = tournament_indices(np.asarray(fitness_scores), tournament_size, num_rounds, rng)
+    return [population[i] for i in winners.tolist()]
+
+
+def elitism_indices(fitness_scores: np.ndarray, elitism_count: int) -> np.ndarray:
+    """
+    Selects the top `elitism_count` individuals by index, as `elitism` does without copying the
+    population.
+
+    Only the top individuals are partitioned out and sorted, rather than the whole population.
+
+    Args:
+        fitness_scores: The fitness scores associated with each individual in the population.
+        elitism_count: The number of individuals to select.
+
+    Returns:
+        An array of the indices of the top `elitism_count` individuals, best first.
+    """
+    fitness_scores = np.asarray(fitness_scores)
+    elitism_count = min(max(elitism_count, 0), len(fitness_scores))
+    if elitism_count == 0:
+        return np.empty(0, dtype=np.intp)
+
+    top = np.argpartition(fitness_scores, elitism_count - 1)[:elitism_count]
+    return top[np.argsort(fitness_scores[top], kind="stable")]
+
+
+def tournament_indices(
+    fitness_scores: np.ndarray,
+    tournament_size: int,
+    num_rounds: int,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
     """
-    selected = []
-    for _ in range(num_rounds):
-        competitors = random.sample(list(zip(population, fitness_scores)), tournament_size)
-        winner = min(competitors, key=lambda competitor: competitor[1])
-        selected.append(winner[0])
-    return selected
+    Selects individuals by index using tournament selection, as `tournament_selection` does without
+    copying the population.
+
+    The competitors of every round are drawn at once, each round sampling distinct individuals.
+
+    Args:
+        fitness_scores: The fitness scores associated with each individual in the population.
+        tournament_size: The number of individuals randomly selected for each tournament.
+        num_rounds: The number of rounds of tournament selection to perform.
+        rng: The random number generator (default: None, uses a new generator).
+
+    Returns:
+        An array of the indices of the individuals selected through tournament selection.
+
+    Raises:
+        ValueError: If the tournament size is larger than the population.
+    """
+    fitness_scores = np.asarray(fitness_scores)
+    population_size = len(fitness_scores)
+    if tournament_size > population_size:
+        raise ValueError("Tournament size is larger than the population")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    if 2 * tournament_size > population_size:
+        # Large tournaments take the smallest of random keys per round
+        keys = rng.random((num_rounds, population_size))
+        competitors = np.argpartition(keys, tournament_size - 1, axis=1)[:, :tournament_size]
+    else:
+        # Small tournaments redraw the rare rounds that sampled an individual twice
+        competitors = rng.integers(0, population_size, size=(num_rounds, tournament_size))
+        while tournament_size > 1:
+            ordered = np.sort(competitors, axis=1)
+            repeated = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+            if len(repeated) == 0:
+                break
+            competitors[repeated] = rng.integers(
+                0,
+                population_size,
+                size=(len(repeated), tournament_size)
+            )
+
+    winners = np.argmin(fitness_scores[competitors], axis=1)
+    return competitors[np.arange(num_rounds), winners]
@@ -0,0 +1,185 @@
+import math
+import numpy as np
+from typing import List, Tuple, Optional, Union
+
+
+class SpatialGrid:
+    """
+    A grid index over city coordinates that supports nearest-neighbour queries and the removal of
+    cities, e.g. to find the nearest unvisited city when constructing a tour.
+
+    Column and row boundaries are placed at quantiles of the x and y coordinates, so clustered
+    instances still spread their cities over many cells.
+    """
+    def __init__(
+        self,
+        coords: Union[List[Tuple[float, float]], np.ndarray],
+        cities_per_cell: float = 2.0
+    ):
+        """
+        Initialises the grid with every city.
+
+        Args:
+            coords: The coordinates of each city.
+            cities_per_cell: The average number of cities per cell (default: 2.0).
+        """
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        num_cities = len(coords)
+        num_cells = max(1, int(math.ceil(math.sqrt(num_cities / cities_per_cell))))
+        quantiles = np.linspace(0, 1, num_cells + 1)
+
+        col_edges = np.quantile(coords[:, 0], quantiles) if num_cities else np.zeros(2)
+        row_edges = np.quantile(coords[:, 1], quantiles) if num_cities else np.zeros(2)
+        self.num_cols = self.num_rows = num_cells
+        self.col_edges = col_edges.tolist()
+        self.row_edges = row_edges.tolist()
+
+        self.xs = coords[:, 0].tolist()
+        self.ys = coords[:, 1].tolist()
+        self.city_cols = np.searchsorted(col_edges[1:-1], coords[:, 0], side="right").tolist()
+        self.city_rows = np.searchsorted(row_edges[1:-1], coords[:, 1], side="right").tolist()
+        self.cells = [[] for _ in range(self.num_cols * self.num_rows)]
+        for city, (col, row) in enumerate(zip(self.city_cols, self.city_rows)):
+            self.cells[col * self.num_rows + row].append(city)
+        self.size = num_cities
+
+    def copy(self) -> "SpatialGrid":
+        """
+        Copies the grid, sharing the immutable coordinates but not the cell contents.
+
+        Returns:
+            A copy of the grid that can have cities removed independently.
+        """
+        grid = SpatialGrid.__new__(SpatialGrid)
+        grid.__dict__.update(self.__dict__)
+        grid.cells = [list(cell) for cell in self.cells]
+        return grid
+
+    def remove(self, city: int) -> None:
+        """
+        Removes a city from the grid.
+
+        Args:
+            city: The city to remove.
+        """
+        self.cells[self.city_cols[city] * self.num_rows + self.city_rows[city]].remove(city)
+        self.size -= 1
+
+    def nearest(self, city: int) -> Optional[int]:
+        """
+        Finds the nearest city remaining in the grid to a city, by searching rings of cells around
+        the city's cell until no closer city can exist.
+
+        Args:
+            city: The city to search from, which need not be in the grid.
+
+        Returns:
+            The nearest remaining city other than `city`, or None if there is none.
+        """
+        x, y = self.xs[city], self.ys[city]
+        col, row = self.city_cols[city], self.city_rows[city]
+        best_city, best_dist = None, math.inf
+        max_radius = max(self.num_cols, self.num_rows)
+
+        for radius in range(max_radius + 1):
+            for cell in self._ring(col, row, radius):
+                for other in cell:
+                    if other == city:
+                        continue
+                    dist = math.hypot(self.xs[other] - x, self.ys[other] - y)
+                    if dist < best_dist:
+                        best_city, best_dist = other, dist
+
+            # Every city outside the searched box is at least as far as the box's nearest side
+            if best_dist <= self._box_clearance(x, y, col, row, radius):
+                break
+        return best_city
+
+    def k_nearest(self, city: int, k: int) -> List[int]:
+        """
+        Finds the k nearest cities remaining in the grid to a city, by searching rings of cells
+        around the city's cell until no closer city can exist.
+
+        Args:
+            city: The city to search from, which need not be in the grid.
+            k: The number of cities to find.
+
+        Returns:
+            Up to k of the nearest remaining cities other than `city`, nearest first.
+        """
+        x, y = self.xs[city], self.ys[city]
+        col, row = self.city_cols[city], self.city_rows[city]
+        candidates = []
+        max_radius = max(self.num_cols, self.num_rows)
+
+        for radius in range(max_radius + 1):
+            for cell in self._ring(col, row, radius):
+                candidates.extend(
+                    (math.hypot(self.xs[other] - x, self.ys[other] - y), other)
+                    for other in cell if other != city
+                )
+
+            # Every city outside the searched box is at least as far as the box's nearest side
+            if len(candidates) >= k:
+                candidates.sort()
+                if candidates[k - 1][0] <= self._box_clearance(x, y, col, row, radius):
+                    break
+        candidates.sort()
+        return [other for _, other in candidates[:k]]
+
+    def _box_clearance(self, x: float, y: float, col: int, row: int, radius: int) -> float:
+        """
+        Computes the distance from a point to the nearest side of the box of cells within a
+        Chebyshev distance of its cell, ignoring sides on the boundary of the grid.
+
+        Args:
+            x: The x coordinate of the point.
+            y: The y coordinate of the point.
+            col: The column of the point's cell.
+            row: The row of the point's cell.
+            radius: The distance of the box's outer ring in cells.
+
+        Returns:
+            A lower bound on the distance to any city outside the box.
+        """
+        clearance = math.inf
+        if col - radius > 0:
+            clearance = min(clearance, x - self.col_edges[col - radius])
+        if col + radius + 1 < self.num_cols:
+            clearance = min(clearance, self.col_edges[col + radius + 1] - x)
+        if row - radius > 0:
+            clearance = min(clearance, y - self.row_edges[row - radius])
+        if row + radius + 1 < self.num_rows:
+            clearance = min(clearance, self.row_edges[row + radius + 1] - y)
+        return clearance
+
+    def _ring(self, col: int, row: int, radius: int) -> List[List[int]]:
+        """
+        Collects the non-empty cells on the square ring at a Chebyshev distance from a cell.
+
+        Args:
+            col: The column of the centre cell.
+            row: The row of the centre cell.
+            radius: The distance of the ring in cells.
+
+        Returns:
+            The non-empty cells on the ring within the grid.
+        """
+        if radius == 0:
+            cell = self.cells[col * self.num_rows + row]
+            return [cell] if cell else []
+
+        cells = []
+        row_min, row_max = max(row - radius, 0), min(row + radius, self.num_rows - 1)
+        for ring_col in (col - radius, col + radius):
+            if 0 <= ring_col < self.num_cols:
+                base = ring_col * self.num_rows
+                cells.extend(self.cells[base + r] for r in range(row_min, row_max + 1))
+
+        col_min, col_max = max(col - radius + 1, 0), min(col + radius - 1, self.num_cols - 1)
+        for ring_row in (row - radius, row + radius):
+            if 0 <= ring_row < self.num_rows:
+                cells.extend(
+                    self.cells[c * self.num_rows + ring_row] for c in range(col_min, col_max + 1)
+                )
+        return [cell for cell in cells if cell]
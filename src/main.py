@@ -1,10 +1,24 @@
 import os
-from typing import List, Callable, Tuple
-from src.utils.file_utils import load_tsplib
-from src.ga.genetic_algorithm import GeneticAlgorithm
+import numpy as np
+from typing import List, Callable, Tuple, Optional
+from src.ga.fitness import compute_distance_matrix
+from src.utils.tsplib import load_instance
+from src.ga.population_cache import PopulationCache
 from src.ga.crossover import order_crossover, partially_mapped_crossover
 from src.ga.mutation import inversion_mutation, relocation_mutation
-from src.utils.analysis import analyse_results
+from src.utils.sweep import (
+    sweep_configs,
+    results_path,
+    is_complete,
+    run_config,
+    run_parallel_sweep,
+    run_racing_sweep
+)
+
+# How distances are computed from a dataset: "euclidean" for exact Euclidean distances between
+# its coordinates, or "tsplib" for the distances defined by its edge weight type, with TSPLIB's
+# integer rounding
+DISTANCE_METRICS = ("euclidean", "tsplib")
 
 
 def run_ga(
@@ -16,12 +30,25 @@ def run_ga(
         Callable[[List[int], List[int]], Tuple[List[int], List[int]]]
     ] = [order_crossover, partially_mapped_crossover],
     mutation_rates: List[float] = [0.05, 0.1, 0.2],
-    mutation_funcs: List[Callable[[List[int]], None]] = [inversion_mutation, relocation_mutation],
+    mutation_funcs: List[
+        Callable[[List[int], Optional[np.ndarray]], Optional[float]]
+    ] = [inversion_mutation, relocation_mutation],
     elitism_rate: float = 0.05,
     tournament_size: int = 3,
     generations: int = 3000,
     greedy_rate: float = 0.05,
-    early_stop_threshold: int = 100
+    early_stop_threshold: int = 100,
+    workers: int = 1,
+    resume: bool = True,
+    checkpoint_interval: Optional[int] = None,
+    telemetry: bool = False,
+    profile: Optional[str] = None,
+    racing_min_generations: Optional[int] = None,
+    racing_keep_fraction: float = 0.5,
+    results_store: bool = False,
+    seed: Optional[int] = None,
+    distance_metric: str = "euclidean",
+    distance_dtype: np.dtype = np.float64
 ) -> None:
     """
     Runs a genetic algorithm on a dataset for various combinations of population sizes, crossover
@@ -44,38 +71,142 @@ def run_ga(
             default: 0.05).
         early_stop_threshold: The number of generations without improvement before stopping (
             default: 100).
+        workers: The number of processes to run configurations across. With more than one, the
+            distance matrix is shared between worker processes (default: 1).
+        resume: Whether to skip configurations that already have a completed results file (default:
+            True).
+        checkpoint_interval: The number of generations between checkpoints of each run, so that an
+            interrupted run resumes mid-run, or None to disable checkpointing (default: None).
+        telemetry: Whether the statistics of each generation are streamed to a `.telemetry.jsonl`
+            file next to each results file while it runs, so progress can be followed live
+            (default: False).
+        profile: What is profiled in each run and saved with its results, "phases" or
+            "operators", or None to disable profiling (default: None).
+        racing_min_generations: The generation budget of the first round of a successive halving
+            race between configurations, where only the best `racing_keep_fraction` continue to
+            each next, geometrically larger budget, or None to run every configuration to
+            `generations` (default: None).
+        racing_keep_fraction: The fraction of configurations kept after each round of a race
+            (default: 0.5).
+        results_store: Whether results are added as rows of a single `results.db` store in the
+            dataset's results directory, rather than saved as one JSON file per configuration
+            (default: False).
+        seed: The seed of every run. Seeded configurations with the same population size start
+            from the same initial population, which is built once and then reused. Unseeded runs
+            each build their own, so the population cache only pays off with a seed (default:
+            None).
+        distance_metric: How distances are computed, one of `DISTANCE_METRICS`. Runs with the
+            "tsplib" metric optimise a different objective, so their results are kept apart, in
+            a `<dataset>-tsplib` results directory (default: "euclidean").
+        distance_dtype: The floating point type of the distance matrix (default: `np.float64`).
+
+    Raises:
+        ValueError: If the distance metric is unknown, or the dataset has no coordinates for
+            Euclidean distances.
     """
-    coords = load_tsplib(os.path.join(curr_dir, f"data/datasets/{dataset}.tsp"))
+    if distance_metric not in DISTANCE_METRICS:
+        raise ValueError(
+            f"Unknown distance metric '{distance_metric}', expected one of {DISTANCE_METRICS}"
+        )
+
+    # The instance is parsed once and cached, so later runs map its distance matrix from disk
+    instance = load_instance(
+        os.path.join(curr_dir, f"data/datasets/{dataset}.tsp"),
+        distance_matrix=distance_metric == "tsplib"
+    )
+    coords = instance.coords
+    if distance_metric == "tsplib":
+        distance_matrix = instance.distance_matrix.astype(distance_dtype, copy=False)
+    elif coords is None:
+        raise ValueError(
+            f"Dataset '{dataset}' has no coordinates for Euclidean distances, use the 'tsplib' "
+            "distance metric"
+        )
+    else:
+        distance_matrix = compute_distance_matrix(coords, distance_dtype)
+    results_name = dataset if distance_metric == "euclidean" else f"{dataset}-{distance_metric}"
+
+    configs = sweep_configs(
+        population_sizes,
+        crossover_rates,
+        mutation_rates,
+        crossover_funcs,
+        mutation_funcs
+    )
+    paths = [results_path(curr_dir, results_name, config) for config in configs]
+    store_path = os.path.join(curr_dir, f"data/results/{results_name}/results.db") \
+        if results_store else None
 
-    for population_size in population_sizes:
-        for crossover_rate in crossover_rates:
-            for mutation_rate in mutation_rates:
-                for crossover_func in crossover_funcs:
-                    for mutation_func in mutation_funcs:
-                        ga = GeneticAlgorithm(
-                            coords,
-                            population_size,
-                            crossover_rate,
-                            crossover_func,
-                            mutation_rate,
-                            mutation_func,
-                            generations,
-                            elitism_rate,
-                            tournament_size,
-                            greedy_rate,
-                            early_stop_threshold
-                        )
-                        ga.run()
+    if resume:
+        remaining = [i for i, path in enumerate(paths) if not is_complete(path, store_path)]
+        if len(remaining) < len(configs):
+            print(f"Skipping {len(configs) - len(remaining)} completed configurations")
+        configs = [configs[i] for i in remaining]
+        paths = [paths[i] for i in remaining]
+    ga_kwargs = {
+        "generations": generations,
+        "elitism_rate": elitism_rate,
+        "tournament_size": tournament_size,
+        "greedy_rate": greedy_rate,
+        "early_stop_threshold": early_stop_threshold,
+        "profile": profile,
+        "seed": seed
+    }
+    if workers == 1:
+        # Serial runs share one cache, while each worker process keeps its own
+        ga_kwargs["population_cache"] = PopulationCache()
 
-                        results_path = os.path.join(
-                            curr_dir,
-                            f"data/results/{dataset}/pop{population_size}_{crossover_rate}"
-                            f"{crossover_func.__name__}_{mutation_rate}{mutation_func.__name__}"
-                            ".json"
-                        )
-                        ga.save_results(results_path)
+    if racing_min_generations is not None:
+        survivors = run_racing_sweep(
+            coords,
+            distance_matrix,
+            configs,
+            paths,
+            ga_kwargs,
+            racing_min_generations,
+            racing_keep_fraction,
+            workers,
+            log_path=os.path.join(curr_dir, f"data/racing/{results_name}.json"),
+            telemetry=telemetry,
+            store_path=store_path
+        )
+        if survivors:
+            print(f"Best configuration after racing: {survivors[0]}")
+        return
+
+    if workers > 1:
+        _, failed = run_parallel_sweep(
+            coords,
+            distance_matrix,
+            configs,
+            paths,
+            ga_kwargs,
+            workers,
+            checkpoint_interval=checkpoint_interval,
+            telemetry=telemetry,
+            store_path=store_path
+        )
+        if failed:
+            print(f"{len(failed)} of {len(configs)} configurations failed")
+        return
+
+    for config, path in zip(configs, paths):
+        run_config(
+            coords,
+            distance_matrix,
+            config,
+            path,
+            ga_kwargs,
+            checkpoint_interval,
+            telemetry,
+            store_path=store_path
+        )
 
 
 if __name__ == "__main__":
+    # Analysis needs matplotlib and pandas, which the genetic algorithm itself does not, so they
+    # are only imported once the runs are done
+    from src.utils.analysis import analyse_results
+
     run_ga("berlin52")
     analyse_results("data/results/berlin52", "berlin52")
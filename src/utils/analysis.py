@@ -4,6 +4,17 @@ import re
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Optional
+from src.utils.results_store import ResultsStore
+
+
+# The results store opened by each plotting worker process, kept open for the lifetime of the
+# worker
+_plot_worker: Dict[str, ResultsStore] = {}
+
+# The name of the results file of each configuration, as built by `sweep.results_path`
+RESULTS_PATTERN = re.compile(r"pop(\d+)_([0-9.]+)(\w+)_([0-9.]+)(\w+)\.json")
 
 
 def analyse_results(results_dir: str, dataset: str, skip: int = 0) -> None:
@@ -11,94 +22,140 @@ def analyse_results(results_dir: str, dataset: str, skip: int = 0) -> None:
     Analyzes the results of the genetic algorithm. This function aggreagtes results to a CSV file,
     finds the best configuration, and plots the fitness over generations.
 
+    Results files are ingested into the directory's `results.db` results store, which sweeps may
+    also add to directly, so the best configuration is found from the aggregate with a single
+    query rather than by loading every results file.
+
     Args:
-        results_dir: The directory containing results JSON files.
+        results_dir: The directory containing results JSON files or a `results.db` store.
         dataset: The name of the dataset.
         skip: The number of initial generations to skip in the average fitness plot (default: 0).
     """
     aggregated_path = os.path.join(results_dir, "aggregated.csv")
-    aggregate_results(aggregated_path, results_dir)
-
-    results_paths = [
-        os.path.join(results_dir, filename)
-        for filename in os.listdir(results_dir)
-        if filename.endswith(".json")
-    ]
-
-    all_results = []
-    for path in results_paths:
-        with open(path, 'r') as file:
-            data = json.load(file)
-            all_results.append(data)
-
-    if all_results:
-        best_idx = min(range(len(all_results)), key=lambda i: all_results[i]["best_distance"])
-        best_config = all_results[best_idx]
-        best_path = results_paths[best_idx]
-
-        print(f"Best configuration: {best_config}")
-        plot_fitness(best_path, dataset, skip)
+    with ResultsStore(os.path.join(results_dir, "results.db")) as store:
+        aggregate_results(aggregated_path, results_dir, store)
+        best_run = store.best_run()
+
+    if best_run is not None:
+        print(f"Best configuration: {best_run['name']} ({best_run['best_distance']})")
+        plot_fitness(
+            os.path.join(results_dir, f"{best_run['name']}.json"),
+            dataset,
+            skip,
+            best_run
+        )
 
     plot_parameters(aggregated_path, dataset, "best_distance")
     plot_parameters(aggregated_path, dataset, "time")
 
 
-def aggregate_results(aggregated_path: str, results_dir: str) -> None:
+def aggregate_results(
+    aggregated_path: str,
+    results_dir: str,
+    store: Optional[ResultsStore] = None
+) -> None:
     """
-    Aggregates results to a CSV file.
+    Aggregates results to a CSV file. Results files are first ingested into the results store
+    with `ingest_results`, so only new or changed files are read.
 
     Args:
         aggregated_path: The path to the aggregated results CSV file.
         results_dir: The directory containing results JSON files.
+        store: The results store to aggregate, or None to open the directory's `results.db`
+            (default: None).
     """
-    data = []
-    pattern = re.compile(r"pop(\d+)_([0-9.]+)(\w+)_([0-9.]+)(\w+)\.json")
+    if store is None:
+        with ResultsStore(os.path.join(results_dir, "results.db")) as store:
+            aggregate_results(aggregated_path, results_dir, store)
+        return
+
+    ingest_results(store, results_dir)
+    columns = [
+        "population",
+        "crossover_rate",
+        "crossover_func",
+        "mutation_rate",
+        "mutation_func",
+        "time",
+        "best_distance"
+    ]
+    df = pd.DataFrame(store.aggregate(), columns=columns)
+    df.to_csv(aggregated_path, index=False)
+    print(f"Saved aggregated results to {aggregated_path}")
 
-    for filename in os.listdir(results_dir):
-        if filename.endswith(".json"):
-            match = pattern.match(filename)
-            if not match:
+
+def ingest_results(store: ResultsStore, results_dir: str) -> int:
+    """
+    Ingests the results files of a directory into a results store. Files whose size and
+    modification time match the store's manifest were ingested before and are skipped, and runs
+    whose results file has since been deleted are removed from the store.
+
+    Args:
+        store: The results store.
+        results_dir: The directory containing results JSON files.
+
+    Returns:
+        The number of results files read.
+    """
+    sources = store.sources()
+    found = set()
+    runs = []
+
+    with os.scandir(results_dir) as entries:
+        for entry in entries:
+            match = RESULTS_PATTERN.fullmatch(entry.name)
+            if not match or not entry.is_file():
                 continue
 
-            population = int(match.group(1))
-            crossover_rate = float(match.group(2))
-            crossover_func = match.group(3)
-            mutation_rate = float(match.group(4))
-            mutation_func = match.group(5)
-
-            file_path = os.path.join(results_dir, filename)
-            with open(file_path, 'r') as json_file:
-                json_data = json.load(json_file)
-
-            time = json_data.get("computational_secs", None)
-            best_distance = json_data.get("best_distance", None)
-
-            data.append({
-                "population": population,
-                "crossover_rate": crossover_rate,
-                "crossover_func": crossover_func,
-                "mutation_rate": mutation_rate,
-                "mutation_func": mutation_func,
-                "time": time,
-                "best_distance": best_distance
-            })
-
-    df = pd.DataFrame(data)
-    df.to_csv(aggregated_path, index=False)
-    print(f"Saved aggregated results to {aggregated_path}")
+            name = os.path.splitext(entry.name)[0]
+            stat = entry.stat()
+            source = (stat.st_size, stat.st_mtime_ns)
+            found.add(name)
+            if sources.get(name) == source:
+                continue
+
+            try:
+                with open(entry.path, 'r') as json_file:
+                    results = json.load(json_file)
+            except (OSError, ValueError):
+                continue
 
+            parameters = {
+                "population": int(match.group(1)),
+                "crossover_rate": float(match.group(2)),
+                "crossover_func": match.group(3),
+                "mutation_rate": float(match.group(4)),
+                "mutation_func": match.group(5)
+            }
+            runs.append((name, parameters, results, source))
 
-def plot_fitness(results_path: str, dataset: str, skip: int = 0) -> None:
+    store.add_runs(runs)
+    store.remove_runs(name for name in sources if name not in found)
+    return len(runs)
+
+
+def plot_fitness(
+    results_path: str,
+    dataset: str,
+    skip: int = 0,
+    results: Optional[Dict[str, Any]] = None,
+    show: bool = True
+) -> None:
     """
-    Plots the fitness scores (average and best) per generation from a results file.
+    Plots the fitness scores (average and best) per generation from a results file. Each figure
+    is closed once saved, and shown first if `show` is set.
 
     Args:
-        results_path: The path to the results JSON file.
+        results_path: The path to the results JSON file, from which the plot paths are built.
         dataset: The name of the dataset.
         skip: The number of initial generations to skip in the average fitness plot (default: 0).
+        results: The results, if already loaded, e.g. from a results store, rather than read from
+            `results_path` (default: None).
+        show: Whether each figure is shown before being closed (default: True).
     """
-    with open(results_path, "r") as file:
-        results = json.load(file)
+    if results is None:
+        with open(results_path, "r") as file:
+            results = json.load(file)
 
     avg_fitness = results["avg_fitness_per_gen"][skip:]
     best_fitness = results["best_fitness_per_gen"]
@@ -117,7 +174,7 @@ def plot_fitness(results_path: str, dataset: str, skip: int = 0) -> None:
     avg_plot_path = results_path.replace("results", "plots").replace(".json", "_avg.png")
     os.makedirs(os.path.dirname(avg_plot_path), exist_ok=True)
     plt.savefig(avg_plot_path)
-    plt.show()
+    _show_and_close(show)
 
     # Plot best fitness
     plt.figure(figsize=(10, 6))
@@ -130,7 +187,7 @@ def plot_fitness(results_path: str, dataset: str, skip: int = 0) -> None:
 
     best_plot_path = results_path.replace("results", "plots").replace(".json", "_best.png")
     plt.savefig(best_plot_path, bbox_inches="tight")
-    plt.show()
+    _show_and_close(show)
 
 
 def plot_parameters(
@@ -138,10 +195,12 @@ def plot_parameters(
     dataset: str,
     y_axis: str,
     sort_by: str = "best_distance",
-    N: int = 10
+    N: int = 10,
+    show: bool = True
 ) -> None:
     """
     Plots scatter plots with density heatmaps for different parameters vs a user-defined metric.
+    Each figure is closed once saved, and shown first if `show` is set.
 
     Args:
         aggregated_path: The path to the aggregated results CSV file.
@@ -149,6 +208,7 @@ def plot_parameters(
         y_axis: The parameter to plot on the y-axis.
         sort_by: The parameter used to sort the top N results (default: 'best_distance').
         N: The number of top results to consider (default: 10).
+        show: Whether each figure is shown before being closed (default: True).
     """
     data = pd.read_csv(aggregated_path)
     top_n_data = data.sort_values(by=sort_by).head(N)
@@ -178,5 +238,88 @@ def plot_parameters(
             os.path.dirname(aggregated_path).replace("results", "plots"),
             file_name
         )
+        os.makedirs(os.path.dirname(plot_path) or ".", exist_ok=True)
         plt.savefig(plot_path, bbox_inches="tight")
+        _show_and_close(show)
+
+
+def plot_results(
+    results_dir: str,
+    dataset: str,
+    skip: int = 0,
+    workers: Optional[int] = None
+) -> int:
+    """
+    Renders the fitness plots of every run, and the parameter plots, without displaying them.
+    Results files are first aggregated into the directory's results store, then the plots are
+    rendered across a pool of worker processes with the non-interactive Agg backend, each figure
+    being closed once saved so memory stays flat however many runs there are.
+
+    Args:
+        results_dir: The directory containing results JSON files or a `results.db` store.
+        dataset: The name of the dataset.
+        skip: The number of initial generations to skip in the average fitness plots (default: 0).
+        workers: The number of worker processes, or None for one per CPU (default: None).
+
+    Returns:
+        The number of runs plotted.
+    """
+    aggregated_path = os.path.join(results_dir, "aggregated.csv")
+    store_path = os.path.join(results_dir, "results.db")
+    with ResultsStore(store_path) as store:
+        aggregate_results(aggregated_path, results_dir, store)
+        names = [run["name"] for run in store.aggregate()]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_plot_worker,
+        initargs=(store_path,)
+    ) as executor:
+        futures = [
+            executor.submit(_plot_stored_run, results_dir, name, dataset, skip) for name in names
+        ]
+        futures.extend(
+            executor.submit(plot_parameters, aggregated_path, dataset, y_axis, show=False)
+            for y_axis in ("best_distance", "time")
+        )
+        for future in as_completed(futures):
+            future.result()
+    return len(names)
+
+
+def _show_and_close(show: bool) -> None:
+    """
+    Closes the current figure, showing it first if requested.
+
+    Args:
+        show: Whether the figure is shown before being closed.
+    """
+    if show:
         plt.show()
+    plt.close()
+
+
+def _init_plot_worker(store_path: str) -> None:
+    """
+    Switches a plotting worker process to the non-interactive Agg backend and opens the results
+    store its runs are read from.
+
+    Args:
+        store_path: The path of the results store.
+    """
+    plt.switch_backend("Agg")
+    _plot_worker["store"] = ResultsStore(store_path)
+
+
+def _plot_stored_run(results_dir: str, name: str, dataset: str, skip: int) -> None:
+    """
+    Renders the fitness plots of a run in the worker's results store.
+
+    Args:
+        results_dir: The directory of the results, from which the plot paths are built.
+        name: The name of the run.
+        dataset: The name of the dataset.
+        skip: The number of initial generations to skip in the average fitness plot.
+    """
+    results = _plot_worker["store"].load_run(name)
+    plot_fitness(os.path.join(results_dir, f"{name}.json"), dataset, skip, results, show=False)
@@ -0,0 +1,126 @@
+import gc
+import time
+import platform
+import tracemalloc
+import numpy as np
+from typing import Callable, Dict, List, Any
+
+
+def measure_ops_per_sec(func: Callable[[], Any], min_secs: float = 0.2, repeats: int = 3) -> float:
+    """
+    Measures how many times per second a function can be called. Calls are timed in batches that
+    run for at least `min_secs`, and the fastest of `repeats` batches is kept, as slower batches
+    are mostly slowed down by other activity on the machine.
+
+    Args:
+        func: The function to measure, called without arguments.
+        min_secs: The minimum duration of each batch of calls (default: 0.2).
+        repeats: The number of batches (default: 3).
+
+    Returns:
+        The number of calls per second.
+    """
+    # Calibrate the batch size with a single call, doubling it until a batch is long enough
+    calls = 1
+    while True:
+        elapsed = _time_calls(func, calls)
+        if elapsed >= min_secs:
+            break
+        calls *= 2 if elapsed <= 0 else max(2, min(10, int(min_secs / elapsed) + 1))
+
+    best = elapsed
+    for _ in range(repeats - 1):
+        best = min(best, _time_calls(func, calls))
+    return calls / best
+
+
+def measure_peak_bytes(func: Callable[[], Any]) -> int:
+    """
+    Measures the peak memory allocated by a single call to a function, including the memory of
+    NumPy arrays.
+
+    Args:
+        func: The function to measure, called without arguments.
+
+    Returns:
+        The peak number of bytes allocated during the call, above what was allocated before it.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        func()
+        return max(0, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float = 0.2
+) -> List[str]:
+    """
+    Compares benchmark results against a baseline. A benchmark regresses if its throughput drops,
+    or its peak memory grows, by more than `tolerance` relative to the baseline. Benchmarks
+    missing from either side are ignored.
+
+    Args:
+        results: The `ops_per_sec` and `peak_bytes` of each benchmark.
+        baseline: The baseline results in the same format.
+        tolerance: The allowed relative change before a benchmark counts as a regression
+            (default: 0.2).
+
+    Returns:
+        A description of each regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+
+        if result["ops_per_sec"] < expected["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:.4g} ops/sec, baseline "
+                f"{expected['ops_per_sec']:.4g} ops/sec"
+            )
+        if result["peak_bytes"] > expected["peak_bytes"] * (1 + tolerance) + 1024:
+            regressions.append(
+                f"{name}: {result['peak_bytes']} peak bytes, baseline {expected['peak_bytes']} "
+                "peak bytes"
+            )
+    return regressions
+
+
+def machine_info() -> Dict[str, str]:
+    """
+    Describes the machine and software that benchmarks ran on, as baselines are only comparable
+    on the same setup.
+
+    Returns:
+        The machine's platform and processor, and the Python and NumPy versions.
+    """
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "python": platform.python_version(),
+        "numpy": np.__version__
+    }
+
+
+def _time_calls(func: Callable[[], Any], calls: int) -> float:
+    """
+    Times a number of consecutive calls to a function.
+
+    Args:
+        func: The function to time, called without arguments.
+        calls: The number of calls.
+
+    Returns:
+        The total time taken in seconds.
+    """
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return time.perf_counter() - start
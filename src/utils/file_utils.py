@@ -1,4 +1,7 @@
-from typing import List, Tuple
+import os
+import json
+from typing import List, Tuple, Dict, Any
+from src.utils.tsplib import parse_tsplib
 
 
 def load_tsplib(path: str) -> List[Tuple[float, float]]:
@@ -10,19 +13,27 @@ def load_tsplib(path: str) -> List[Tuple[float, float]]:
 
     Returns:
         A list of tuples representing the coordinates (x, y) of each city.
+
+    Raises:
+        ValueError: If the file has no node coordinates or display data.
+    """
+    instance = parse_tsplib(path)
+    if instance.coords is None:
+        raise ValueError(f"{path} has no coordinates")
+    return [(x, y) for x, y in instance.coords.tolist()]
+
+
+def save_json(path: str, data: Dict[str, Any]) -> None:
+    """
+    Saves data to a JSON file, writing to a temporary file first so that an existing file at
+    `path` is always complete.
+
+    Args:
+        path: The file path where the data will be saved.
+        data: The data to save.
     """
-    with open(path, 'r') as file:
-        lines = file.readlines()
-        node_coord_section = False
-        coords = []
-
-        for line in lines:
-            if "NODE_COORD_SECTION" in line:
-                node_coord_section = True
-                continue
-            if "EOF" in line:
-                break
-            if node_coord_section:
-                parts = line.strip().split()
-                coords.append((float(parts[1]), float(parts[2])))
-        return coords
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(data, file, indent=4)
+    os.replace(tmp_path, path)
@@ -0,0 +1,66 @@
+import time
+import functools
+from typing import Callable, Dict, Any
+
+
+class Profiler:
+    """
+    Accumulates the time spent in, and the number of calls to, named sections of code.
+    """
+    def __init__(self):
+        """
+        Initialises an empty profiler.
+        """
+        self.total_secs: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+
+    def record(self, name: str, secs: float) -> None:
+        """
+        Records a single call to a section.
+
+        Args:
+            name: The name of the section.
+            secs: The time spent in the call.
+        """
+        self.total_secs[name] = self.total_secs.get(name, 0.0) + secs
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def timed(self, func: Callable[..., Any], prefix: str = "") -> Callable[..., Any]:
+        """
+        Wraps a function so every call to it is recorded under its name.
+
+        Args:
+            func: The function to time.
+            prefix: A prefix for the function's name in the profile, e.g. to tell apart a function
+                used in several places (default: "").
+
+        Returns:
+            The wrapped function.
+        """
+        name = f"{prefix}{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        return wrapper
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarises the recorded sections.
+
+        Returns:
+            A dictionary mapping each section to its number of calls, total time and mean time per
+            call, in the order the sections were first recorded.
+        """
+        return {
+            name: {
+                "calls": self.calls[name],
+                "total_secs": round(total_secs, 6),
+                "mean_secs": round(total_secs / self.calls[name], 9)
+            }
+            for name, total_secs in self.total_secs.items()
+        }
@@ -0,0 +1,277 @@
+import os
+import json
+import zlib
+import sqlite3
+import numpy as np
+from typing import List, Tuple, Dict, Iterable, Any, Optional
+
+# The parameter columns of each run, as named in `aggregated.csv`, and their SQLite types
+PARAMETER_COLUMNS = {
+    "population": "INTEGER",
+    "crossover_rate": "REAL",
+    "crossover_func": "TEXT",
+    "mutation_rate": "REAL",
+    "mutation_func": "TEXT"
+}
+
+# The per-run arrays, stored as zlib-compressed bytes, and their element types
+ARRAY_COLUMNS = {
+    "best_solution": np.int32,
+    "avg_fitness_per_gen": np.float64,
+    "best_fitness_per_gen": np.float64
+}
+
+
+class ResultsStore:
+    """
+    A store of the results of many runs in a single SQLite database, as an alternative to one JSON
+    file per run. Each run is a row with its parameters and scalar results as columns, its tour and
+    fitness curves as compressed arrays, and any other results as a JSON column.
+
+    Aggregating the parameters and results of every run, or finding the best run, is a single
+    query that never reads the arrays of the other runs. Runs may be added concurrently from
+    several processes, as SQLite serialises the writes.
+
+    Runs ingested from results files also record the size and modification time of their file in
+    a manifest, so that only new or changed files need to be read again.
+    """
+    def __init__(self, path: str, timeout: float = 60.0):
+        """
+        Opens the store, creating it if it does not exist.
+
+        Args:
+            path: The path of the database file.
+            timeout: The number of seconds to wait for another process's write to finish
+                (default: 60.0).
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=timeout)
+        # Write-ahead logging lets runs be read while others are being added
+        self.connection.execute("PRAGMA journal_mode=WAL")
+
+        columns = ", ".join(f"{name} {kind}" for name, kind in PARAMETER_COLUMNS.items())
+        arrays = ", ".join(f"{name} BLOB" for name in ARRAY_COLUMNS)
+        with self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS runs (name TEXT PRIMARY KEY, {columns}, "
+                f"time REAL, best_distance REAL, generations INTEGER, {arrays}, extra TEXT)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS runs_best_distance ON runs (best_distance)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, size INTEGER, "
+                "mtime_ns INTEGER)"
+            )
+
+    def __enter__(self) -> "ResultsStore":
+        """
+        Returns the store, to be closed at the end of a `with` block.
+
+        Returns:
+            The store.
+        """
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """
+        Closes the store at the end of a `with` block.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the connection to the database.
+        """
+        self.connection.close()
+
+    def add_run(self, name: str, parameters: Dict[str, Any], results: Dict[str, Any]) -> None:
+        """
+        Adds the results of a run, replacing any earlier run with the same name.
+
+        Args:
+            name: The unique name of the run, e.g. the name of its configuration.
+            parameters: The value of each of `PARAMETER_COLUMNS`.
+            results: The results of the run, as returned by `GeneticAlgorithm.results`.
+        """
+        self.add_runs([(name, parameters, results, None)])
+
+    def add_runs(
+        self,
+        runs: Iterable[Tuple[str, Dict[str, Any], Dict[str, Any], Optional[Tuple[int, int]]]]
+    ) -> None:
+        """
+        Adds the results of many runs in a single transaction, replacing any earlier runs with the
+        same names.
+
+        Args:
+            runs: The name, parameters and results of each run, as in `add_run`, and the size and
+                modification time (in nanoseconds) of the results file it was read from, or None
+                if it was not read from a file.
+        """
+        with self.connection:
+            for name, parameters, results, source in runs:
+                row = _run_row(name, parameters, results)
+                self.connection.execute(
+                    f"INSERT OR REPLACE INTO runs ({', '.join(row)}) "
+                    f"VALUES ({', '.join('?' * len(row))})",
+                    list(row.values())
+                )
+                if source is None:
+                    self.connection.execute("DELETE FROM sources WHERE name = ?", (name,))
+                else:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO sources (name, size, mtime_ns) VALUES (?, ?, ?)",
+                        (name, *source)
+                    )
+
+    def remove_runs(self, names: Iterable[str]) -> None:
+        """
+        Removes runs, and their manifest entries, from the store.
+
+        Args:
+            names: The names of the runs.
+        """
+        with self.connection:
+            for name in names:
+                self.connection.execute("DELETE FROM runs WHERE name = ?", (name,))
+                self.connection.execute("DELETE FROM sources WHERE name = ?", (name,))
+
+    def sources(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Lists the runs ingested from results files.
+
+        Returns:
+            A dictionary mapping the name of each run to the size and modification time (in
+            nanoseconds) of its results file when it was ingested.
+        """
+        cursor = self.connection.execute("SELECT name, size, mtime_ns FROM sources")
+        return {name: (size, mtime_ns) for name, size, mtime_ns in cursor}
+
+    def has_run(self, name: str) -> bool:
+        """
+        Checks whether a run is in the store.
+
+        Args:
+            name: The name of the run.
+
+        Returns:
+            True if the run is in the store, otherwise False.
+        """
+        query = "SELECT 1 FROM runs WHERE name = ?"
+        return self.connection.execute(query, (name,)).fetchone() is not None
+
+    def aggregate(self) -> List[Dict[str, Any]]:
+        """
+        Summarises every run by its parameters, time and best distance, without reading arrays.
+
+        Returns:
+            The summary of each run, ordered by best distance.
+        """
+        columns = ["name", *PARAMETER_COLUMNS, "time", "best_distance", "generations"]
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(columns)} FROM runs ORDER BY best_distance"
+        )
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def best_run(self) -> Optional[Dict[str, Any]]:
+        """
+        Loads the run with the shortest best distance.
+
+        Returns:
+            The run, as returned by `load_run`, or None if the store is empty.
+        """
+        row = self.connection.execute(
+            "SELECT name FROM runs ORDER BY best_distance LIMIT 1"
+        ).fetchone()
+        return None if row is None else self.load_run(row[0])
+
+    def load_run(self, name: str) -> Dict[str, Any]:
+        """
+        Loads a run's parameters and full results.
+
+        Args:
+            name: The name of the run.
+
+        Returns:
+            The name and parameters of the run, and its results in the format of
+            `GeneticAlgorithm.results`.
+
+        Raises:
+            KeyError: If the run is not in the store.
+        """
+        columns = [*PARAMETER_COLUMNS, "time", "best_distance", *ARRAY_COLUMNS, "extra"]
+        row = self.connection.execute(
+            f"SELECT {', '.join(columns)} FROM runs WHERE name = ?",
+            (name,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(name)
+
+        values = dict(zip(columns, row))
+        run = {"name": name, **{column: values[column] for column in PARAMETER_COLUMNS}}
+        run["computational_secs"] = values["time"]
+        run["best_distance"] = values["best_distance"]
+        for column, dtype in ARRAY_COLUMNS.items():
+            run[column] = _unpack(values[column], dtype).tolist()
+        run.update(json.loads(values["extra"]))
+        return run
+
+
+def _run_row(name: str, parameters: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds the row of a run.
+
+    Args:
+        name: The name of the run.
+        parameters: The value of each of `PARAMETER_COLUMNS`.
+        results: The results of the run.
+
+    Returns:
+        A dictionary mapping each column to its value.
+    """
+    extra = {
+        key: value for key, value in results.items()
+        if key not in ARRAY_COLUMNS and key not in ("computational_secs", "best_distance")
+    }
+    return {
+        "name": name,
+        **{column: parameters.get(column) for column in PARAMETER_COLUMNS},
+        "time": results.get("computational_secs"),
+        "best_distance": results.get("best_distance"),
+        "generations": len(results.get("best_fitness_per_gen", [])),
+        **{
+            column: _pack(results.get(column, []), dtype)
+            for column, dtype in ARRAY_COLUMNS.items()
+        },
+        "extra": json.dumps(extra)
+    }
+
+
+def _pack(values: Any, dtype: type) -> bytes:
+    """
+    Packs an array into compressed bytes.
+
+    Args:
+        values: The array or list of values.
+        dtype: The element type to store the values as.
+
+    Returns:
+        The compressed bytes.
+    """
+    return zlib.compress(np.asarray(values, dtype=dtype).tobytes())
+
+
+def _unpack(data: bytes, dtype: type) -> np.ndarray:
+    """
+    Unpacks an array packed by `_pack`.
+
+    Args:
+        data: The compressed bytes.
+        dtype: The element type the values were stored as.
+
+    Returns:
+        The array.
+    """
+    return np.frombuffer(zlib.decompress(data), dtype=dtype)
@@ -0,0 +1,42 @@
+import numpy as np
+from multiprocessing.shared_memory import SharedMemory
+from typing import Tuple
+
+# The description (name, shape, dtype) of an array placed in shared memory
+SharedArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+def share_array(array: np.ndarray) -> Tuple[SharedMemory, SharedArraySpec]:
+    """
+    Copies an array into a new block of shared memory. The caller owns the block and must close
+    and unlink it once every process is done with it.
+
+    Args:
+        array: The array to share.
+
+    Returns:
+        A tuple containing the shared memory block and the description used to attach to it.
+    """
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    shared[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def attach_array(spec: SharedArraySpec) -> Tuple[SharedMemory, np.ndarray]:
+    """
+    Attaches to an array in shared memory as a read-only view. The shared memory block must be
+    kept alive for as long as the view is used.
+
+    Args:
+        spec: The description of the shared array.
+
+    Returns:
+        A tuple containing the shared memory block and the array view.
+    """
+    name, shape, dtype = spec
+    shm = SharedMemory(name=name)
+
+    array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    array.flags.writeable = False
+    return shm, array
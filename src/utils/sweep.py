@@ -0,0 +1,542 @@
+import os
+import json
+import math
+import warnings
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Tuple, Callable, Dict, Any, NamedTuple, Optional
+from src.ga.genetic_algorithm import GeneticAlgorithm
+from src.ga.population_cache import PopulationCache
+from src.utils.file_utils import save_json
+from src.utils.results_store import ResultsStore
+from src.utils.shared_memory import SharedArraySpec, share_array, attach_array
+
+
+class SweepConfig(NamedTuple):
+    """
+    A single point of a hyperparameter sweep grid.
+    """
+    population_size: int
+    crossover_rate: float
+    crossover_func: Callable[[List[int], List[int]], Tuple[List[int], List[int]]]
+    mutation_rate: float
+    mutation_func: Callable[[List[int], Optional[np.ndarray]], Optional[float]]
+
+
+# Arrays attached by each worker process, and the initial populations built by its runs, kept
+# alive for the lifetime of the worker
+_worker_arrays: Dict[str, Any] = {}
+
+
+def sweep_configs(
+    population_sizes: List[int],
+    crossover_rates: List[float],
+    mutation_rates: List[float],
+    crossover_funcs: List[Callable[[List[int], List[int]], Tuple[List[int], List[int]]]],
+    mutation_funcs: List[Callable[[List[int], Optional[np.ndarray]], Optional[float]]]
+) -> List[SweepConfig]:
+    """
+    Enumerates every combination of the sweep parameters.
+
+    Args:
+        population_sizes: A list of population sizes.
+        crossover_rates: A list of crossover rates.
+        mutation_rates: A list of mutation rates.
+        crossover_funcs: A list of crossover functions.
+        mutation_funcs: A list of mutation functions.
+
+    Returns:
+        A list of configurations, ordered by population size, crossover rate, mutation rate,
+        crossover function and mutation function.
+    """
+    return [
+        SweepConfig(population_size, crossover_rate, crossover_func, mutation_rate, mutation_func)
+        for population_size in population_sizes
+        for crossover_rate in crossover_rates
+        for mutation_rate in mutation_rates
+        for crossover_func in crossover_funcs
+        for mutation_func in mutation_funcs
+    ]
+
+
+def results_path(curr_dir: str, dataset: str, config: SweepConfig) -> str:
+    """
+    Builds the path of the results JSON file of a configuration.
+
+    Args:
+        curr_dir: The base directory where results are stored.
+        dataset: The name of the dataset.
+        config: The configuration.
+
+    Returns:
+        The path of the results file.
+    """
+    return os.path.join(
+        curr_dir,
+        f"data/results/{dataset}/pop{config.population_size}_{config.crossover_rate}"
+        f"{config.crossover_func.__name__}_{config.mutation_rate}{config.mutation_func.__name__}"
+        ".json"
+    )
+
+
+def run_name(path: str) -> str:
+    """
+    Builds the name of a configuration's run in a results store from its results path.
+
+    Args:
+        path: The path of the results file.
+
+    Returns:
+        The name of the run.
+    """
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def config_parameters(config: SweepConfig) -> Dict[str, Any]:
+    """
+    Describes a configuration by the parameter columns of a results store.
+
+    Args:
+        config: The configuration.
+
+    Returns:
+        The population size, rates and operator names of the configuration.
+    """
+    return {
+        "population": config.population_size,
+        "crossover_rate": config.crossover_rate,
+        "crossover_func": config.crossover_func.__name__,
+        "mutation_rate": config.mutation_rate,
+        "mutation_func": config.mutation_func.__name__
+    }
+
+
+def checkpoint_path(path: str) -> str:
+    """
+    Builds the path of the checkpoint file of a configuration from its results path.
+
+    Args:
+        path: The path of the results file.
+
+    Returns:
+        The path of the checkpoint file.
+    """
+    return f"{os.path.splitext(path)[0]}.checkpoint.npz"
+
+
+def telemetry_path(path: str) -> str:
+    """
+    Builds the path of the telemetry file of a configuration from its results path.
+
+    Args:
+        path: The path of the results file.
+
+    Returns:
+        The path of the telemetry file.
+    """
+    return f"{os.path.splitext(path)[0]}.telemetry.jsonl"
+
+
+def is_complete(path: str, store_path: Optional[str] = None) -> bool:
+    """
+    Checks whether a configuration already has completed results.
+
+    Args:
+        path: The path of the results file.
+        store_path: The path of the results store the results are saved to, or None if they are
+            saved to the results file (default: None).
+
+    Returns:
+        True if the results file exists and contains a best distance, or the run is in the
+        results store, otherwise False.
+    """
+    if store_path is not None:
+        with ResultsStore(store_path) as store:
+            return store.has_run(run_name(path))
+    try:
+        with open(path, 'r') as file:
+            return "best_distance" in json.load(file)
+    except (OSError, ValueError):
+        return False
+
+
+def run_config(
+    coords: Optional[np.ndarray],
+    distance_matrix: Optional[np.ndarray],
+    config: SweepConfig,
+    path: str,
+    ga_kwargs: Dict[str, Any],
+    checkpoint_interval: Optional[int] = None,
+    telemetry: bool = False,
+    until: Optional[int] = None,
+    store_path: Optional[str] = None
+) -> float:
+    """
+    Runs the genetic algorithm for a single configuration and saves its results.
+
+    The run is resumed from its checkpoint if one exists, e.g. left by an interrupted run or a
+    race, and the checkpoint is removed once the results are saved. A checkpoint saved with other
+    settings is discarded, with a warning, and the run starts again. With checkpointing enabled,
+    the run is checkpointed periodically. A run can also be advanced in stages with `until`, in
+    which case it is checkpointed rather than saved until it finishes.
+
+    Args:
+        coords: The coordinates of the cities to be visited, or None if the instance only has a
+            distance matrix.
+        distance_matrix: The distance matrix shared by every configuration, or None to compute
+            it from `coords`.
+        config: The configuration to run.
+        path: The file path where the results will be saved.
+        ga_kwargs: The remaining keyword arguments of `GeneticAlgorithm`, shared by every
+            configuration.
+        checkpoint_interval: The number of generations between checkpoints, or None to disable
+            checkpointing (default: None).
+        telemetry: Whether the statistics of each generation are streamed to the configuration's
+            telemetry file while it runs (default: False).
+        until: The generation to stop at, after which the run is checkpointed to be continued
+            later, or None to run to completion (default: None).
+        store_path: The path of a results store the results are added to instead of being saved
+            to `path`, which still names the run and its checkpoint (default: None).
+
+    Returns:
+        The best distance found.
+    """
+    checkpoint = checkpoint_path(path)
+    if checkpoint_interval:
+        ga_kwargs = {
+            **ga_kwargs,
+            "checkpoint_path": checkpoint,
+            "checkpoint_interval": checkpoint_interval
+        }
+    if telemetry:
+        ga_kwargs = {**ga_kwargs, "telemetry_path": telemetry_path(path)}
+
+    ga = GeneticAlgorithm(
+        coords,
+        config.population_size,
+        config.crossover_rate,
+        config.crossover_func,
+        config.mutation_rate,
+        config.mutation_func,
+        distance_matrix=distance_matrix,
+        **ga_kwargs
+    )
+    if os.path.exists(checkpoint):
+        try:
+            ga.load_checkpoint(checkpoint)
+        except ValueError as error:
+            warnings.warn(f"Discarding checkpoint {checkpoint}: {error}")
+            os.remove(checkpoint)
+
+    ga.run(until=until)
+    if not ga.stopped_early and ga.generation < ga.generations:
+        ga.save_checkpoint(checkpoint)
+        return ga.best_distance
+
+    if store_path is not None:
+        with ResultsStore(store_path) as store:
+            store.add_run(run_name(path), config_parameters(config), ga.results())
+    else:
+        ga.save_results(path)
+
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return ga.best_distance
+
+
+def run_parallel_sweep(
+    coords: Optional[np.ndarray],
+    distance_matrix: np.ndarray,
+    configs: List[SweepConfig],
+    paths: List[str],
+    ga_kwargs: Dict[str, Any],
+    workers: int,
+    max_restarts: int = 3,
+    checkpoint_interval: Optional[int] = None,
+    telemetry: bool = False,
+    until: Optional[int] = None,
+    store_path: Optional[str] = None
+) -> Tuple[List[str], List[str]]:
+    """
+    Runs configurations across a pool of worker processes.
+
+    The coordinates and distance matrix are placed in shared memory once and mapped by each worker
+    rather than pickled per task. Each worker saves its results as soon as its run finishes, so if
+    a worker crashes and breaks the pool, completed runs are kept and the unfinished
+    configurations are resubmitted to a fresh pool, up to `max_restarts` times.
+
+    Args:
+        coords: The coordinates of the cities to be visited, or None if the instance only has a
+            distance matrix.
+        distance_matrix: The distance matrix shared by every configuration.
+        configs: The configurations to run.
+        paths: The results file path of each configuration.
+        ga_kwargs: The remaining keyword arguments of `GeneticAlgorithm`, shared by every
+            configuration.
+        workers: The number of worker processes.
+        max_restarts: The number of times the pool is restarted after a worker crash (default: 3).
+        checkpoint_interval: The number of generations between checkpoints, or None to disable
+            checkpointing (default: None).
+        telemetry: Whether the statistics of each generation are streamed to each
+            configuration's telemetry file while it runs (default: False).
+        until: The generation at which every run is checkpointed to be continued later, or None
+            to run to completion (default: None).
+        store_path: The path of a results store the results are added to instead of being saved
+            to each configuration's results file (default: None).
+
+    Returns:
+        A tuple containing the results paths of the completed and failed configurations.
+    """
+    pending = dict(enumerate(zip(configs, paths)))
+    completed, failed = [], []
+
+    # Instances with only a distance matrix share an empty array in place of their coordinates
+    coords = np.empty((0, 2)) if coords is None else coords
+    coords_shm, coords_spec = share_array(np.asarray(coords, dtype=np.float64))
+    matrix_shm, matrix_spec = share_array(distance_matrix)
+
+    try:
+        restarts = 0
+        while pending:
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(coords_spec, matrix_spec)
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            _run_shared_config,
+                            config,
+                            path,
+                            ga_kwargs,
+                            checkpoint_interval,
+                            telemetry,
+                            until,
+                            store_path
+                        ): key
+                        for key, (config, path) in pending.items()
+                    }
+
+                    for future in as_completed(futures):
+                        key = futures[future]
+                        path = pending[key][1]
+                        try:
+                            future.result()
+                        except BrokenProcessPool:
+                            raise
+                        except Exception as e:
+                            print(f"Failed to run {path}: {e!r}")
+                            failed.append(path)
+                        else:
+                            completed.append(path)
+                        del pending[key]
+
+            except BrokenProcessPool:
+                restarts += 1
+                if restarts > max_restarts:
+                    print(f"Worker pool broke {restarts} times, abandoning {len(pending)} runs")
+                    failed.extend(path for _, path in pending.values())
+                    break
+                print(f"Worker crashed, restarting pool for {len(pending)} remaining runs")
+    finally:
+        for shm in (coords_shm, matrix_shm):
+            shm.close()
+            shm.unlink()
+
+    return completed, failed
+
+
+def run_racing_sweep(
+    coords: Optional[np.ndarray],
+    distance_matrix: np.ndarray,
+    configs: List[SweepConfig],
+    paths: List[str],
+    ga_kwargs: Dict[str, Any],
+    min_generations: int,
+    keep_fraction: float = 0.5,
+    workers: int = 1,
+    log_path: Optional[str] = None,
+    telemetry: bool = False,
+    store_path: Optional[str] = None
+) -> List[str]:
+    """
+    Runs configurations as a race with successive halving. Every configuration is first run for
+    `min_generations`, then only the best `keep_fraction` of them by best distance continue from
+    their checkpoints for a budget `1 / keep_fraction` times larger, and so on until the survivors
+    reach `generations`. Each round then costs about as much as the first, rather than every
+    configuration running to `generations`.
+
+    Only the survivors of the last round, and runs that stopped early before being eliminated,
+    save results. The checkpoints of eliminated runs are kept, so a later sweep continues them
+    rather than starting again.
+
+    Args:
+        coords: The coordinates of the cities to be visited, or None if the instance only has a
+            distance matrix.
+        distance_matrix: The distance matrix shared by every configuration.
+        configs: The configurations to race.
+        paths: The results file path of each configuration.
+        ga_kwargs: The remaining keyword arguments of `GeneticAlgorithm`, shared by every
+            configuration.
+        min_generations: The generation budget of the first round.
+        keep_fraction: The fraction of configurations kept after each round (default: 0.5).
+        workers: The number of processes to run each round across (default: 1).
+        log_path: The file path where the budget and best distance of every configuration in each
+            round are saved, or None to not save them (default: None).
+        telemetry: Whether the statistics of each generation are streamed to each
+            configuration's telemetry file while it runs (default: False).
+        store_path: The path of a results store the results are added to instead of being saved
+            to each configuration's results file (default: None).
+
+    Returns:
+        The results paths of the surviving configurations, best first.
+
+    Raises:
+        ValueError: If the keep fraction is not between 0 and 1 (exclusive).
+    """
+    if not 0 < keep_fraction < 1:
+        raise ValueError(f"Keep fraction must be between 0 and 1, got {keep_fraction}")
+
+    generations = ga_kwargs["generations"]
+    alive = list(range(len(configs)))
+    finished = set()
+    budget = min(min_generations, generations)
+    rounds = []
+
+    while alive:
+        running = [i for i in alive if i not in finished]
+        failed = set()
+        if workers > 1 and len(running) > 1:
+            _, failed_paths = run_parallel_sweep(
+                coords,
+                distance_matrix,
+                [configs[i] for i in running],
+                [paths[i] for i in running],
+                ga_kwargs,
+                min(workers, len(running)),
+                telemetry=telemetry,
+                until=budget,
+                store_path=store_path
+            )
+            failed = {i for i in running if paths[i] in failed_paths}
+        else:
+            for i in running:
+                run_config(
+                    coords,
+                    distance_matrix,
+                    configs[i],
+                    paths[i],
+                    ga_kwargs,
+                    telemetry=telemetry,
+                    until=budget,
+                    store_path=store_path
+                )
+
+        # A run has finished once its results are saved and its checkpoint removed
+        finished.update(
+            i for i in running
+            if i not in failed and not os.path.exists(checkpoint_path(paths[i]))
+        )
+        scores = {
+            i: _race_distance(paths[i], i in finished, store_path)
+            for i in alive if i not in failed
+        }
+        alive = sorted((i for i in alive if i not in failed), key=lambda i: scores[i])
+        rounds.append({
+            "generations": budget,
+            "best_distances": {os.path.basename(paths[i]): scores[i] for i in alive}
+        })
+
+        if budget >= generations or all(i in finished for i in alive):
+            break
+        alive = alive[:max(1, math.ceil(len(alive) * keep_fraction))]
+        budget = generations if len(alive) == 1 else min(
+            int(math.ceil(budget / keep_fraction)),
+            generations
+        )
+
+    if log_path is not None:
+        save_json(log_path, {"rounds": rounds, "survivors": [paths[i] for i in alive]})
+    return [paths[i] for i in alive]
+
+
+def _race_distance(path: str, finished: bool, store_path: Optional[str]) -> float:
+    """
+    Reads the best distance of a raced configuration, from its results if it has finished or
+    otherwise from its checkpoint.
+
+    Args:
+        path: The path of the results file.
+        finished: Whether the configuration's run has finished.
+        store_path: The path of the results store holding the results, or None if they are in
+            the results file.
+
+    Returns:
+        The best distance found so far, or infinity if there is none.
+    """
+    try:
+        if finished and store_path is not None:
+            with ResultsStore(store_path) as store:
+                return float(store.load_run(run_name(path))["best_distance"])
+        if finished:
+            with open(path, 'r') as file:
+                return float(json.load(file)["best_distance"])
+        with np.load(checkpoint_path(path)) as checkpoint:
+            return float(checkpoint["best_distance"])
+    except (OSError, ValueError, KeyError):
+        return float("inf")
+
+
+def _init_worker(coords_spec: SharedArraySpec, matrix_spec: SharedArraySpec) -> None:
+    """
+    Attaches a worker process to the shared coordinates and distance matrix, and creates the
+    cache of initial populations shared by the worker's runs.
+
+    Args:
+        coords_spec: The description of the shared coordinates.
+        matrix_spec: The description of the shared distance matrix.
+    """
+    _worker_arrays["coords_shm"], coords = attach_array(coords_spec)
+    _worker_arrays["coords"] = coords if len(coords) else None
+    _worker_arrays["population_cache"] = PopulationCache()
+    _worker_arrays["matrix_shm"], _worker_arrays["distance_matrix"] = attach_array(matrix_spec)
+
+
+def _run_shared_config(
+    config: SweepConfig,
+    path: str,
+    ga_kwargs: Dict[str, Any],
+    checkpoint_interval: Optional[int],
+    telemetry: bool,
+    until: Optional[int],
+    store_path: Optional[str]
+) -> float:
+    """
+    Runs a configuration in a worker process against the shared arrays, starting from the
+    worker's cached initial population when a run with the same population size has built it.
+
+    Args:
+        config: The configuration to run.
+        path: The file path where the results will be saved.
+        ga_kwargs: The remaining keyword arguments of `GeneticAlgorithm`.
+        checkpoint_interval: The number of generations between checkpoints, or None.
+        telemetry: Whether the statistics of each generation are streamed to a telemetry file.
+        until: The generation at which the run is checkpointed, or None to run to completion.
+        store_path: The path of the results store the results are added to, or None.
+
+    Returns:
+        The best distance found.
+    """
+    return run_config(
+        _worker_arrays["coords"],
+        _worker_arrays["distance_matrix"],
+        config,
+        path,
+        {"population_cache": _worker_arrays["population_cache"], **ga_kwargs},
+        checkpoint_interval,
+        telemetry,
+        until,
+        store_path
+    )
@@ -0,0 +1,350 @@
+import os
+import json
+import numpy as np
+from typing import List, Dict, NamedTuple, Optional
+from src.ga.fitness import compute_distance_matrix, blocked_distance_matrix
+
+# Sections whose data follows their keyword, up to the next keyword or EOF
+SECTIONS = (
+    "NODE_COORD_SECTION",
+    "DISPLAY_DATA_SECTION",
+    "EDGE_WEIGHT_SECTION",
+    "DEPOT_SECTION",
+    "DEMAND_SECTION",
+    "TOUR_SECTION",
+    "FIXED_EDGES_SECTION"
+)
+
+EDGE_WEIGHT_TYPES = ("EUC_2D", "CEIL_2D", "GEO", "ATT", "EXPLICIT")
+
+# The order in which each EDGE_WEIGHT_FORMAT lists the entries of a symmetric matrix, as the
+# (upper or lower) triangle and whether it includes the diagonal, read row by row. Column-wise
+# formats list the same entries as the opposite row-wise triangle.
+EDGE_WEIGHT_FORMATS = {
+    "UPPER_ROW": ("upper", 1),
+    "LOWER_ROW": ("lower", -1),
+    "UPPER_DIAG_ROW": ("upper", 0),
+    "LOWER_DIAG_ROW": ("lower", 0),
+    "UPPER_COL": ("lower", -1),
+    "LOWER_COL": ("upper", 1),
+    "UPPER_DIAG_COL": ("lower", 0),
+    "LOWER_DIAG_COL": ("upper", 0)
+}
+
+# Bumped whenever the format of cached instances changes, invalidating existing caches
+_CACHE_VERSION = 1
+
+# The radius of the Earth and the value of pi used by TSPLIB's GEO distances
+_EARTH_RADIUS = 6378.388
+_GEO_PI = 3.141592
+
+
+class TSPInstance(NamedTuple):
+    """
+    A TSPLIB instance. Either or both of the coordinates and the distance matrix are set,
+    depending on how the instance specifies its distances.
+    """
+    name: str
+    edge_weight_type: str
+    dimension: int
+    coords: Optional[np.ndarray]
+    distance_matrix: Optional[np.ndarray]
+
+
+def parse_tsplib(path: str) -> TSPInstance:
+    """
+    Parses a symmetric TSPLIB instance. The specification lines of the header are read as
+    `KEY : VALUE` pairs, followed by the data sections, up to an `EOF` line or the end of the file.
+
+    For instances with an explicit EDGE_WEIGHT_SECTION, the distance matrix is read from it in any
+    of `EDGE_WEIGHT_FORMATS`, and coordinates are taken from a DISPLAY_DATA_SECTION if present.
+    Otherwise, only the coordinates are read, and `tsplib_distance_matrix` computes the distances.
+
+    Args:
+        path: The path to the TSPLIB file.
+
+    Returns:
+        The instance.
+
+    Raises:
+        ValueError: If the edge weight type or format is unsupported, or the data does not match
+            the dimension.
+    """
+    with open(path, 'r') as file:
+        lines = file.read().splitlines()
+
+    header: Dict[str, str] = {}
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line == "EOF":
+            break
+
+        keyword = line.split(":", 1)[0].strip().upper()
+        if keyword in SECTIONS:
+            current = sections.setdefault(keyword, [])
+        elif current is not None and ":" not in line:
+            current.append(line)
+        else:
+            key, _, value = line.partition(":")
+            header[key.strip().upper()] = value.strip()
+            current = None
+
+    name = header.get("NAME", os.path.splitext(os.path.basename(path))[0])
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    if edge_weight_type not in EDGE_WEIGHT_TYPES:
+        raise ValueError(
+            f"Unsupported EDGE_WEIGHT_TYPE '{edge_weight_type}', expected one of "
+            f"{EDGE_WEIGHT_TYPES}"
+        )
+
+    coord_lines = sections.get("NODE_COORD_SECTION") or sections.get("DISPLAY_DATA_SECTION")
+    coords = _parse_coords(coord_lines) if coord_lines else None
+    dimension = int(header["DIMENSION"]) if "DIMENSION" in header else len(coords)
+    if coords is not None and len(coords) != dimension:
+        raise ValueError(f"Expected {dimension} coordinates, found {len(coords)}")
+
+    distance_matrix = None
+    if edge_weight_type == "EXPLICIT":
+        weights = " ".join(sections.get("EDGE_WEIGHT_SECTION", [])).split()
+        distance_matrix = _explicit_matrix(
+            np.array(weights, dtype=np.float64),
+            dimension,
+            header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper()
+        )
+    elif coords is None:
+        raise ValueError(f"{path} has no NODE_COORD_SECTION")
+
+    return TSPInstance(name, edge_weight_type, dimension, coords, distance_matrix)
+
+
+def tsplib_distance_matrix(coords: np.ndarray, edge_weight_type: str) -> np.ndarray:
+    """
+    Computes the distance matrix of an instance with TSPLIB's distance functions, which round
+    distances to integers:
+
+    - EUC_2D: the Euclidean distance rounded to the nearest integer.
+    - CEIL_2D: the Euclidean distance rounded up.
+    - ATT: the pseudo-Euclidean distance of the att instances.
+    - GEO: the great-circle distance between coordinates in DDD.MM (degrees and minutes) format.
+
+    Args:
+        coords: The coordinates of each city.
+        edge_weight_type: One of the above edge weight types.
+
+    Returns:
+        A symmetric square matrix of the integer distances, stored as floating point.
+
+    Raises:
+        ValueError: If the edge weight type has no distance function.
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+
+    if edge_weight_type in ("EUC_2D", "CEIL_2D"):
+        distance_matrix = compute_distance_matrix(coords)
+        if edge_weight_type == "EUC_2D":
+            distance_matrix += 0.5
+            np.floor(distance_matrix, out=distance_matrix)
+        else:
+            np.ceil(distance_matrix, out=distance_matrix)
+        return distance_matrix
+
+    if edge_weight_type == "ATT":
+        x, y = coords[:, 0], coords[:, 1]
+
+        def block_distances(start: int, end: int) -> np.ndarray:
+            dx = x[start:end, None] - x[None, :]
+            dy = y[start:end, None] - y[None, :]
+            distances = np.sqrt((dx * dx + dy * dy) / 10.0)
+            rounded = np.floor(distances + 0.5)
+            return np.where(rounded < distances, rounded + 1.0, rounded)
+
+    elif edge_weight_type == "GEO":
+        # Degrees are truncated, as in the reference implementations, and minutes converted
+        degrees = np.trunc(coords)
+        radians = _GEO_PI * (degrees + 5.0 * (coords - degrees) / 3.0) / 180.0
+        latitude, longitude = radians[:, 0], radians[:, 1]
+
+        def block_distances(start: int, end: int) -> np.ndarray:
+            q1 = np.cos(longitude[start:end, None] - longitude[None, :])
+            q2 = np.cos(latitude[start:end, None] - latitude[None, :])
+            q3 = np.cos(latitude[start:end, None] + latitude[None, :])
+            cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+            return np.floor(_EARTH_RADIUS * np.arccos(cosine) + 1.0)
+
+    else:
+        raise ValueError(f"EDGE_WEIGHT_TYPE '{edge_weight_type}' has no distance function")
+
+    distance_matrix = blocked_distance_matrix(len(coords), block_distances)
+    np.fill_diagonal(distance_matrix, 0.0)
+    return distance_matrix
+
+
+def load_instance(
+    path: str,
+    distance_matrix: bool = True,
+    cache: bool = True
+) -> TSPInstance:
+    """
+    Loads a TSPLIB instance, parsing it on first use and caching the coordinates and distance
+    matrix as binary `.npy` files in a `<name>.cache` directory next to it. Later loads map the
+    cached arrays into memory read-only, so loading is near instant and processes loading the
+    same instance share its pages rather than each holding a copy.
+
+    The cache is rebuilt whenever the size or modification time of the TSPLIB file changes.
+
+    Args:
+        path: The path to the TSPLIB file.
+        distance_matrix: Whether to compute (and cache) the distance matrix of instances with
+            coordinates. Explicit instances always load their matrix (default: True).
+        cache: Whether to read from and write to the binary cache (default: True).
+
+    Returns:
+        The instance, whose arrays are read-only memory maps when loaded from the cache.
+    """
+    cache_dir = f"{os.path.splitext(path)[0]}.cache"
+    stat = os.stat(path)
+    source = {"version": _CACHE_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    if cache:
+        instance = _load_cached_instance(cache_dir, source, distance_matrix)
+        if instance is not None:
+            return instance
+
+    instance = parse_tsplib(path)
+    if distance_matrix and instance.distance_matrix is None:
+        instance = instance._replace(
+            distance_matrix=tsplib_distance_matrix(instance.coords, instance.edge_weight_type)
+        )
+    if cache:
+        _save_cached_instance(cache_dir, source, instance)
+    return instance
+
+
+def _parse_coords(lines: List[str]) -> np.ndarray:
+    """
+    Parses the lines of a coordinate section, each made of a node number and its coordinates,
+    ordering the coordinates by node number.
+
+    Args:
+        lines: The lines of the section.
+
+    Returns:
+        A 2-D array of the (x, y) coordinates of each node.
+    """
+    rows = np.array([line.split()[:3] for line in lines], dtype=np.float64)
+    order = np.argsort(rows[:, 0], kind="stable")
+    return np.ascontiguousarray(rows[order, 1:3])
+
+
+def _explicit_matrix(weights: np.ndarray, dimension: int, edge_weight_format: str) -> np.ndarray:
+    """
+    Builds a symmetric distance matrix from the weights of an EDGE_WEIGHT_SECTION.
+
+    Args:
+        weights: The weights, in the order they are listed.
+        dimension: The number of cities.
+        edge_weight_format: FULL_MATRIX or one of `EDGE_WEIGHT_FORMATS`.
+
+    Returns:
+        The distance matrix.
+
+    Raises:
+        ValueError: If the format is unsupported or the number of weights does not match it.
+    """
+    if edge_weight_format == "FULL_MATRIX":
+        if len(weights) != dimension * dimension:
+            raise ValueError(f"Expected {dimension * dimension} weights, found {len(weights)}")
+        return weights.reshape(dimension, dimension).copy()
+
+    if edge_weight_format not in EDGE_WEIGHT_FORMATS:
+        raise ValueError(
+            f"Unsupported EDGE_WEIGHT_FORMAT '{edge_weight_format}', expected FULL_MATRIX or one "
+            f"of {list(EDGE_WEIGHT_FORMATS)}"
+        )
+
+    triangle, offset = EDGE_WEIGHT_FORMATS[edge_weight_format]
+    if triangle == "upper":
+        rows, cols = np.triu_indices(dimension, offset)
+    else:
+        rows, cols = np.tril_indices(dimension, offset)
+    if len(weights) != len(rows):
+        raise ValueError(f"Expected {len(rows)} weights, found {len(weights)}")
+
+    distance_matrix = np.zeros((dimension, dimension), dtype=np.float64)
+    distance_matrix[rows, cols] = weights
+    distance_matrix[cols, rows] = weights
+    return distance_matrix
+
+
+def _load_cached_instance(
+    cache_dir: str,
+    source: Dict[str, int],
+    distance_matrix: bool
+) -> Optional[TSPInstance]:
+    """
+    Maps a cached instance into memory, if its cache is up to date and holds the arrays needed.
+
+    Args:
+        cache_dir: The directory of the cache.
+        source: The cache version, and the size and modification time of the TSPLIB file.
+        distance_matrix: Whether the distance matrix is needed.
+
+    Returns:
+        The instance, or None if it must be parsed again.
+    """
+    try:
+        with open(os.path.join(cache_dir, "meta.json"), 'r') as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if meta.get("source") != source or (distance_matrix and not meta["has_distance_matrix"]):
+        return None
+
+    arrays = {}
+    for key in ("coords", "distance_matrix"):
+        if meta[f"has_{key}"] and (key == "coords" or distance_matrix):
+            arrays[key] = np.load(os.path.join(cache_dir, f"{key}.npy"), mmap_mode="r")
+    return TSPInstance(
+        meta["name"],
+        meta["edge_weight_type"],
+        meta["dimension"],
+        arrays.get("coords"),
+        arrays.get("distance_matrix")
+    )
+
+
+def _save_cached_instance(cache_dir: str, source: Dict[str, int], instance: TSPInstance) -> None:
+    """
+    Saves an instance's arrays to its cache, writing the metadata last so a partially written
+    cache is never used.
+
+    Args:
+        cache_dir: The directory of the cache.
+        source: The cache version, and the size and modification time of the TSPLIB file.
+        instance: The instance to cache.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    for key in ("coords", "distance_matrix"):
+        array = getattr(instance, key)
+        if array is not None:
+            path = os.path.join(cache_dir, f"{key}.npy")
+            with open(f"{path}.tmp", 'wb') as file:
+                np.save(file, np.ascontiguousarray(array))
+            os.replace(f"{path}.tmp", path)
+
+    meta = {
+        "source": source,
+        "name": instance.name,
+        "edge_weight_type": instance.edge_weight_type,
+        "dimension": instance.dimension,
+        "has_coords": instance.coords is not None,
+        "has_distance_matrix": instance.distance_matrix is not None
+    }
+    meta_path = os.path.join(cache_dir, "meta.json")
+    with open(f"{meta_path}.tmp", 'w') as file:
+        json.dump(meta, file, indent=4)
+    os.replace(f"{meta_path}.tmp", meta_path)
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import subprocess
+import pandas as pd
+import matplotlib.pyplot as plt
+from src.utils.analysis import aggregate_results, ingest_results, plot_results
+from src.utils.results_store import ResultsStore
+
+
+def write_results(results_dir: str, population: int, best_distance: float) -> str:
+    """
+    Writes a results file named after its configuration.
+
+    Args:
+        results_dir: The directory of the results file.
+        population: The population size of the configuration.
+        best_distance: The best distance of the run.
+
+    Returns:
+        The path of the results file.
+    """
+    filename = f"pop{population}_0.8order_crossover_0.1inversion_mutation.json"
+    path = os.path.join(results_dir, filename)
+    with open(path, 'w') as file:
+        json.dump({
+            "computational_secs": 1.0,
+            "best_distance": best_distance,
+            "best_solution": [0, 1, 2],
+            "avg_fitness_per_gen": [best_distance + 1.0, best_distance],
+            "best_fitness_per_gen": [best_distance, best_distance]
+        }, file)
+    return path
+
+
+def test_ingest_results(tmp_path: str) -> None:
+    """
+    Tests that only new or changed results files are read, and that the runs of deleted results
+    files are removed.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    """
+    results_dir = str(tmp_path)
+    paths = [write_results(results_dir, population, 100.0 - population) for population in (10, 20)]
+    with open(os.path.join(results_dir, "notes.json"), 'w') as file:
+        file.write("{}")
+
+    with ResultsStore(os.path.join(results_dir, "results.db")) as store:
+        assert ingest_results(store, results_dir) == 2
+        assert ingest_results(store, results_dir) == 0
+
+        write_results(results_dir, 30, 50.0)
+        write_results(results_dir, 10, 60.0)
+        os.utime(paths[0], ns=(0, 0))
+        assert ingest_results(store, results_dir) == 2
+        assert store.best_run()["population"] == 30
+        name = os.path.splitext(os.path.basename(paths[0]))[0]
+        assert store.load_run(name)["best_distance"] == 60.0
+
+        os.remove(paths[1])
+        assert ingest_results(store, results_dir) == 0
+        assert [run["population"] for run in store.aggregate()] == [30, 10]
+
+
+def test_aggregate_results(tmp_path: str) -> None:
+    """
+    Tests that the aggregate CSV file lists every configuration ordered by best distance.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    """
+    results_dir = str(tmp_path)
+    for population, best_distance in ((10, 30.0), (20, 10.0), (30, 20.0)):
+        write_results(results_dir, population, best_distance)
+    aggregated_path = os.path.join(results_dir, "aggregated.csv")
+
+    aggregate_results(aggregated_path, results_dir)
+    aggregated = pd.read_csv(aggregated_path)
+
+    assert list(aggregated["population"]) == [20, 30, 10]
+    assert list(aggregated["best_distance"]) == [10.0, 20.0, 30.0]
+    assert set(aggregated["crossover_func"]) == {"order_crossover"}
+
+
+def test_batch_plotting(tmp_path: str) -> None:
+    """
+    Tests that batch plotting renders the fitness plots of every run and the parameter plots, and
+    leaves no figures open.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    """
+    results_dir = os.path.join(tmp_path, "results", "test")
+    os.makedirs(results_dir)
+    for population, best_distance in ((10, 30.0), (20, 10.0)):
+        write_results(results_dir, population, best_distance)
+
+    assert plot_results(results_dir, "test", workers=2) == 2
+
+    plots = os.listdir(os.path.join(tmp_path, "plots", "test"))
+    assert sum(plot.endswith("_avg.png") for plot in plots) == 2
+    assert sum(plot.endswith("_best.png") for plot in plots) == 2
+    assert sum(plot.startswith("10_best_distance_") for plot in plots) == 6
+    assert plt.get_fignums() == []
+
+
+def test_engine_imports_without_plotting() -> None:
+    """
+    Tests that the genetic algorithm and sweeps import without matplotlib or pandas.
+    """
+    code = (
+        "import sys, src.main, src.utils.sweep, src.ga.genetic_algorithm; "
+        "sys.exit(any(m in sys.modules for m in ('matplotlib', 'pandas')))"
+    )
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
@@ -0,0 +1,64 @@
+import os
+import numpy as np
+from src.benchmark import run_benchmarks, instance_cases
+from src.utils.benchmark import find_regressions
+
+
+def test_find_regressions() -> None:
+    """
+    Tests that drops in throughput and growth in peak memory beyond the tolerance are flagged, and
+    that benchmarks missing from the baseline are ignored.
+    """
+    baseline = {
+        "fast": {"ops_per_sec": 100.0, "peak_bytes": 10000},
+        "slow": {"ops_per_sec": 100.0, "peak_bytes": 10000},
+        "large": {"ops_per_sec": 100.0, "peak_bytes": 10000}
+    }
+    results = {
+        "fast": {"ops_per_sec": 85.0, "peak_bytes": 11000},
+        "slow": {"ops_per_sec": 75.0, "peak_bytes": 10000},
+        "large": {"ops_per_sec": 100.0, "peak_bytes": 20000},
+        "new": {"ops_per_sec": 1.0, "peak_bytes": 1}
+    }
+
+    regressions = find_regressions(results, baseline, tolerance=0.2)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("slow:") and regressions[1].startswith("large:")
+
+
+def test_run_benchmarks(tmp_path: str) -> None:
+    """
+    Tests that benchmarks run on a small instance, save a baseline, and compare against it.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    """
+    kwargs = {
+        "curr_dir": str(tmp_path),
+        "sizes": [20],
+        "datasets": ["missing"],
+        "ga_generations": 2,
+        "min_secs": 0.001
+    }
+    results, _ = run_benchmarks(save_baseline=True, **kwargs)
+    assert "genetic_algorithm_2_generations/random20" in results
+    assert "tournament_selection/pop400" in results
+    assert all(result["ops_per_sec"] > 0 for result in results.values())
+    assert os.path.exists(os.path.join(tmp_path, "data/benchmarks/baseline.json"))
+
+    _, regressions = run_benchmarks(tolerance=float("inf"), **kwargs)
+    assert regressions == []
+
+
+def test_mutation_cases_leave_shared_tour() -> None:
+    """
+    Tests that the mutation cases mutate their own copy of the tour, so the cases measured after
+    them see the same tour.
+    """
+    coords = np.random.default_rng(0).uniform(0, 100, (30, 2))
+    cases = instance_cases(coords, max_matrix_cities=100, ga_generations=1)
+    length = cases["fitness"]()
+    for _ in range(10):
+        cases["inversion_mutation"]()
+        cases["relocation_mutation"]()
+    assert cases["fitness"]() == length
@@ -1,6 +1,12 @@
 import pytest
 import random
-from src.ga.crossover import order_crossover, partially_mapped_crossover
+import numpy as np
+from src.ga.crossover import (
+    order_crossover,
+    partially_mapped_crossover,
+    random_cut_points,
+    BATCH_CROSSOVER_FUNCS
+)
 
 
 def test_order_crossover(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -41,3 +47,44 @@ def test_partially_mapped_crossover(monkeypatch: pytest.MonkeyPatch) -> None:
     child1, child2 = partially_mapped_crossover(parent1, parent2)
     assert child1 == expected_child1
     assert child2 == expected_child2
+
+
+def test_crossover_produces_permutations() -> None:
+    """
+    Tests that both crossover operators always produce valid permutations of the parents' cities
+    over many random parents and cut indices.
+    """
+    for crossover_func in [order_crossover, partially_mapped_crossover]:
+        for _ in range(200):
+            n = random.randint(2, 20)
+            parent1 = random.sample(range(n), n)
+            parent2 = random.sample(range(n), n)
+
+            child1, child2 = crossover_func(parent1, parent2)
+            assert sorted(child1) == list(range(n))
+            assert sorted(child2) == list(range(n))
+
+
+def test_batch_crossover(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that each batch crossover kernel matches its per-pair operator row by row, by mocking
+    `random.sample` to return the cut indices drawn for each row.
+
+    Args:
+        monkeypatch: A pytest fixture used to mock the `random.sample` function.
+    """
+    rng = np.random.default_rng(0)
+    n = 15
+    parents1 = np.array([rng.permutation(n) for _ in range(50)])
+    parents2 = np.array([rng.permutation(n) for _ in range(50)])
+    starts, ends = random_cut_points(rng, 50, n)
+
+    for crossover_func, (batch_func, _) in BATCH_CROSSOVER_FUNCS.items():
+        children1, children2 = batch_func(parents1, parents2, starts, ends)
+
+        for i in range(len(parents1)):
+            monkeypatch.setattr(random, "sample", lambda a, b: [starts[i], ends[i]])
+            child1, child2 = crossover_func(parents1[i].tolist(), parents2[i].tolist())
+
+            assert children1[i].tolist() == child1
+            assert children2[i].tolist() == child2
@@ -0,0 +1,61 @@
+import random
+import numpy as np
+from src.ga.distances import CoordinateDistances
+from src.ga.fitness import compute_distance_matrix, fitness, evaluate_population
+from src.ga.initialisation import greedy_heuristic
+from src.ga.local_search import neighbour_lists
+from tests.test_genetic_algorithm import make_ga
+
+
+def test_coordinate_distances() -> None:
+    """
+    Tests that on-demand distances match the distance matrix for every kind of indexing, and that
+    the nearest neighbours kept match those found from the matrix.
+    """
+    rng = np.random.default_rng(0)
+    coords = np.concatenate([rng.uniform(0, 1000, (100, 2)), rng.normal(0, 1, (100, 2))])
+    distances = CoordinateDistances(coords, num_neighbours=8)
+    distance_matrix = compute_distance_matrix(coords)
+    population = np.array([rng.permutation(len(coords)) for _ in range(5)])
+
+    assert len(distances) == len(distance_matrix)
+    assert np.array_equal(distances[7], distance_matrix[7])
+    assert np.array_equal(distances[10:20], distance_matrix[10:20])
+    assert distances.item(3, 150) == distance_matrix.item(3, 150)
+    assert fitness(population[0], distances) == fitness(population[0], distance_matrix)
+    assert np.array_equal(
+        evaluate_population(population, distances),
+        evaluate_population(population, distance_matrix)
+    )
+    assert np.array_equal(distances.neighbours, neighbour_lists(distance_matrix, 8))
+
+
+def test_greedy_heuristic_on_demand() -> None:
+    """
+    Tests that the greedy heuristic builds the same tour from on-demand distances, using the
+    nearest neighbours kept, as from the distance matrix.
+    """
+    rng = np.random.default_rng(1)
+    coords = rng.uniform(0, 1000, (300, 2))
+    distances = CoordinateDistances(coords, num_neighbours=5)
+    distance_matrix = compute_distance_matrix(coords)
+
+    for seed in range(3):
+        random.seed(seed)
+        expected = greedy_heuristic(len(coords), distance_matrix)
+        random.seed(seed)
+        assert greedy_heuristic(len(coords), distances) == expected
+
+
+def test_genetic_algorithm_on_demand() -> None:
+    """
+    Tests that a run with on-demand distances matches a run with the distance matrix.
+    """
+    matrix = make_ga(local_search_mode="elite", greedy_rate=0.5)
+    on_demand = make_ga(local_search_mode="elite", greedy_rate=0.5, distance_mode="on_demand")
+    matrix.run()
+    on_demand.run()
+
+    assert isinstance(on_demand.distance_matrix, CoordinateDistances)
+    assert on_demand.best_fitness_per_gen == matrix.best_fitness_per_gen
+    assert on_demand.best_solution == matrix.best_solution
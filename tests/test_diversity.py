@@ -0,0 +1,61 @@
+import numpy as np
+from src.ga.diversity import DiversityTracker
+
+
+def test_edge_entropy() -> None:
+    """
+    Tests that the edge entropy is 0 for a population of one tour, however it is rotated or
+    reversed, and close to 1 for a population of random tours.
+    """
+    rng = np.random.default_rng(0)
+    tour = rng.permutation(200)
+    same = np.array([tour, np.roll(tour, 7), tour[::-1], np.roll(tour[::-1], 3)] * 5)
+    random_tours = np.array([rng.permutation(200) for _ in range(20)])
+
+    assert np.isclose(DiversityTracker(200, 20).measure(same), 0.0)
+    assert DiversityTracker(200, 20).measure(random_tours) > 0.9
+
+
+def test_incremental_measure() -> None:
+    """
+    Tests that measurements carried through selection, with only changed individuals measured
+    again, match measuring the population from scratch.
+    """
+    rng = np.random.default_rng(0)
+    population = np.array([rng.permutation(50) for _ in range(20)])
+    tracker = DiversityTracker(50, 20, sample_size=10)
+    tracker.measure(population)
+
+    for _ in range(5):
+        indices = rng.integers(0, 20, 20)
+        population = population[indices]
+        tracker.select(indices)
+        changed = rng.choice(20, 5, replace=False)
+        for row in changed:
+            population[row] = rng.permutation(50)
+        tracker.invalidate(changed)
+
+        assert tracker.measure(population) == DiversityTracker(50, 20, 10).measure(population)
+    assert tracker.stats() == {"measured": 45, "carried": 75, "hashed": 0}
+
+
+def test_distinct_tours() -> None:
+    """
+    Tests that distinct tours are counted up to rotation and direction, that only changed
+    individuals are hashed again, and that stored hashes are not recomputed.
+    """
+    rng = np.random.default_rng(0)
+    tour = rng.permutation(30)
+    population = np.array([tour, np.roll(tour, 5), tour[::-1], rng.permutation(30)])
+    tracker = DiversityTracker(30, 4, sample_size=0)
+    assert tracker.distinct_tours(population) == 0.5
+
+    population[1] = rng.permutation(30)
+    tracker.invalidate(np.array([1]))
+    assert tracker.distinct_tours(population) == 0.75
+
+    population[2] = rng.permutation(30)
+    tracker.invalidate(np.array([2]))
+    tracker.store_hashes(np.array([2]), tracker.hasher.hash_tours(population[2:3]))
+    assert tracker.distinct_tours(population) == 1.0
+    assert tracker.stats()["hashed"] == 5
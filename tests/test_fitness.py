@@ -0,0 +1,55 @@
+import numpy as np
+from src.ga.fitness import (
+    euclidean_distance,
+    compute_distance_matrix,
+    fitness,
+    evaluate_population
+)
+
+
+def test_compute_distance_matrix() -> None:
+    """
+    Tests that the vectorised distance matrix matches pairwise Euclidean distances, is symmetric
+    and respects the requested dtype.
+    """
+    rng = np.random.default_rng(0)
+    coords = [tuple(city) for city in rng.uniform(0, 1000, size=(30, 2))]
+
+    distance_matrix = compute_distance_matrix(coords)
+    expected = [[euclidean_distance(city1, city2) for city2 in coords] for city1 in coords]
+
+    assert distance_matrix.dtype == np.float64
+    assert distance_matrix.flags["C_CONTIGUOUS"]
+    assert np.allclose(distance_matrix, expected)
+    assert np.array_equal(distance_matrix, distance_matrix.T)
+    assert np.all(np.diag(distance_matrix) == 0)
+
+    distance_matrix32 = compute_distance_matrix(coords, np.float32)
+    assert distance_matrix32.dtype == np.float32
+    assert np.allclose(distance_matrix32, expected, rtol=1e-6)
+
+
+def test_fitness() -> None:
+    """
+    Tests the fitness function on a unit square, where the closing edge must be included.
+    """
+    coords = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]
+    distance_matrix = compute_distance_matrix(coords)
+
+    assert fitness([0, 1, 2, 3], distance_matrix) == 4.0
+    assert np.isclose(fitness([0, 2, 1, 3], distance_matrix), 2 + 2 * 2 ** 0.5)
+
+
+def test_evaluate_population() -> None:
+    """
+    Tests that batched population evaluation matches the per-individual fitness function.
+    """
+    rng = np.random.default_rng(1)
+    distance_matrix = compute_distance_matrix(rng.uniform(0, 1000, size=(25, 2)))
+    population = np.array([rng.permutation(25) for _ in range(10)])
+
+    scores = evaluate_population(population, distance_matrix)
+    expected = [fitness(individual, distance_matrix) for individual in population]
+
+    assert scores.shape == (10,)
+    assert np.allclose(scores, expected)
@@ -0,0 +1,40 @@
+import numpy as np
+from src.ga.fitness_cache import FitnessCache
+
+
+def test_hash_tours() -> None:
+    """
+    Tests that rotated and reversed tours share a hash, and that different tours do not.
+    """
+    rng = np.random.default_rng(0)
+    tour = rng.permutation(50)
+    other = tour.copy()
+    other[[3, 4]] = other[[4, 3]]
+    cache = FitnessCache(50, 10)
+
+    hashes = cache.hash_tours(np.array([tour, np.roll(tour, 7), tour[::-1], other]))
+    assert hashes[0] == hashes[1] == hashes[2]
+    assert hashes[0] != hashes[3]
+
+
+def test_lookup_and_eviction() -> None:
+    """
+    Tests that cached scores are found, and that the least recently used tour is evicted when the
+    cache is full.
+    """
+    cache = FitnessCache(5, 2)
+    hashes = np.array([1, 2, 3], dtype=np.uint64)
+
+    cache.store(hashes[:2], np.array([10.0, 20.0]))
+    assert cache.lookup(hashes[:1])[0] == 10.0
+    cache.store(hashes[2:], np.array([30.0]))
+
+    scores = cache.lookup(hashes)
+    assert scores[0] == 10.0 and np.isnan(scores[1]) and scores[2] == 30.0
+    assert cache.stats() == {
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+        "hit_rate": 0.75,
+        "size": 2
+    }
@@ -0,0 +1,429 @@
+import os
+import json
+import random
+import warnings
+import numpy as np
+import pytest
+from typing import List, Any
+from src.ga.crossover import order_crossover, partially_mapped_crossover
+from src.ga.mutation import inversion_mutation
+from src.ga.fitness import evaluate_population
+from src.ga.genetic_algorithm import GeneticAlgorithm, PHASES
+from src.ga.population_cache import PopulationCache
+from src.ga.diversity import DiversityTracker
+from src.ga.fitness_cache import FitnessCache
+
+
+def make_ga(**kwargs: Any) -> GeneticAlgorithm:
+    """
+    Builds a genetic algorithm on a small random instance.
+
+    Args:
+        kwargs: Keyword arguments overriding the defaults of `GeneticAlgorithm`.
+
+    Returns:
+        The genetic algorithm.
+    """
+    rng = random.Random(0)
+    coords = [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(20)]
+    params = {
+        "population_size": 30,
+        "crossover_rate": 0.8,
+        "crossover_func": order_crossover,
+        "mutation_rate": 0.2,
+        "mutation_func": inversion_mutation,
+        "generations": 40,
+        "elitism_rate": 0.1,
+        "tournament_size": 3,
+        "greedy_rate": 0.1,
+        "early_stop_threshold": 1000,
+        "seed": 0
+    }
+    params.update(kwargs)
+    return GeneticAlgorithm(coords, **params)
+
+
+def test_checkpoint_resume(tmp_path: str) -> None:
+    """
+    Tests that a run resumed from a checkpoint continues exactly as the uninterrupted run would.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    """
+    checkpoint_path = os.path.join(tmp_path, "run.checkpoint.npz")
+
+    uninterrupted = make_ga()
+    uninterrupted.run()
+
+    interrupted = make_ga(generations=20, checkpoint_path=checkpoint_path, checkpoint_interval=10)
+    interrupted.run()
+
+    resumed = make_ga(seed=1)
+    resumed.load_checkpoint(checkpoint_path)
+    assert resumed.generation == 20
+    resumed.run()
+
+    assert resumed.best_fitness_per_gen == uninterrupted.best_fitness_per_gen
+    assert resumed.avg_fitness_per_gen == uninterrupted.avg_fitness_per_gen
+    assert resumed.best_solution == uninterrupted.best_solution
+
+
+def test_checkpoint_resume_restarts(tmp_path: str) -> None:
+    """
+    Tests that a run with restarts resumed from a checkpoint at any generation continues exactly
+    as the uninterrupted run would, including when it converges and restarts.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    """
+    checkpoint_path = os.path.join(tmp_path, "run.checkpoint.npz")
+    params = {
+        "generations": 60,
+        "convergence_action": "restart",
+        "convergence_entropy": 1.0,
+        "convergence_patience": 3
+    }
+    uninterrupted = make_ga(**params)
+    uninterrupted.run()
+    assert len(uninterrupted.restarts) > 1
+
+    for generation in range(1, 60):
+        interrupted = make_ga(**params)
+        interrupted.run(until=generation)
+        interrupted.save_checkpoint(checkpoint_path)
+
+        resumed = make_ga(**params)
+        resumed.load_checkpoint(checkpoint_path)
+        resumed.run()
+        assert resumed.restarts == uninterrupted.restarts
+        assert resumed.best_fitness_per_gen == uninterrupted.best_fitness_per_gen
+        assert resumed.evaluation_counts == uninterrupted.evaluation_counts
+
+
+def test_double_buffered_population() -> None:
+    """
+    Tests that generations are built in the same two preallocated compact buffers, and that the
+    population remains made of valid tours with correct cached fitness.
+    """
+    ga = make_ga(local_search_mode="elite")
+    buffers = {id(ga.population), id(ga._next_population)}
+    assert ga.population.dtype == np.int16
+
+    ga.run()
+    assert {id(ga.population), id(ga._next_population)} == buffers
+
+    num_cities = ga.population.shape[1]
+    assert (np.sort(ga.population, axis=1) == np.arange(num_cities)).all()
+    scored = ~np.isnan(ga.fitness_scores)
+    expected = evaluate_population(ga.population, ga.distance_matrix)
+    assert np.allclose(ga.fitness_scores[scored], expected[scored])
+
+
+def test_iter_run_telemetry(tmp_path: str) -> None:
+    """
+    Tests that each generation's statistics are yielded and streamed to the telemetry file, and
+    that a run stopped by its callback can be continued.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    """
+    telemetry_path = os.path.join(tmp_path, "run.telemetry.jsonl")
+    ga = make_ga(telemetry_path=telemetry_path)
+    stats = list(ga.iter_run())
+
+    assert [s.generation for s in stats] == list(range(ga.generations))
+    assert [s.best_fitness for s in stats] == ga.best_fitness_per_gen
+    assert [s.avg_fitness for s in stats] == ga.avg_fitness_per_gen
+    assert all(0 < s.diversity <= 1 and set(s.phase_secs) == set(PHASES) for s in stats)
+
+    with open(telemetry_path, 'r') as file:
+        lines = [json.loads(line) for line in file]
+    assert [line["best_fitness"] for line in lines] == ga.best_fitness_per_gen
+
+    streamed = make_ga(keep_history=False)
+    streamed.run(callback=lambda s: s.generation == 9)
+    assert streamed.generation == 10 and streamed.best_fitness_per_gen == []
+    streamed.run()
+    assert streamed.best_distance == ga.best_distance
+
+
+def test_profile(tmp_path: str) -> None:
+    """
+    Tests that profiling records every phase, sampler and operator call and is saved with the
+    results, and that results have no profile when profiling is disabled.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    """
+    results_path = os.path.join(tmp_path, "results.json")
+    ga = make_ga(profile="operators", mutation_rate=1.0)
+    ga.run()
+    ga.save_results(results_path)
+
+    with open(results_path, 'r') as file:
+        profile = json.load(file)["profile"]
+    for phase in ["evaluation", "elitism", "tournament", "replacement", "crossover", "mutation"]:
+        assert profile[phase]["calls"] == ga.generations
+    assert profile["mutation:batch_inversion_mutation"]["calls"] == ga.generations
+    assert profile["mutation:random_cut_points"]["calls"] == ga.generations
+
+    # Profiling phases times the samplers apart from the operator phases, but not the kernels
+    ga = make_ga(profile="phases", mutation_rate=1.0)
+    ga.run()
+    profile = ga.results()["profile"]
+    assert profile["mutation:random_cut_points"]["calls"] == ga.generations
+    assert "mutation:batch_inversion_mutation" not in profile
+
+    ga = make_ga()
+    ga.run()
+    ga.save_results(results_path)
+    with open(results_path, 'r') as file:
+        assert "profile" not in json.load(file)
+
+
+def test_fitness_cache() -> None:
+    """
+    Tests that fitness scores found in the fitness cache match evaluating the individuals.
+    """
+    ga = make_ga(fitness_cache_size=50, crossover_func=partially_mapped_crossover)
+    ga.run()
+    fitness_scores = ga.evaluate()
+
+    assert ga.fitness_cache.hits > 0
+    assert np.allclose(fitness_scores, evaluate_population(ga.population, ga.distance_matrix))
+    assert sum(ga.evaluation_counts.values()) == len(ga.population) * (ga.generations + 1)
+
+
+def test_population_cache() -> None:
+    """
+    Tests that runs sharing a population cache start from the same population, built once, and
+    run exactly as they would without the cache.
+    """
+    cache = PopulationCache(max_size=2)
+    first = make_ga(population_cache=cache)
+    second = make_ga(crossover_func=partially_mapped_crossover, population_cache=cache)
+    assert np.array_equal(first.population, second.population)
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    second.run()
+    uncached = make_ga(crossover_func=partially_mapped_crossover)
+    uncached.run()
+    assert second.best_fitness_per_gen == uncached.best_fitness_per_gen
+    assert second.best_solution == uncached.best_solution
+
+    make_ga(population_size=40, population_cache=cache)
+    make_ga(seed=1, population_cache=cache)
+    make_ga(seed=None, population_cache=cache)
+    assert cache.stats() == {"hits": 1, "misses": 3, "size": 2}
+
+    # Populations are only shared within a backend, which falls back to python without Numba
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        compiled = make_ga(backend="numba", population_cache=cache)
+    assert cache.stats()["hits"] == 1 + (compiled.backend == "python")
+
+
+def test_diversity_monitor() -> None:
+    """
+    Tests that monitoring diversity reports the edge entropy of each generation without changing
+    the run, and that the measurements carried between generations stay up to date.
+    """
+    stats = []
+    monitored = make_ga(convergence_action="monitor", local_search_mode="offspring")
+    monitored.run(callback=stats.append)
+    unmonitored = make_ga(local_search_mode="offspring")
+    unmonitored.run()
+
+    assert monitored.best_fitness_per_gen == unmonitored.best_fitness_per_gen
+    assert all(0 <= s.edge_entropy <= 1 for s in stats)
+    assert stats[0].edge_entropy > stats[-1].edge_entropy
+    assert monitored.results()["diversity"]["restarts"] == []
+
+    fresh = DiversityTracker(20, 30, seed=0)
+    assert monitored.diversity.measure(monitored.population) == fresh.measure(monitored.population)
+
+
+def test_convergence_stop() -> None:
+    """
+    Tests that a run stops once the population has stayed converged without improving for
+    `convergence_patience` generations.
+    """
+    ga = make_ga(
+        generations=500,
+        convergence_action="stop",
+        convergence_entropy=1.0,
+        convergence_patience=5
+    )
+    ga.run()
+
+    assert ga.stopped_early and ga.generation < 500
+    assert ga.stagnant_count == 5 and ga.no_improvement_count >= 5
+    assert ga.results()["diversity"]["converged_generation"] == ga.generation
+
+
+def test_convergence_restart() -> None:
+    """
+    Tests that restarts keep the elite, re-seed the rest of the population with fitness matching
+    evaluation, and leave the count of generations without improvement to stop the run.
+    """
+    ga = make_ga(
+        generations=500,
+        early_stop_threshold=30,
+        convergence_action="restart",
+        convergence_entropy=1.0,
+        convergence_patience=3
+    )
+    ga.run(until=100)
+
+    assert len(ga.restarts) > 1
+    assert np.allclose(ga.evaluate(), evaluate_population(ga.population, ga.distance_matrix))
+
+    ga.run()
+    assert ga.stopped_early and ga.no_improvement_count == 30
+
+
+def test_unknown_convergence_action() -> None:
+    """
+    Tests that an unknown convergence action is rejected.
+    """
+    with pytest.raises(ValueError):
+        make_ga(convergence_action="reset")
+
+
+def test_custom_mutation() -> None:
+    """
+    Tests that mutation functions taking only the individual, or returning None, still work, with
+    mutated individuals evaluated again.
+    """
+    def swap_mutation(individual: List[int]) -> None:
+        i, j = random.sample(range(len(individual)), 2)
+        individual[i], individual[j] = individual[j], individual[i]
+
+    def swap_mutation_without_delta(individual: List[int], distance_matrix: Any = None) -> None:
+        swap_mutation(individual)
+
+    for mutation_func in (swap_mutation, swap_mutation_without_delta):
+        ga = make_ga(mutation_func=mutation_func, mutation_rate=0.5)
+        ga.run()
+        assert np.allclose(ga.evaluate(), evaluate_population(ga.population, ga.distance_matrix))
+        assert np.isfinite(ga.best_distance)
+
+
+def test_diversity_counts_distinct_tours() -> None:
+    """
+    Tests that diversity counts distinct tours rather than distinct fitness scores, so different
+    tours of the same length are still counted apart, and rotated or reversed tours are not.
+    """
+    ga = make_ga(distance_matrix=np.ones((20, 20)), greedy_rate=0.0)
+    assert next(ga.iter_run()).diversity == 1.0
+
+    ga = make_ga(greedy_rate=0.0)
+    tour = ga.population[0].copy()
+    ga.population[:10] = tour
+    ga.population[10:20] = np.roll(tour, 5)
+    ga.population[20:] = tour[::-1]
+    ga.fitness_scores[:] = np.nan
+    assert next(ga.iter_run()).diversity == 1 / len(ga.population)
+
+
+def test_checkpoint_settings_mismatch(tmp_path: str) -> None:
+    """
+    Tests that a checkpoint saved by a run with other settings is refused, leaving the run
+    unchanged.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    """
+    checkpoint_path = os.path.join(tmp_path, "run.checkpoint.npz")
+    ga = make_ga(generations=10)
+    ga.run()
+    ga.save_checkpoint(checkpoint_path)
+
+    other = make_ga(mutation_rate=0.5)
+    population = other.population.copy()
+    with pytest.raises(ValueError):
+        other.load_checkpoint(checkpoint_path)
+    assert other.generation == 0
+    assert np.array_equal(other.population, population)
+    with pytest.raises(ValueError):
+        make_ga(generations=5).load_checkpoint(checkpoint_path)
+
+
+def test_convergence_restart_without_elitism() -> None:
+    """
+    Tests that without elitism, restarts keep the best individual of the converged generation and
+    seed the rest of the population from it.
+    """
+    ga = make_ga(
+        generations=200,
+        elitism_rate=0.0,
+        convergence_action="restart",
+        convergence_entropy=1.0,
+        convergence_patience=3
+    )
+    ga.run()
+
+    assert len(ga.restarts) > 1
+    for generation in ga.restarts:
+        if generation + 1 < len(ga.best_fitness_per_gen):
+            assert ga.best_fitness_per_gen[generation + 1] <= ga.best_fitness_per_gen[generation]
+
+
+def test_invalid_elitism_rate() -> None:
+    """
+    Tests that elitism rates leaving no individuals to select by tournament are rejected.
+    """
+    for elitism_rate in (1.0, 1.5, -0.1):
+        with pytest.raises(ValueError):
+            make_ga(elitism_rate=elitism_rate)
+
+
+def test_diversity_measured_on_demand() -> None:
+    """
+    Test that the fraction of distinct tours is only measured when the statistics are used, and is
+    timed as part of the diversity phase.
+    """
+    ga = make_ga()
+    stats = next(ga.iter_run(measure_diversity=False))
+    assert stats.diversity is None and stats.phase_secs["diversity"] == 0.0
+
+    stats = next(ga.iter_run())
+    assert 0 < stats.diversity <= 1 and stats.phase_secs["diversity"] > 0.0
+
+
+def test_distinct_tours_carried() -> None:
+    """
+    Test that the fraction of distinct tours, with hashes carried between generations and shared
+    with the fitness cache, matches hashing the whole population each generation.
+    """
+    ga = make_ga(fitness_cache_size=50, local_search_mode="elite")
+    evaluated = []
+    evaluate = ga.evaluate
+    ga.evaluate = lambda: evaluated.append(ga.population.copy()) or evaluate()
+
+    hasher = FitnessCache(20, 0)
+    for stats in ga.iter_run(until=20):
+        hashes = hasher.hash_tours(evaluated[-1])
+        assert stats.diversity == len(np.unique(hashes)) / len(hashes)
+
+
+def test_seed_leaves_random_module() -> None:
+    """
+    Test that a seeded run neither reseeds nor advances the global random module, and that runs
+    with per-individual operators, which draw from it, are reproducible whatever else uses it.
+    """
+    def crossover(parent1: List[int], parent2: List[int]) -> Any:
+        return order_crossover(parent1, parent2)
+
+    random.seed(123)
+    expected = random.random()
+    random.seed(123)
+    ga = make_ga(crossover_func=crossover)
+    ga.run()
+    assert random.random() == expected
+
+    random.random()
+    rerun = make_ga(crossover_func=crossover)
+    random.random()
+    rerun.run()
+    assert rerun.best_fitness_per_gen == ga.best_fitness_per_gen
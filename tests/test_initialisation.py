@@ -0,0 +1,38 @@
+import random
+import numpy as np
+from src.ga.fitness import compute_distance_matrix
+from src.ga.initialisation import greedy_heuristic, spatial_greedy_heuristic, init_population
+from src.ga.spatial import SpatialGrid
+
+
+def test_spatial_greedy_heuristic() -> None:
+    """
+    Tests that the spatial greedy heuristic builds the same tour as the distance matrix greedy
+    heuristic from the same start city, on uniform and clustered instances.
+    """
+    rng = np.random.default_rng(0)
+    uniform = rng.uniform(0, 1000, size=(300, 2))
+    clustered = np.concatenate([rng.normal(0, 1, (150, 2)), rng.normal(1000, 1, (150, 2))])
+
+    for coords in [uniform, clustered]:
+        distance_matrix = compute_distance_matrix(coords)
+        grid = SpatialGrid(coords)
+
+        for seed in range(3):
+            random.seed(seed)
+            expected = greedy_heuristic(len(coords), distance_matrix)
+            random.seed(seed)
+            assert spatial_greedy_heuristic(grid) == expected
+
+
+def test_init_population_spatial() -> None:
+    """
+    Tests that a population initialised with the spatial greedy heuristic is made of valid tours.
+    """
+    rng = np.random.default_rng(1)
+    coords = rng.uniform(0, 1000, size=(50, 2))
+    population = init_population(10, 50, compute_distance_matrix(coords), 1.0, coords)
+
+    assert len(population) == 10
+    for individual in population:
+        assert sorted(individual) == list(range(50))
@@ -0,0 +1,87 @@
+import random
+import pytest
+import numpy as np
+from typing import List, Tuple, Any
+from src.ga.crossover import order_crossover
+from src.ga.mutation import inversion_mutation
+from src.ga.fitness import fitness, compute_distance_matrix
+from src.ga.island import IslandModel, ring_topology, fully_connected_topology
+
+
+def test_topologies() -> None:
+    """
+    Tests the destination islands of each migration topology.
+    """
+    assert ring_topology(3) == [[1], [2], [0]]
+    assert fully_connected_topology(3) == [[1, 2], [0, 2], [0, 1]]
+
+
+@pytest.mark.parametrize("topology", ["ring", "fully_connected"])
+def test_island_model(topology: str) -> None:
+    """
+    Tests that the island model runs to completion and reports a valid best tour whose distance
+    matches its fitness.
+
+    Args:
+        topology: The migration topology.
+    """
+    rng = random.Random(0)
+    coords = [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(20)]
+    ga_kwargs = {
+        "population_size": 20,
+        "crossover_rate": 0.8,
+        "crossover_func": order_crossover,
+        "mutation_rate": 0.2,
+        "mutation_func": inversion_mutation,
+        "generations": 30,
+        "elitism_rate": 0.1,
+        "tournament_size": 3,
+        "greedy_rate": 0.0,
+        "early_stop_threshold": 1000
+    }
+
+    model = IslandModel(coords, 3, 10, 2, ga_kwargs, topology=topology, seed=0)
+    model.run()
+
+    assert sorted(model.best_solution) == list(range(20))
+    assert model.best_distance == pytest.approx(
+        fitness(model.best_solution, compute_distance_matrix(coords))
+    )
+    assert model.best_distance == min(model.island_best_distances)
+    assert len(model.best_fitness_per_gen) == 30
+
+
+class RecordingConnection:
+    """
+    A stand-in for an island's connection that records the messages sent to it.
+    """
+    def __init__(self):
+        """
+        Initialises the connection with no messages.
+        """
+        self.sent: List[Tuple[Any, ...]] = []
+
+    def send(self, message: Tuple[Any, ...]) -> None:
+        """
+        Records a message.
+
+        Args:
+            message: The message sent.
+        """
+        self.sent.append(message)
+
+
+def test_migration_skips_finished_islands() -> None:
+    """
+    Tests that islands that are done still send migrants but receive none.
+    """
+    model = IslandModel([(0.0, 0.0), (1.0, 1.0)], 3, 10, 1, {"generations": 30},
+                        topology="fully_connected", distance_matrix=np.zeros((2, 2)))
+    connections = [RecordingConnection() for _ in range(3)]
+    replies = [(np.array([[0, 1]]), np.array([float(i)]), i == 1) for i in range(3)]
+    model._migrate(connections, replies)
+
+    assert connections[1].sent == []
+    for destination in (0, 2):
+        (command, individuals, scores), = connections[destination].sent
+        assert command == "immigrate" and 1.0 in scores and len(individuals) == 2
@@ -0,0 +1,213 @@
+import random
+import pytest
+import numpy as np
+from src.ga.fitness import compute_distance_matrix, evaluate_population
+from src.ga.initialisation import greedy_heuristic
+from src.ga.crossover import (
+    order_crossover,
+    partially_mapped_crossover,
+    random_cut_points,
+    batch_order_crossover,
+    batch_partially_mapped_crossover
+)
+from src.ga.mutation import (
+    random_relocations,
+    batch_inversion_mutation,
+    batch_relocation_mutation
+)
+from src.ga.jit import (
+    JIT_AVAILABLE,
+    jit_evaluate_population,
+    jit_batch_order_crossover,
+    jit_batch_partially_mapped_crossover,
+    jit_batch_inversion_mutation,
+    jit_batch_relocation_mutation,
+    jit_greedy_heuristic
+)
+from tests.test_genetic_algorithm import make_ga
+
+NUM_CITIES = 30
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    """
+    Returns a seeded random number generator.
+    """
+    return np.random.default_rng(0)
+
+
+@pytest.fixture
+def population(rng: np.random.Generator) -> np.ndarray:
+    """
+    Returns a population of random tours in the genetic algorithm's compact integer type.
+    """
+    return np.array([rng.permutation(NUM_CITIES) for _ in range(40)], dtype=np.int16)
+
+
+@pytest.fixture
+def distance_matrix(rng: np.random.Generator) -> np.ndarray:
+    """
+    Returns the distance matrix of a random instance.
+    """
+    return compute_distance_matrix(rng.uniform(0, 100, (NUM_CITIES, 2)))
+
+
+def test_jit_evaluate_population(population: np.ndarray, distance_matrix: np.ndarray) -> None:
+    """
+    Tests that compiled evaluation matches `evaluate_population`.
+    """
+    assert np.allclose(
+        jit_evaluate_population(population, distance_matrix),
+        evaluate_population(population, distance_matrix)
+    )
+
+
+@pytest.mark.parametrize("batch_func, jit_func", [
+    (batch_order_crossover, jit_batch_order_crossover),
+    (batch_partially_mapped_crossover, jit_batch_partially_mapped_crossover)
+])
+def test_jit_batch_crossover(
+    rng: np.random.Generator,
+    population: np.ndarray,
+    batch_func,
+    jit_func
+) -> None:
+    """
+    Tests that compiled crossover produces the same children as the NumPy kernels for the same
+    cut points.
+    """
+    parents1, parents2 = population[::2], population[1::2]
+    starts, ends = random_cut_points(rng, len(parents1), NUM_CITIES)
+
+    for expected, child in zip(
+        batch_func(parents1, parents2, starts, ends),
+        jit_func(parents1, parents2, starts, ends)
+    ):
+        assert np.array_equal(child, expected)
+        assert child.dtype == parents1.dtype
+
+
+@pytest.mark.parametrize("batch_func, jit_func, sampler", [
+    (batch_inversion_mutation, jit_batch_inversion_mutation, random_cut_points),
+    (batch_relocation_mutation, jit_batch_relocation_mutation, random_relocations)
+])
+def test_jit_batch_mutation(
+    rng: np.random.Generator,
+    population: np.ndarray,
+    distance_matrix: np.ndarray,
+    batch_func,
+    jit_func,
+    sampler
+) -> None:
+    """
+    Tests that compiled mutation produces the same individuals and changes in tour length as the
+    NumPy kernels for the same random parameters, including mutations spanning the whole tour.
+    """
+    params = sampler(rng, len(population), NUM_CITIES)
+    # The first rows mutate the whole tour, which leaves its length unchanged
+    params[0][:3] = 0
+    if sampler is random_cut_points:
+        params[1][:3] = NUM_CITIES - 1
+    else:
+        params[1][:3] = NUM_CITIES
+        params[2][:3] = 0
+
+    expected, mutated = population.copy(), population.copy()
+    expected_deltas = batch_func(expected, *params, distance_matrix)
+    deltas = jit_func(mutated, *params, distance_matrix)
+
+    assert np.array_equal(mutated, expected)
+    assert np.allclose(deltas, expected_deltas)
+    assert np.allclose(
+        deltas,
+        evaluate_population(mutated, distance_matrix)
+        - evaluate_population(population, distance_matrix)
+    )
+
+    unscored = population.copy()
+    assert jit_func(unscored, *params) is None
+    assert np.array_equal(unscored, expected)
+
+
+def test_jit_greedy_heuristic(distance_matrix: np.ndarray) -> None:
+    """
+    Tests that the compiled greedy heuristic builds the same tour as `greedy_heuristic` from the
+    same random starting city.
+    """
+    random.seed(0)
+    expected = greedy_heuristic(NUM_CITIES, distance_matrix)
+    random.seed(0)
+    assert jit_greedy_heuristic(NUM_CITIES, distance_matrix) == expected
+
+
+def test_jit_matches_per_individual_crossover(population: np.ndarray) -> None:
+    """
+    Tests that compiled crossover matches the per-individual crossover functions on fixed seeds.
+    """
+    parent1, parent2 = population[0].tolist(), population[1].tolist()
+    for crossover_func, jit_func in (
+        (order_crossover, jit_batch_order_crossover),
+        (partially_mapped_crossover, jit_batch_partially_mapped_crossover)
+    ):
+        for seed in range(10):
+            random.seed(seed)
+            start, end = sorted(random.sample(range(NUM_CITIES), 2))
+            random.seed(seed)
+            expected = crossover_func(parent1, parent2)
+
+            children = jit_func(
+                population[:1],
+                population[1:2],
+                np.array([start]),
+                np.array([end])
+            )
+            assert [child[0].tolist() for child in children] == list(expected)
+
+
+@pytest.mark.skipif(not JIT_AVAILABLE, reason="Numba is not installed")
+def test_numba_backend() -> None:
+    """
+    Tests that a seeded run with the compiled backend starts from the same population and finds
+    a tour as short as the python backend. Tour lengths are summed in a different order, so the
+    runs may break ties between equally short tours differently and are not compared generation
+    by generation.
+    """
+    python, compiled = make_ga(backend="python"), make_ga(backend="numba")
+    assert compiled.backend == "numba"
+    assert np.array_equal(compiled.population, python.population)
+
+    python.run()
+    compiled.run()
+    assert np.isclose(compiled.best_distance, python.best_distance)
+
+
+@pytest.mark.skipif(JIT_AVAILABLE, reason="Numba is installed")
+def test_numba_backend_fallback() -> None:
+    """
+    Tests that the compiled backend falls back to the python backend when Numba is missing.
+    """
+    with pytest.warns(UserWarning):
+        ga = make_ga(backend="numba")
+    assert ga.backend == "python"
+
+
+@pytest.mark.skipif(not JIT_AVAILABLE, reason="Numba is not installed")
+def test_numba_backend_distance_provider_fallback() -> None:
+    """
+    Tests that the compiled backend warns and falls back to the python backend for distance
+    providers other than a distance matrix.
+    """
+    with pytest.warns(UserWarning, match="CoordinateDistances"):
+        ga = make_ga(backend="numba", distance_mode="on_demand")
+    assert ga.backend == "python"
+    ga.run()
+    assert np.isfinite(ga.best_distance)
+
+
+def test_unknown_backend() -> None:
+    """
+    Tests that an unknown backend is rejected.
+    """
+    with pytest.raises(ValueError):
+        make_ga(backend="cuda")
@@ -0,0 +1,83 @@
+import numpy as np
+import random
+from src.ga.fitness import compute_distance_matrix, fitness
+from typing import List, Set, FrozenSet
+from src.ga.local_search import neighbour_lists, two_opt, or_opt, local_search, _reverse, _relocate
+
+
+def test_neighbour_lists() -> None:
+    """
+    Tests that neighbour lists hold the K nearest other cities of each city, nearest first.
+    """
+    rng = np.random.default_rng(0)
+    distance_matrix = compute_distance_matrix(rng.uniform(0, 1000, size=(30, 2)))
+    neighbours = neighbour_lists(distance_matrix, 5)
+
+    for city in range(30):
+        expected = [other for other in np.argsort(distance_matrix[city]) if other != city][:5]
+        assert neighbours[city].tolist() == expected
+
+
+def test_local_search() -> None:
+    """
+    Tests that each local search keeps the tour a valid permutation, never lengthens it, and
+    returns a change in tour length that matches a full re-evaluation.
+    """
+    rng = np.random.default_rng(1)
+    distance_matrix = compute_distance_matrix(rng.uniform(0, 1000, size=(60, 2)))
+    neighbours = neighbour_lists(distance_matrix, 8).tolist()
+
+    for search_func in [two_opt, or_opt, local_search]:
+        for _ in range(10):
+            tour = rng.permutation(60).tolist()
+            before = fitness(tour, distance_matrix)
+            delta = search_func(tour, distance_matrix, neighbours)
+
+            assert sorted(tour) == list(range(60))
+            assert delta <= 0
+            assert np.isclose(before + delta, fitness(tour, distance_matrix))
+
+
+def edges(tour: List[int]) -> Set[FrozenSet[int]]:
+    """
+    Returns the undirected edges of a tour.
+
+    Args:
+        tour: A list of city indices.
+
+    Returns:
+        The set of edges, each as the set of its two cities.
+    """
+    return {frozenset((tour[i - 1], tour[i])) for i in range(len(tour))}
+
+
+def test_moves() -> None:
+    """
+    Tests that reversals and relocations, which only move the shorter side of the tour, give the
+    same cycle as moving the cities in a plain list, and keep the positions of cities up to date.
+    """
+    rng = random.Random(0)
+    n = 12
+    for _ in range(200):
+        tour = rng.sample(range(n), n)
+        pos = [0] * n
+        for k, city in enumerate(tour):
+            pos[city] = k
+
+        i, j = rng.randrange(n), rng.randrange(n)
+        path = [tour[(i + k) % n] for k in range((j - i) % n + 1)]
+        rest = [tour[(j + 1 + k) % n] for k in range(n - len(path))]
+        _reverse(tour, pos, i, j)
+        assert edges(tour) == edges(path[::-1] + rest)
+        assert all(tour[pos[city]] == city for city in range(n))
+
+        start, m = rng.randrange(n), rng.randint(1, 3)
+        segment = [tour[(start + k) % n] for k in range(m)]
+        others = [city for city in tour if city not in segment]
+        after = rng.choice(others)
+        inserted = segment[::-1] if rng.random() < 0.5 else segment
+        expected = others[:others.index(after) + 1] + inserted + others[others.index(after) + 1:]
+        _relocate(tour, pos, segment, after, inserted)
+        assert tour[(pos[after] + 1) % n] == inserted[0]
+        assert edges(tour) == edges(expected)
+        assert all(tour[pos[city]] == city for city in range(n))
@@ -1,6 +1,15 @@
 import pytest
 import random
-from src.ga.mutation import inversion_mutation, relocation_mutation
+import numpy as np
+from src.ga.fitness import compute_distance_matrix, fitness
+from src.ga.crossover import random_cut_points
+from src.ga.mutation import (
+    inversion_mutation,
+    relocation_mutation,
+    random_relocations,
+    batch_inversion_mutation,
+    batch_relocation_mutation
+)
 
 
 def test_inversion_mutation(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -52,3 +61,68 @@ def test_relocation_mutation(monkeypatch: pytest.MonkeyPatch) -> None:
     relocation_mutation(individual)
 
     assert individual == expected_individual
+
+
+def test_mutation_delta() -> None:
+    """
+    Tests that the change in tour length returned by each mutation matches a full re-evaluation of
+    the mutated individual, including edge cases where the subpath wraps or covers the whole tour.
+    """
+    rng = np.random.default_rng(0)
+    distance_matrix = compute_distance_matrix(rng.uniform(0, 1000, size=(12, 2)))
+
+    for mutation_func in [inversion_mutation, relocation_mutation]:
+        for _ in range(200):
+            individual = list(rng.permutation(12))
+            before = fitness(individual, distance_matrix)
+            delta = mutation_func(individual, distance_matrix)
+
+            assert sorted(individual) == list(range(12))
+            assert np.isclose(before + delta, fitness(individual, distance_matrix))
+
+
+def test_batch_mutation(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests that each batch mutation kernel matches its per-individual operator row by row,
+    including the change in tour length, by mocking the random draws of the per-individual
+    operators with the parameters drawn for each row.
+
+    Args:
+        monkeypatch: A pytest fixture used to mock the `random.sample` and `random.randint`
+            functions.
+    """
+    rng = np.random.default_rng(0)
+    n = 12
+    distance_matrix = compute_distance_matrix(rng.uniform(0, 1000, size=(n, 2)))
+    population = np.array([rng.permutation(n) for _ in range(100)])
+
+    starts, ends = random_cut_points(rng, len(population), n)
+    inverted = population.copy()
+    deltas = batch_inversion_mutation(inverted, starts, ends, distance_matrix)
+
+    for i in range(len(population)):
+        monkeypatch.setattr(random, "sample", lambda a, b: [starts[i], ends[i]])
+        individual = population[i].tolist()
+        delta = inversion_mutation(individual, distance_matrix)
+
+        assert inverted[i].tolist() == individual
+        assert np.isclose(deltas[i], delta)
+
+    starts, lengths, insert_positions = random_relocations(rng, len(population), n)
+    relocated = population.copy()
+    deltas = batch_relocation_mutation(
+        relocated,
+        starts,
+        lengths,
+        insert_positions,
+        distance_matrix
+    )
+
+    for i in range(len(population)):
+        draws = iter([lengths[i], starts[i], insert_positions[i]])
+        monkeypatch.setattr(random, "randint", lambda a, b: next(draws))
+        individual = population[i].tolist()
+        delta = relocation_mutation(individual, distance_matrix)
+
+        assert relocated[i].tolist() == individual
+        assert np.isclose(deltas[i], delta)
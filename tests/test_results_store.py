@@ -0,0 +1,84 @@
+import os
+import pytest
+from src.utils.results_store import ResultsStore
+
+
+def make_results(best_distance: float, generations: int) -> dict:
+    """
+    Builds the results of a run in the format of `GeneticAlgorithm.results`.
+
+    Args:
+        best_distance: The best distance of the run.
+        generations: The number of generations of the run.
+
+    Returns:
+        The results.
+    """
+    return {
+        "computational_secs": 1.5,
+        "best_distance": best_distance,
+        "best_solution": [2, 0, 3, 1],
+        "avg_fitness_per_gen": [best_distance + 10.0 - g for g in range(generations)],
+        "best_fitness_per_gen": [best_distance + 1.0 / (g + 1) for g in range(generations)],
+        "evaluations": {"carried": 3, "cached": 0, "evaluated": 7}
+    }
+
+
+def make_parameters(population: int) -> dict:
+    """
+    Builds the parameters of a run.
+
+    Args:
+        population: The population size of the run.
+
+    Returns:
+        The parameters.
+    """
+    return {
+        "population": population,
+        "crossover_rate": 0.8,
+        "crossover_func": "order_crossover",
+        "mutation_rate": 0.1,
+        "mutation_func": "inversion_mutation"
+    }
+
+
+def test_results_store(tmp_path: str) -> None:
+    """
+    Tests that runs are stored and loaded back unchanged, aggregated in order of best distance,
+    and replaced when added again under the same name.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    """
+    path = os.path.join(tmp_path, "results", "results.db")
+    with ResultsStore(path) as store:
+        store.add_run("a", make_parameters(10), make_results(30.0, 5))
+        store.add_run("b", make_parameters(20), make_results(20.0, 3))
+        store.add_run("c", make_parameters(30), make_results(25.0, 4))
+
+    with ResultsStore(path) as store:
+        assert store.has_run("a") and not store.has_run("d")
+        assert store.load_run("a") == {"name": "a", **make_parameters(10), **make_results(30.0, 5)}
+        assert [run["name"] for run in store.aggregate()] == ["b", "c", "a"]
+        assert store.aggregate()[0]["generations"] == 3
+        assert store.best_run()["name"] == "b"
+
+        store.add_run("b", make_parameters(20), make_results(40.0, 6))
+        assert [run["name"] for run in store.aggregate()] == ["c", "a", "b"]
+        assert len(store.load_run("b")["best_fitness_per_gen"]) == 6
+
+        with pytest.raises(KeyError):
+            store.load_run("d")
+
+
+def test_results_store_empty(tmp_path: str) -> None:
+    """
+    Tests that an empty store has no runs and no best run.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    """
+    with ResultsStore(os.path.join(tmp_path, "results.db")) as store:
+        assert store.aggregate() == []
+        assert store.best_run() is None
@@ -0,0 +1,62 @@
+import random
+import numpy as np
+import pytest
+from src.ga.selection import elitism, tournament_selection, elitism_indices, tournament_indices
+
+
+def test_elitism_indices() -> None:
+    """
+    Tests that elitism returns the indices of the best individuals, best first.
+    """
+    fitness_scores = np.array([5.0, 1.0, 4.0, 3.0, 2.0, 6.0])
+
+    assert elitism_indices(fitness_scores, 3).tolist() == [1, 4, 3]
+    assert elitism_indices(fitness_scores, 0).tolist() == []
+    assert elitism_indices(fitness_scores, 10).tolist() == [1, 4, 3, 2, 0, 5]
+
+
+@pytest.mark.parametrize("tournament_size", [2, 3])
+def test_tournament_indices(tournament_size: int) -> None:
+    """
+    Tests that tournaments sample distinct competitors, so the worst individuals can never win.
+
+    Args:
+        tournament_size: The number of individuals in each tournament.
+    """
+    rng = np.random.default_rng(0)
+    fitness_scores = np.array([3.0, 1.0, 2.0, 5.0, 4.0, 6.0])
+
+    selected = tournament_indices(fitness_scores, tournament_size, 1000, rng)
+    worst = np.argsort(fitness_scores)[len(fitness_scores) - tournament_size + 1:]
+
+    assert selected.shape == (1000,)
+    assert not np.isin(selected, worst).any()
+    assert set(selected.tolist()) == set(np.argsort(fitness_scores)[:-tournament_size + 1])
+
+
+def test_tournament_indices_whole_population() -> None:
+    """
+    Tests that a tournament over the whole population always selects the best individual.
+    """
+    fitness_scores = np.array([3.0, 1.0, 2.0])
+    selected = tournament_indices(fitness_scores, 3, 50, np.random.default_rng(0))
+
+    assert selected.tolist() == [1] * 50
+
+
+def test_list_selection() -> None:
+    """
+    Tests that the list-based selection functions return copies of the best individuals, and
+    tournament winners reproducible by seeding the `random` module.
+    """
+    population = [[0, 1, 2], [1, 2, 0], [2, 0, 1], [0, 2, 1]]
+    fitness_scores = [3.0, 1.0, 2.0, 4.0]
+
+    elites = elitism(population, fitness_scores, 2)
+    assert elites == [[1, 2, 0], [2, 0, 1]] and elites[0] is not population[1]
+
+    random.seed(0)
+    selected = tournament_selection(population, fitness_scores, 2, 20)
+    random.seed(0)
+    assert tournament_selection(population, fitness_scores, 2, 20) == selected
+    assert len(selected) == 20 and population[3] not in selected
@@ -0,0 +1,268 @@
+import os
+import json
+import pytest
+import random
+from typing import List, Tuple
+from src.ga.fitness import compute_distance_matrix
+from src.ga.crossover import order_crossover
+from src.ga.mutation import inversion_mutation
+from src.utils.results_store import ResultsStore
+from src.main import run_ga
+from src.utils.sweep import (
+    sweep_configs,
+    results_path,
+    run_name,
+    checkpoint_path,
+    is_complete,
+    run_config,
+    run_parallel_sweep,
+    run_racing_sweep
+)
+
+GA_KWARGS = {
+    "generations": 20,
+    "elitism_rate": 0.1,
+    "tournament_size": 3,
+    "greedy_rate": 0.1,
+    "early_stop_threshold": 10
+}
+
+
+def crashing_crossover(parent1: List[int], parent2: List[int]) -> Tuple[List[int], List[int]]:
+    """
+    A crossover function that kills the worker process running it.
+    """
+    os._exit(1)
+
+
+@pytest.fixture
+def coords() -> List[Tuple[float, float]]:
+    """
+    Returns the coordinates of a small random instance.
+    """
+    rng = random.Random(0)
+    return [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(15)]
+
+
+def test_run_parallel_sweep(tmp_path: str, coords: List[Tuple[float, float]]) -> None:
+    """
+    Tests that a parallel sweep runs every configuration and saves each result.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+        coords: The coordinates of the instance.
+    """
+    configs = sweep_configs([10, 20], [0.8], [0.1, 0.2], [order_crossover], [inversion_mutation])
+    paths = [results_path(str(tmp_path), "test", config) for config in configs]
+
+    completed, failed = run_parallel_sweep(
+        coords,
+        compute_distance_matrix(coords),
+        configs,
+        paths,
+        GA_KWARGS,
+        workers=2
+    )
+
+    assert sorted(completed) == sorted(paths)
+    assert failed == []
+    for path in paths:
+        with open(path, 'r') as file:
+            assert json.load(file)["best_distance"] > 0
+
+
+def test_run_parallel_sweep_store(tmp_path: str, coords: List[Tuple[float, float]]) -> None:
+    """
+    Tests that a parallel sweep can add every result to a shared results store instead of
+    saving a results file per configuration.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+        coords: The coordinates of the instance.
+    """
+    configs = sweep_configs([10, 20], [0.8], [0.1, 0.2], [order_crossover], [inversion_mutation])
+    paths = [results_path(str(tmp_path), "test", config) for config in configs]
+    store_path = os.path.join(tmp_path, "results.db")
+
+    completed, failed = run_parallel_sweep(
+        coords,
+        compute_distance_matrix(coords),
+        configs,
+        paths,
+        GA_KWARGS,
+        workers=2,
+        store_path=store_path
+    )
+
+    assert sorted(completed) == sorted(paths)
+    assert failed == []
+    assert not any(os.path.exists(path) for path in paths)
+    assert all(is_complete(path, store_path) for path in paths)
+    with ResultsStore(store_path) as store:
+        runs = store.aggregate()
+    assert sorted(run["name"] for run in runs) == sorted(run_name(path) for path in paths)
+    assert sorted(run["population"] for run in runs) == [10, 10, 20, 20]
+    assert all(run["best_distance"] > 0 for run in runs)
+
+
+def test_run_parallel_sweep_survives_crash(
+    tmp_path: str,
+    coords: List[Tuple[float, float]]
+) -> None:
+    """
+    Tests that a worker crash does not lose completed runs and only abandons the configurations
+    that keep crashing the pool.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+        coords: The coordinates of the instance.
+    """
+    configs = sweep_configs(
+        [10],
+        [1.0],
+        [0.1],
+        [order_crossover, crashing_crossover],
+        [inversion_mutation]
+    )
+    paths = [results_path(str(tmp_path), "test", config) for config in configs]
+
+    completed, failed = run_parallel_sweep(
+        coords,
+        compute_distance_matrix(coords),
+        configs,
+        paths,
+        GA_KWARGS,
+        workers=1,
+        max_restarts=1
+    )
+
+    assert paths[1] in failed
+    assert sorted(completed + failed) == sorted(paths)
+    for path in completed:
+        assert os.path.exists(path)
+
+
+def test_run_racing_sweep(tmp_path: str, coords: List[Tuple[float, float]]) -> None:
+    """
+    Tests that a race halves the configurations each round with doubling budgets, and that the
+    survivor continues from its checkpoints exactly as an uninterrupted run would.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+        coords: The coordinates of the instance.
+    """
+    ga_kwargs = {**GA_KWARGS, "early_stop_threshold": 1000, "seed": 0}
+    configs = sweep_configs([10, 20], [0.8], [0.1, 0.5], [order_crossover], [inversion_mutation])
+    paths = [results_path(str(tmp_path), "test", config) for config in configs]
+    log_path = os.path.join(tmp_path, "racing.json")
+    distance_matrix = compute_distance_matrix(coords)
+
+    survivors = run_racing_sweep(
+        coords,
+        distance_matrix,
+        configs,
+        paths,
+        ga_kwargs,
+        min_generations=5,
+        log_path=log_path
+    )
+
+    with open(log_path, 'r') as file:
+        rounds = json.load(file)["rounds"]
+    assert [r["generations"] for r in rounds] == [5, 10, 20]
+    assert [len(r["best_distances"]) for r in rounds] == [4, 2, 1]
+    assert len(survivors) == 1
+
+    eliminated = [path for path in paths if path not in survivors]
+    assert all(not os.path.exists(path) for path in eliminated)
+    assert all(os.path.exists(checkpoint_path(path)) for path in eliminated)
+
+    survivor = configs[paths.index(survivors[0])]
+    uninterrupted_path = os.path.join(tmp_path, "uninterrupted.json")
+    run_config(coords, distance_matrix, survivor, uninterrupted_path, ga_kwargs)
+
+    with open(survivors[0], 'r') as raced, open(uninterrupted_path, 'r') as uninterrupted:
+        raced, uninterrupted = json.load(raced), json.load(uninterrupted)
+    assert raced["best_fitness_per_gen"] == uninterrupted["best_fitness_per_gen"]
+    assert raced["best_solution"] == uninterrupted["best_solution"]
+
+
+def test_run_config_continues_checkpoint(
+    tmp_path: str,
+    coords: List[Tuple[float, float]]
+) -> None:
+    """
+    Tests that a run without checkpointing still continues from a checkpoint left by a race,
+    exactly as an uninterrupted run would, and removes it once finished, and that a checkpoint
+    saved with other settings is discarded.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+        coords: The coordinates of the instance.
+    """
+    ga_kwargs = {**GA_KWARGS, "early_stop_threshold": 1000, "seed": 0}
+    config = sweep_configs([10], [0.8], [0.1], [order_crossover], [inversion_mutation])[0]
+    path = results_path(str(tmp_path), "test", config)
+    distance_matrix = compute_distance_matrix(coords)
+
+    run_config(coords, distance_matrix, config, path, ga_kwargs, until=5)
+    assert os.path.exists(checkpoint_path(path)) and not os.path.exists(path)
+    run_config(coords, distance_matrix, config, path, {**ga_kwargs, "seed": 1})
+    assert os.path.exists(path) and not os.path.exists(checkpoint_path(path))
+
+    uninterrupted_path = os.path.join(tmp_path, "uninterrupted.json")
+    run_config(coords, distance_matrix, config, uninterrupted_path, ga_kwargs)
+    with open(path, 'r') as resumed, open(uninterrupted_path, 'r') as uninterrupted:
+        assert json.load(resumed)["best_fitness_per_gen"] == \
+            json.load(uninterrupted)["best_fitness_per_gen"]
+
+    os.remove(path)
+    run_config(coords, distance_matrix, config, path, ga_kwargs, until=5)
+    with pytest.warns(UserWarning, match="Discarding checkpoint"):
+        run_config(coords, distance_matrix, config, path, {**ga_kwargs, "elitism_rate": 0.2})
+    with open(path, 'r') as file:
+        assert len(json.load(file)["best_fitness_per_gen"]) == ga_kwargs["generations"]
+    assert not os.path.exists(checkpoint_path(path))
+
+
+def test_run_ga_distance_metric(tmp_path: str, coords: List[Tuple[float, float]]) -> None:
+    """
+    Tests that run_ga optimises exact Euclidean distances by default, and TSPLIB's rounded
+    distances, with results kept apart, when asked to.
+
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+        coords: The coordinates of the instance.
+    """
+    os.makedirs(os.path.join(tmp_path, "data/datasets"))
+    with open(os.path.join(tmp_path, "data/datasets/tiny.tsp"), 'w') as file:
+        file.write("\n".join(
+            ["NAME : tiny", f"DIMENSION : {len(coords)}", "EDGE_WEIGHT_TYPE : EUC_2D",
+             "NODE_COORD_SECTION"]
+            + [f"{i + 1} {x} {y}" for i, (x, y) in enumerate(coords)]
+            + ["EOF", ""]
+        ))
+    sweep = {
+        "population_sizes": [10],
+        "crossover_rates": [0.8],
+        "crossover_funcs": [order_crossover],
+        "mutation_rates": [0.1],
+        "mutation_funcs": [inversion_mutation],
+        "generations": 5,
+        "seed": 0
+    }
+    run_ga("tiny", str(tmp_path), **sweep)
+    run_ga("tiny", str(tmp_path), distance_metric="tsplib", **sweep)
+
+    name = os.path.basename(results_path("", "tiny", sweep_configs(
+        [10], [0.8], [0.1], [order_crossover], [inversion_mutation]
+    )[0]))
+    results = {}
+    for dataset in ("tiny", "tiny-tsplib"):
+        with open(os.path.join(tmp_path, "data/results", dataset, name), 'r') as file:
+            results[dataset] = json.load(file)["best_distance"]
+    assert results["tiny"] != round(results["tiny"])
+    assert results["tiny-tsplib"] == round(results["tiny-tsplib"])
+
+    with pytest.raises(ValueError):
+        run_ga("tiny", str(tmp_path), distance_metric="manhattan", **sweep)
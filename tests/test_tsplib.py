@@ -0,0 +1,203 @@
+import os
+import math
+import numpy as np
+import pytest
+from typing import List
+from src.utils.tsplib import parse_tsplib, tsplib_distance_matrix, load_instance
+from src.utils.file_utils import load_tsplib
+
+
+def write_instance(path: str, header: List[str], sections: List[str]) -> str:
+    """
+    Writes a TSPLIB file from its specification and data lines.
+
+    Args:
+        path: The path of the file.
+        header: The specification lines.
+        sections: The data lines.
+
+    Returns:
+        The path of the file.
+    """
+    with open(path, 'w') as file:
+        file.write("\n".join(header + sections + ["EOF", ""]))
+    return path
+
+
+def reference_distance(coord1: List[float], coord2: List[float], edge_weight_type: str) -> int:
+    """
+    Computes a distance one pair at a time, as in the TSPLIB specification.
+
+    Args:
+        coord1: The coordinates of the first city.
+        coord2: The coordinates of the second city.
+        edge_weight_type: The edge weight type.
+
+    Returns:
+        The distance.
+    """
+    dx, dy = coord1[0] - coord2[0], coord1[1] - coord2[1]
+    if edge_weight_type == "EUC_2D":
+        return int(math.sqrt(dx * dx + dy * dy) + 0.5)
+    if edge_weight_type == "CEIL_2D":
+        return math.ceil(math.sqrt(dx * dx + dy * dy))
+    if edge_weight_type == "ATT":
+        r = math.sqrt((dx * dx + dy * dy) / 10.0)
+        t = int(r + 0.5)
+        return t + 1 if t < r else t
+
+    def radians(value: float) -> float:
+        degrees = int(value)
+        return 3.141592 * (degrees + 5.0 * (value - degrees) / 3.0) / 180.0
+
+    lat1, lon1, lat2, lon2 = (radians(value) for value in (*coord1, *coord2))
+    q1, q2, q3 = math.cos(lon1 - lon2), math.cos(lat1 - lat2), math.cos(lat1 + lat2)
+    return int(6378.388 * math.acos(0.5 * ((1 + q1) * q2 - (1 - q1) * q3)) + 1)
+
+
+@pytest.mark.parametrize("edge_weight_type", ["EUC_2D", "CEIL_2D", "ATT", "GEO"])
+def test_tsplib_distance_matrix(edge_weight_type: str) -> None:
+    """
+    Tests that each distance function matches the TSPLIB specification for every pair of cities.
+    """
+    rng = np.random.default_rng(0)
+    low, high = (-80, 80) if edge_weight_type == "GEO" else (0, 10000)
+    coords = np.round(rng.uniform(low, high, (30, 2)), 2)
+    distance_matrix = tsplib_distance_matrix(coords, edge_weight_type)
+
+    for i in range(len(coords)):
+        for j in range(len(coords)):
+            expected = 0 if i == j else reference_distance(coords[i], coords[j], edge_weight_type)
+            assert distance_matrix[i, j] == expected
+
+
+def test_parse_tsplib(tmp_path) -> None:
+    """
+    Tests that headers are parsed with or without spaces around the colon, and that nodes listed
+    out of order are sorted by their number.
+    """
+    path = write_instance(
+        os.path.join(tmp_path, "tiny.tsp"),
+        [
+            "NAME: tiny",
+            "COMMENT : a : test",
+            "TYPE : TSP",
+            "DIMENSION: 3",
+            "EDGE_WEIGHT_TYPE : EUC_2D"
+        ],
+        ["NODE_COORD_SECTION", "2 3.0 4.0", "1 0 0", "3 6e0 8.0"]
+    )
+    instance = parse_tsplib(path)
+
+    assert instance.name == "tiny"
+    assert instance.edge_weight_type == "EUC_2D"
+    assert instance.dimension == 3
+    assert np.array_equal(instance.coords, [[0, 0], [3, 4], [6, 8]])
+    assert instance.distance_matrix is None
+    assert load_tsplib(path) == [(0.0, 0.0), (3.0, 4.0), (6.0, 8.0)]
+
+
+@pytest.mark.parametrize("edge_weight_format", [
+    "FULL_MATRIX",
+    "UPPER_ROW",
+    "LOWER_ROW",
+    "UPPER_DIAG_ROW",
+    "LOWER_DIAG_ROW",
+    "UPPER_COL",
+    "LOWER_COL",
+    "UPPER_DIAG_COL",
+    "LOWER_DIAG_COL"
+])
+def test_explicit_matrix(tmp_path, edge_weight_format: str) -> None:
+    """
+    Tests that explicit distance matrices are read in every edge weight format.
+    """
+    rng = np.random.default_rng(1)
+    dimension = 6
+    triangle = np.triu(rng.integers(1, 100, (dimension, dimension)), 1)
+    expected = triangle + triangle.T
+
+    if edge_weight_format == "FULL_MATRIX":
+        weights = expected.ravel()
+    else:
+        offset = 0 if "DIAG" in edge_weight_format else 1
+        # Column-wise formats list the columns of a triangle, i.e. the rows of its transpose
+        upper = edge_weight_format.startswith("UPPER") == edge_weight_format.endswith("ROW")
+        if upper:
+            rows, cols = np.triu_indices(dimension, offset)
+        else:
+            rows, cols = np.tril_indices(dimension, -offset)
+        weights = expected[rows, cols]
+
+    path = write_instance(
+        os.path.join(tmp_path, "explicit.tsp"),
+        [
+            "NAME : explicit",
+            f"DIMENSION : {dimension}",
+            "EDGE_WEIGHT_TYPE : EXPLICIT",
+            f"EDGE_WEIGHT_FORMAT : {edge_weight_format}"
+        ],
+        ["EDGE_WEIGHT_SECTION"] + [
+            " ".join(map(str, weights[i:i + 4])) for i in range(0, len(weights), 4)
+        ]
+    )
+    instance = parse_tsplib(path)
+
+    assert instance.coords is None
+    assert np.array_equal(instance.distance_matrix, expected)
+
+
+def test_parse_tsplib_invalid(tmp_path) -> None:
+    """
+    Tests that unsupported edge weight types and weights not matching the dimension are rejected.
+    """
+    path = write_instance(
+        os.path.join(tmp_path, "invalid.tsp"),
+        ["DIMENSION : 2", "EDGE_WEIGHT_TYPE : MAN_2D"],
+        ["NODE_COORD_SECTION", "1 0 0", "2 1 1"]
+    )
+    with pytest.raises(ValueError):
+        parse_tsplib(path)
+
+    path = write_instance(
+        os.path.join(tmp_path, "invalid.tsp"),
+        ["DIMENSION : 3", "EDGE_WEIGHT_TYPE : EXPLICIT", "EDGE_WEIGHT_FORMAT : UPPER_ROW"],
+        ["EDGE_WEIGHT_SECTION", "1 2"]
+    )
+    with pytest.raises(ValueError):
+        parse_tsplib(path)
+
+
+def test_load_instance_cache(tmp_path) -> None:
+    """
+    Tests that a loaded instance is cached and mapped from the cache on later loads, and that the
+    cache is rebuilt when the instance changes.
+    """
+    rng = np.random.default_rng(2)
+    coords = rng.integers(0, 1000, (20, 2))
+    lines = ["NODE_COORD_SECTION"] + [f"{i + 1} {x} {y}" for i, (x, y) in enumerate(coords)]
+    path = write_instance(
+        os.path.join(tmp_path, "cached.tsp"),
+        ["NAME : cached", "DIMENSION : 20", "EDGE_WEIGHT_TYPE : EUC_2D"],
+        lines
+    )
+
+    first = load_instance(path)
+    assert os.path.exists(os.path.join(tmp_path, "cached.cache", "meta.json"))
+    second = load_instance(path)
+    assert isinstance(second.distance_matrix, np.memmap)
+    assert not second.distance_matrix.flags.writeable
+    assert second.name == "cached"
+    assert np.array_equal(second.coords, coords)
+    assert np.array_equal(second.distance_matrix, first.distance_matrix)
+    assert np.array_equal(first.distance_matrix, tsplib_distance_matrix(coords, "EUC_2D"))
+
+    write_instance(
+        path,
+        ["NAME : cached", "DIMENSION : 20", "EDGE_WEIGHT_TYPE : CEIL_2D"],
+        lines
+    )
+    os.utime(path, ns=(0, 0))
+    changed = load_instance(path)
+    assert changed.edge_weight_type == "CEIL_2D"
+    assert np.array_equal(changed.distance_matrix, tsplib_distance_matrix(coords, "CEIL_2D"))